@@ -1,5 +1,29 @@
-from .core import DNACryptDB
+"""
+DNACryptDB
+The engines are imported on first access, so tools that only need
+dnacryptdb.encryption or dnacryptdb.parser never load a database driver
+"""
+
+import importlib
 
 __version__ = "1.0.0"
 __author__ = "Harshith Madhavaram"
-__all__ = ["DNACryptDB"]
\ No newline at end of file
+__all__ = ["DNACryptDB", "AsyncDNACryptDB"]
+
+# Public name -> module defining it, imported by __getattr__ (PEP 562)
+_LAZY = {
+    "DNACryptDB": ".core",
+    "AsyncDNACryptDB": ".aio",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
@@ -0,0 +1,1364 @@
+"""
+DNACryptDB asyncio Engine
+Same statement surface as DNACryptDB on async drivers (aiomysql,
+PyMongo's AsyncMongoClient and the async Neo4j driver), for use inside
+an event loop without blocking it
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from .core import (
+    DNACryptDB, MESSAGE_COLUMNS, MYSQL_POOL_SIZE, BULK_CHUNK_SIZE, LINK_DATA_TIMEOUT, SEND_MESSAGES_CYPHER,
+    CREATE_USERS_CYPHER, RELATE_MANY_CYPHER, LINK_DATA_CYPHER, GRAPH_COUNT_CYPHER, GRAPH_SCHEMA,
+    TABLE_ROWS_SQL, KEY_TYPE_SQL, STRING_KEY_TYPES, NON_STRING_KEY, MYSQL_SCHEMA,
+    ROUTE_LOOKUP_SQL, ROUTE_SQL, UNROUTE_SQL, CATALOG_NAME, CATALOG_PUT_SQL, CATALOG_DELETE_SQL, CATALOG_TABLES_SQL,
+    _table_info, _chunked, _insert_sql, _select_by_sql, _join_select, _join_plan, _merge_key,
+    _link_timeouts, _engine_logger, _release_logger, _apply_registry, _iso_timestamp, _graph_statement, _graph_result,
+    _graph_stats, _user_rows, _relationship_rows, _bulk_result, _message_params,
+    _sent_result, _role_table, _role_collection, _row_insert, _sequence_write_errors,
+    _link_candidates, _link_graph_result, _join_result, _message_select, _table_ddl,
+    _fetch_sql, _update_sql, _delete_sql, _mongo_update, _health_result
+)
+from .parser import (
+    CreateUser, CreateUsers, CreateMessageNode, RelateSent, RelateTrust, RelateMany,
+    FindPath, FindPattern, DetectAnomaly, TrackAccess, ShowGraph,
+    CreateTableForRole, CreateCollectionForRole, SendMessage, SendMessages, AddAlgorithm,
+    AddKey, AddHash, StoreSequence, StoreSequences, GetMessage, GetSequence, LinkData,
+    Join, ExplainJoin, ListMessages, MakeTable, MakeCollection, PutData, FetchData,
+    ChangeData, RemoveData, ShowTables, ShowCollections, Drop, Begin, Commit, Rollback
+)
+
+logger = logging.getLogger(__name__)
+
+# As in core, each async driver is imported by the first _connect_* call
+# for its backend, which rebinds these names; see core.Error.
+class Error(Exception):
+    """aiomysql.Error once MySQL is used"""
+
+
+class PyMongoError(Exception):
+    """pymongo.errors.PyMongoError once MongoDB is used"""
+
+
+class BulkWriteError(PyMongoError):
+    """pymongo.errors.BulkWriteError once MongoDB is used"""
+
+
+class Neo4jError(Exception):
+    """neo4j.exceptions.Neo4jError once Neo4j is used"""
+
+
+# aiomysql's buffered and unbuffered dictionary cursors once MySQL is used
+DictCursor = SSDictCursor = None
+
+# Every backend a statement may use
+BACKENDS = ('mysql', 'mongodb', 'neo4j')
+
+# Statements that only use Neo4j, so they connect nothing else
+GRAPH_STATEMENTS = frozenset((
+    CreateUser, CreateUsers, CreateMessageNode, RelateSent, RelateTrust, RelateMany,
+    FindPath, FindPattern, DetectAnomaly, TrackAccess, ShowGraph
+))
+
+
+class _AsyncHeldConnection:
+    """
+    A pooled aiomysql connection held by an open transaction; see
+    core._HeldConnection. Its commit() is a no-op until COMMIT.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        # Registry changes made in the transaction, applied at COMMIT
+        self.registry = {}
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+    async def commit(self):
+        pass
+
+
+class AsyncDNACryptDB:
+    """
+    asyncio DNACryptDB Engine - aiomysql + AsyncMongoClient + async Neo4j
+
+        async with AsyncDNACryptDB("dnacdb.config.json") as db:
+            result = await db.execute('LINK DATA WHERE link_id = "..."')
+    """
+
+    # Statement parsing, its plan cache and the backend-independent
+    # helpers are shared with the sync engine
+    _HANDLERS = DNACryptDB._HANDLERS
+    _prepare = DNACryptDB._prepare
+    cache_stats = DNACryptDB.cache_stats
+    _sequence_doc = DNACryptDB._sequence_doc
+    _clean_doc = DNACryptDB._clean_doc
+    _joined_row = DNACryptDB._joined_row
+    _parse_condition = DNACryptDB._parse_condition
+
+    def __init__(self, config_file: str = "dnacdb.config.json", verbose: bool = True,
+                 plan_cache_size: int = 256):
+        """Set up the engine; connect() reads the config"""
+        # Backends connect on the first statement that uses them; see _backend()
+        self.mysql_pool = None
+        self.mongo_client = None
+        self.mongo_db = None
+        self.neo4j_driver = None
+        self._schema_registry = None
+        # Backend sections of the config file, read by connect()
+        self._config = {}
+        self._attempted = set()
+        self._connect_lock = asyncio.Lock()
+        self._catalog_lock = asyncio.Lock()
+        # The calling task's open BEGIN ... COMMIT connection
+        self._txn = contextvars.ContextVar('dnacryptdb_txn', default=None)
+        self.verbose = verbose
+        # This engine's records; see DNACryptDB.__init__
+        self._logger = _engine_logger(logger, verbose)
+        self.chunk_size = BULK_CHUNK_SIZE
+        self.link_timeouts = _link_timeouts(LINK_DATA_TIMEOUT)
+
+        # Parsed statement templates keyed by shape, least recently used first
+        self.plan_cache_size = plan_cache_size
+        self._plan_cache = OrderedDict()
+        self._plan_hits = 0
+        self._plan_misses = 0
+        self._plan_lock = threading.Lock()
+
+        if not os.path.exists(config_file):
+            raise FileNotFoundError(
+                f"Config file not found: {config_file}\n"
+                f"Run 'dnacryptdb init' to create one."
+            )
+        self.config_file = config_file
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def connect(self):
+        """
+        Read the config. As in DNACryptDB, each configured backend
+        connects, and its driver is imported, on the first statement that
+        uses it; a backend without a config section is skipped.
+        """
+        with open(self.config_file, 'r') as f:
+            config = json.load(f)
+
+        self._config = config
+        self.chunk_size = config.get('chunk_size', BULK_CHUNK_SIZE)
+        self.link_timeouts = _link_timeouts(config.get('link_timeout', LINK_DATA_TIMEOUT))
+
+    async def _backend(self, backend: str):
+        """Connect a configured backend the first time it is used; see DNACryptDB._backend"""
+        if backend not in self._attempted:
+            async with self._connect_lock:
+                if backend not in self._attempted:
+                    if backend in self._config:
+                        await getattr(self, f"_connect_{backend}")(self._config[backend])
+                    self._attempted.add(backend)
+
+    async def _ready(self, node_type):
+        """
+        Connect what a statement may use before it runs: Neo4j alone for
+        graph statements, otherwise every configured backend and then
+        schema_registry.
+        """
+        if node_type in GRAPH_STATEMENTS:
+            await self._backend('neo4j')
+            return
+
+        await asyncio.gather(*map(self._backend, BACKENDS))
+        if self._schema_registry is None:
+            async with self._catalog_lock:
+                if self._schema_registry is None:
+                    self._schema_registry = await self._load_catalog()
+
+    async def _connect_mysql(self, mysql_config: Dict):
+        global Error, DictCursor, SSDictCursor
+        try:
+            import aiomysql
+            from aiomysql import DictCursor, SSDictCursor
+            from pymysql.constants import ER
+        except ImportError as e:
+            self._logger.warning("⚠ MySQL driver not installed: %s", e)
+            return
+        Error = aiomysql.Error
+
+        try:
+            pool_config = dict(mysql_config)
+            pool_size = pool_config.pop('pool_size', MYSQL_POOL_SIZE)
+            database = pool_config.pop('database', None)
+
+            try:
+                self.mysql_pool = await aiomysql.create_pool(maxsize=pool_size, db=database, **pool_config)
+            except Error as e:
+                if e.args[0] != ER.BAD_DB_ERROR or not database:
+                    raise
+                # First run against this server: create the database, then retry
+                temp_conn = await aiomysql.connect(
+                    host=mysql_config['host'],
+                    user=mysql_config['user'],
+                    password=mysql_config['password']
+                )
+                async with temp_conn.cursor() as temp_cursor:
+                    await temp_cursor.execute(f"CREATE DATABASE IF NOT EXISTS {database}")
+                temp_conn.close()
+                self.mysql_pool = await aiomysql.create_pool(maxsize=pool_size, db=database, **pool_config)
+            async with self._mysql() as (conn, cursor):
+                for statement in MYSQL_SCHEMA:
+                    await cursor.execute(statement)
+                await conn.commit()
+
+            self._logger.info("✓ MySQL connected: %s", database)
+        except (Error, OSError) as e:
+            self._logger.warning("⚠ MySQL connection failed: %s", e)
+
+    async def _connect_mongodb(self, mongo_config: Dict):
+        global PyMongoError, BulkWriteError
+        try:
+            from pymongo import AsyncMongoClient
+            from pymongo import errors
+        except ImportError as e:
+            self._logger.warning("⚠ MongoDB driver not installed: %s", e)
+            return
+        PyMongoError, BulkWriteError = errors.PyMongoError, errors.BulkWriteError
+
+        try:
+            self.mongo_client = AsyncMongoClient(
+                mongo_config['uri'],
+                serverSelectionTimeoutMS=5000
+            )
+            await self.mongo_client.admin.command('ping')
+            self.mongo_db = self.mongo_client[mongo_config['database']]
+
+            self._logger.info("✓ MongoDB connected: %s", mongo_config['database'])
+        except Exception as e:
+            self._logger.warning("⚠ MongoDB connection failed: %s", e)
+
+    async def _connect_neo4j(self, neo4j_config: Dict):
+        global Neo4jError
+        try:
+            from neo4j import AsyncGraphDatabase
+            from neo4j.exceptions import Neo4jError
+        except ImportError as e:
+            self._logger.warning("⚠ Neo4j driver not installed: %s", e)
+            return
+
+        try:
+            self.neo4j_driver = AsyncGraphDatabase.driver(
+                neo4j_config['uri'],
+                auth=(neo4j_config.get('user', 'neo4j'),
+                      neo4j_config.get('password', 'password'))
+            )
+            await self.neo4j_driver.verify_connectivity()
+
+            self._logger.info("✓ Neo4j connected: %s", neo4j_config['uri'])
+        except Exception as e:
+            self.neo4j_driver = None
+            self._logger.warning("⚠ Neo4j connection failed: %s", e)
+        else:
+            await self._ensure_graph_schema()
+
+    async def _load_catalog(self) -> Dict[str, Dict]:
+        """Registry from the backend catalogs; see DNACryptDB._load_catalog"""
+        registry = {}
+
+        if self.mysql_pool is not None:
+            try:
+                async with self._mysql() as (conn, cursor):
+                    await cursor.execute(CATALOG_TABLES_SQL)
+                    for row in await cursor.fetchall():
+                        registry[row['name']] = json.loads(row['info']) if row['info'] else _table_info(row['name'])
+            except Error as e:
+                self._logger.warning("⚠ MySQL catalog not loaded: %s", e)
+
+        if self.mongo_db is not None:
+            try:
+                names = await self.mongo_db.list_collection_names()
+                cataloged = {}
+                if CATALOG_NAME in names:
+                    cataloged = {doc.pop('_id'): doc async for doc in self.mongo_db[CATALOG_NAME].find()}
+                for name in names:
+                    if not name.startswith(('_dnacdb_', 'system.')):
+                        registry[name] = cataloged.get(name, {'backend': 'mongodb'})
+            except PyMongoError as e:
+                self._logger.warning("⚠ MongoDB catalog not loaded: %s", e)
+
+        return registry
+
+    @property
+    def schema_registry(self) -> Dict[str, Dict]:
+        """
+        Tables and collections by name, loaded before the first statement
+        that is not graph-only; see DNACryptDB.schema_registry
+        """
+        registry = self._schema_registry if self._schema_registry is not None else {}
+        held = self._txn.get()
+        if held is not None and held.registry:
+            return _apply_registry(dict(registry), held.registry)
+        return registry
+
+    async def _register(self, name: str, info: Dict):
+        """Add a table or collection to the registry and its backend's catalog"""
+        await self._catalog_change(name, info)
+
+    async def _unregister(self, name: str):
+        """Remove a dropped table or collection from the registry and its catalog"""
+        info = self.schema_registry.get(name)
+        if info is not None:
+            await self._catalog_change(name, None, info['backend'])
+
+    async def _catalog_change(self, name: str, info: Optional[Dict], backend: str = None):
+        """Write one catalog change, then apply it to the registry; see DNACryptDB._catalog_change"""
+        if (backend or info['backend']) == 'mysql':
+            async with self._mysql() as (conn, cursor):
+                if info is None:
+                    await cursor.execute(CATALOG_DELETE_SQL, (name,))
+                else:
+                    await cursor.execute(CATALOG_PUT_SQL, (name, json.dumps(info)))
+                await conn.commit()
+                if isinstance(conn, _AsyncHeldConnection):
+                    conn.registry[name] = info
+                    return
+        elif info is None:
+            await self.mongo_db[CATALOG_NAME].delete_one({'_id': name})
+        else:
+            await self.mongo_db[CATALOG_NAME].replace_one({'_id': name}, dict(info, _id=name), upsert=True)
+        _apply_registry(self._schema_registry, {name: info})
+
+    async def _ensure_graph_schema(self):
+        """Create the User/Message constraints and indexes if missing"""
+        for statement in GRAPH_SCHEMA:
+            try:
+                async with self.neo4j_driver.session() as session:
+                    result = await session.run(statement)
+                    await result.consume()
+            except Neo4jError as e:
+                self._logger.warning("⚠ Neo4j schema setup skipped: %s", e)
+
+    async def health(self) -> Dict:
+        """
+        Check the configured backends at once with one round trip each,
+        connecting any not used yet and retrying failed ones; see
+        DNACryptDB.health
+        """
+        clients = {'mysql': 'mysql_pool', 'mongodb': 'mongo_client', 'neo4j': 'neo4j_driver'}
+        async with self._connect_lock:
+            for backend, attr in clients.items():
+                if getattr(self, attr) is None:
+                    self._attempted.discard(backend)
+
+        async def mysql_check():
+            async with self._mysql() as (conn, cursor):
+                await cursor.execute("SELECT 1")
+                await cursor.fetchall()
+
+        async def mongodb_check():
+            if self.mongo_client is None:
+                raise ConnectionError("MongoDB not connected")
+            await self.mongo_client.admin.command('ping')
+
+        async def neo4j_check():
+            if self.neo4j_driver is None:
+                raise ConnectionError("Neo4j not connected")
+            await self.neo4j_driver.verify_connectivity()
+
+        async def timed(backend, check):
+            if backend not in self._config:
+                return {"status": "not configured"}
+            started = time.monotonic()
+            try:
+                await self._backend(backend)
+                await check()
+            except Exception as e:
+                return {"status": "error", "error": str(e)}
+            return {"status": "ok", "latency_ms": round((time.monotonic() - started) * 1000, 1)}
+
+        checks = {'mysql': mysql_check, 'mongodb': mongodb_check, 'neo4j': neo4j_check}
+        backends = dict(zip(checks, await asyncio.gather(*map(timed, checks, checks.values()))))
+        return _health_result(backends)
+
+    async def execute(self, query: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Execute single DNACryptDB query; see DNACryptDB.execute"""
+        query = query.strip()
+
+        if not query or query.startswith('#') or query.startswith('--'):
+            return {"status": "comment"}
+
+        try:
+            node = self._prepare(query, params)
+            await self._ready(type(node))
+            return await getattr(self, self._HANDLERS[type(node)])(node)
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def execute_many(self, queries, workers: int = 8) -> List[Dict]:
+        """
+        Execute independent queries concurrently, at most workers at a
+        time. Each item is a query string or a (query, params) pair;
+        results come back in input order.
+
+        Gathered tasks would share this task's open transaction, so this
+        raises ValueError inside BEGIN ... COMMIT.
+        """
+        if self._txn.get() is not None:
+            raise ValueError("execute_many cannot run inside a transaction")
+
+        limit = asyncio.Semaphore(workers)
+
+        async def run(item):
+            async with limit:
+                if isinstance(item, str):
+                    return await self.execute(item)
+                return await self.execute(*item)
+
+        return await asyncio.gather(*[run(item) for item in queries])
+
+    async def stream(self, query: str, params: Dict[str, Any] = None,
+                     page_size: int = None):
+        """
+        Stream the rows of a JOIN or LIST MESSAGES statement through an
+        unbuffered cursor; see DNACryptDB.stream
+
+            async for row in db.stream("LIST MESSAGES FROM messages_admin_adult"):
+                ...
+        """
+        node = self._prepare(query.strip().rstrip(';'), params)
+        if type(node) not in (Join, ListMessages):
+            raise ValueError("stream() supports JOIN and LIST MESSAGES")
+        await self._ready(type(node))
+        if isinstance(node, Join) and self.mongo_db is None:
+            raise ConnectionError("MongoDB not connected")
+
+        plan = None
+        if isinstance(node, Join):
+            async with self._mysql() as (conn, cursor):
+                plan = await self._plan_join(node, cursor)
+
+        async with self._mysql(buffered=False) as (conn, cursor):
+            if plan is not None:
+                rows = self._join_rows(node, plan, cursor)
+            else:
+                rows = self._message_rows(node, cursor)
+
+            page = []
+            async for row in rows:
+                if not page_size:
+                    yield row
+                    continue
+                page.append(row)
+                if len(page) >= page_size:
+                    yield page
+                    page = []
+            if page:
+                yield page
+
+    @asynccontextmanager
+    async def _mysql(self, buffered: bool = True):
+        """
+        Check out a pooled connection and a dictionary cursor for one
+        operation; see DNACryptDB._mysql. Writes are committed by the
+        caller. Anything left uncommitted, including the snapshot a read
+        opens, is rolled back on exit, since aiomysql drops connections
+        returned mid-transaction.
+
+        Inside a transaction the task's held connection is used instead;
+        its commits wait for COMMIT.
+        """
+        if self.mysql_pool is None:
+            raise ConnectionError("MySQL not connected")
+
+        cursor_class = DictCursor if buffered else SSDictCursor
+        held = self._txn.get()
+        if held is not None:
+            async with held.cursor(cursor_class) as cursor:
+                yield held, cursor
+            return
+
+        async with self.mysql_pool.acquire() as conn:
+            try:
+                async with conn.cursor(cursor_class) as cursor:
+                    yield conn, cursor
+            finally:
+                if conn.get_transaction_status():
+                    try:
+                        await conn.rollback()
+                    except Error:
+                        pass
+
+    # ========================================================================
+    # Transactions (MySQL)
+    # ========================================================================
+
+    async def _begin_transaction(self, node: Begin = None) -> Dict:
+        """BEGIN - hold one MySQL connection for this task until COMMIT/ROLLBACK"""
+        if self.mysql_pool is None:
+            return {"error": "MySQL not connected"}
+        if self._txn.get() is not None:
+            return {"error": "Transaction already open"}
+
+        try:
+            self._txn.set(_AsyncHeldConnection(await self.mysql_pool.acquire()))
+        except Error as e:
+            return {"error": str(e)}
+        return {"status": "success"}
+
+    async def _commit_transaction(self, node: Commit = None) -> Dict:
+        """COMMIT - write everything since BEGIN in one commit"""
+        return await self._end_transaction(commit=True)
+
+    async def _rollback_transaction(self, node: Rollback = None) -> Dict:
+        """ROLLBACK - discard the MySQL writes since BEGIN"""
+        return await self._end_transaction(commit=False)
+
+    async def _end_transaction(self, commit: bool) -> Dict:
+        """Commit or roll back the open transaction and release its connection"""
+        held = self._txn.get()
+        if held is None:
+            return {"error": "No transaction open"}
+
+        self._txn.set(None)
+        try:
+            if commit:
+                await held.conn.commit()
+                _apply_registry(self._schema_registry, held.registry)
+            else:
+                await held.conn.rollback()
+            return {"status": "success"}
+        except Error as e:
+            try:
+                await held.conn.rollback()
+            except Error:
+                pass
+            return {"error": str(e)}
+        finally:
+            self.mysql_pool.release(held.conn)
+
+    # ========================================================================
+    # Neo4j Graph Operations
+    # ========================================================================
+
+    async def _run_graph(self, node) -> Dict:
+        """Run a single-statement graph operation (see _graph_statement)"""
+        if not self.neo4j_driver:
+            return {"error": "Neo4j not connected"}
+
+        try:
+            cypher, params = _graph_statement(node)
+            async with self.neo4j_driver.session() as session:
+                result = await session.run(cypher, params)
+                records = [record async for record in result]
+            return _graph_result(node, records)
+
+        except ValueError as e:
+            return {"error": str(e)}
+        except Neo4jError as e:
+            return {"error": f"Neo4j error: {str(e)}"}
+
+    async def _create_user_node(self, node: CreateUser) -> Dict:
+        """CREATE USER {"email": "alice@dnacrypt.com", "role": "admin", "trust_score": 95}"""
+        return await self._run_graph(node)
+
+    async def _create_users(self, node: CreateUsers) -> Dict:
+        """CREATE USERS [{"email": "alice@dnacrypt.com", "role": "admin"}, ...]"""
+        return await self.create_users(node.rows)
+
+    async def create_users(self, rows, chunk_size: int = None) -> Dict:
+        """Bulk CREATE USER; see DNACryptDB.create_users"""
+        await self._ready(CreateUsers)
+        if not self.neo4j_driver:
+            return {"error": "Neo4j not connected"}
+
+        ts = datetime.utcnow().isoformat()
+        errors = []
+        count = 0
+        created = 0
+
+        try:
+            async with self.neo4j_driver.session() as session:
+                for chunk in _chunked(_user_rows(rows, errors), chunk_size or self.chunk_size):
+                    summary = await session.execute_write(
+                        self._run_write, CREATE_USERS_CYPHER, rows=chunk, ts=ts
+                    )
+                    count += len(chunk)
+                    created += summary.counters.nodes_created
+
+            return _bulk_result(count, created, errors)
+
+        except Neo4jError as e:
+            return {"error": f"Neo4j error: {str(e)}", "count": count}
+
+    @staticmethod
+    async def _run_write(tx, cypher: str, **params):
+        """Managed write transaction body: run one statement, return its summary"""
+        result = await tx.run(cypher, **params)
+        return await result.consume()
+
+    async def _create_message_node(self, node: CreateMessageNode) -> Dict:
+        """CREATE MESSAGE NODE {"message_id": "xyz", "urgency": "high"}"""
+        return await self._run_graph(node)
+
+    async def _create_relationship(self, node) -> Dict:
+        """
+        RELATE USER "alice@dnacrypt.com" SENT MESSAGE "xyz-789" AT "2025-11-15T10:00:00"
+        RELATE USER "alice@dnacrypt.com" TRUSTS USER "bob@dnacrypt.com" LEVEL 85
+        """
+        return await self._run_graph(node)
+
+    async def _relate_many(self, node: RelateMany) -> Dict:
+        """RELATE MANY [{"from": "alice@dnacrypt.com", "type": "TRUSTS", "to": "bob@dnacrypt.com", "level": 85}, ...]"""
+        return await self.relate_many(node.rows)
+
+    async def relate_many(self, rows, chunk_size: int = None) -> Dict:
+        """Bulk RELATE; see DNACryptDB.relate_many"""
+        await self._ready(RelateMany)
+        if not self.neo4j_driver:
+            return {"error": "Neo4j not connected"}
+
+        size = chunk_size or self.chunk_size
+        ts = datetime.utcnow().isoformat()
+        pending = {rel_type: [] for rel_type in RELATE_MANY_CYPHER}
+        errors = []
+        count = 0
+        created = 0
+
+        async def flush(session, rel_type):
+            chunk = pending[rel_type]
+            pending[rel_type] = []
+            summary = await session.execute_write(
+                self._run_write, RELATE_MANY_CYPHER[rel_type], rows=chunk, ts=ts
+            )
+            return len(chunk), summary.counters.relationships_created
+
+        try:
+            async with self.neo4j_driver.session() as session:
+                for rel_type, row in _relationship_rows(rows, errors):
+                    pending[rel_type].append(row)
+                    if len(pending[rel_type]) >= size:
+                        sent, made = await flush(session, rel_type)
+                        count += sent
+                        created += made
+
+                for rel_type in RELATE_MANY_CYPHER:
+                    if pending[rel_type]:
+                        sent, made = await flush(session, rel_type)
+                        count += sent
+                        created += made
+
+            return _bulk_result(count, created, errors)
+
+        except Neo4jError as e:
+            return {"error": f"Neo4j error: {str(e)}", "count": count}
+
+    async def _find_path(self, node: FindPath) -> Dict:
+        """FIND PATH FROM "alice@dnacrypt.com" TO "eve@dnacrypt.com" MAX 5"""
+        return await self._run_graph(node)
+
+    async def _find_pattern(self, node: FindPattern) -> Dict:
+        """FIND PATTERN users WHO accessed MORE THAN 100 messages"""
+        return await self._run_graph(node)
+
+    async def _detect_anomaly(self, node: DetectAnomaly) -> Dict:
+        """DETECT ANOMALY IN access patterns"""
+        return await self._run_graph(node)
+
+    async def _track_access(self, node: TrackAccess) -> Dict:
+        """TRACK ACCESS BY "alice@dnacrypt.com" TO MESSAGE "xyz-789" ACTION "decrypt" SUCCESS true"""
+        return await self._run_graph(node)
+
+    async def _show_graph(self, node: ShowGraph) -> Dict:
+        """SHOW GRAPH stats"""
+        if not self.neo4j_driver:
+            return {"error": "Neo4j not connected"}
+
+        async def count(cypher):
+            async with self.neo4j_driver.session() as session:
+                result = await session.run(cypher)
+                return (await result.single())['count']
+
+        try:
+            counts = await asyncio.gather(*map(count, GRAPH_COUNT_CYPHER.values()))
+            return _graph_stats(dict(zip(GRAPH_COUNT_CYPHER, counts)))
+
+        except Neo4jError as e:
+            return {"error": f"Neo4j error: {str(e)}"}
+
+    # ========================================================================
+    # DNACrypt-specific syntax
+    # ========================================================================
+
+    async def _send_message(self, node: SendMessage) -> Dict:
+        """SEND MESSAGE TO messages_admin_adult {...}"""
+        result = await self.send_messages(node.table, [node.data])
+        if result.get('status') != 'success':
+            return result
+
+        return {
+            "status": "success",
+            "message_id": result['results'][0]['message_id'],
+            "link_id": result['results'][0]['link_id'],
+            "graph_created": result['graph_created']
+        }
+
+    async def _send_messages(self, node: SendMessages) -> Dict:
+        """SEND MESSAGES TO messages_admin_adult [{...}, {...}, ...]"""
+        return await self.send_messages(node.table, node.rows)
+
+    async def send_messages(self, table_name: str, rows: List[Dict]) -> Dict:
+        """Bulk SEND MESSAGE; see DNACryptDB.send_messages"""
+        await self._ready(SendMessages)
+        if self.mysql_pool is None:
+            return {"error": "MySQL not connected"}
+        if not re.fullmatch(r'\w+', table_name):
+            return {"error": f"Invalid table name: {table_name}"}
+
+        try:
+            params, graph_rows = _message_params(table_name, rows)
+
+            insert_query = _insert_sql(table_name, MESSAGE_COLUMNS)
+            async with self._mysql() as (conn, cursor):
+                for chunk in _chunked(params, self.chunk_size):
+                    await cursor.executemany(insert_query, chunk)
+                    await cursor.executemany(ROUTE_SQL['message_table'],
+                                             [(row[5], table_name) for row in chunk])
+                await conn.commit()
+
+            graph_created = False
+            if self.neo4j_driver:
+                graph_created = await self._write_message_graph(graph_rows)
+
+            return _sent_result(graph_rows, graph_created)
+
+        except Error as e:
+            return {"error": str(e)}
+        except KeyError as e:
+            return {"error": f"Missing required field: {str(e)}"}
+        except (TypeError, AttributeError):
+            return {"error": "Each message must be an object"}
+
+    async def _write_message_graph(self, graph_rows: List[Dict]) -> bool:
+        """Graph side of SEND MESSAGE(S); returns False if the write failed"""
+        ts = datetime.utcnow().isoformat()
+        try:
+            async with self.neo4j_driver.session() as session:
+                for chunk in _chunked(graph_rows, self.chunk_size):
+                    await session.execute_write(
+                        self._run_write, SEND_MESSAGES_CYPHER, rows=chunk, ts=ts
+                    )
+            return True
+        except Neo4jError:
+            return False
+
+    async def _create_table_for_role(self, node: CreateTableForRole) -> Dict:
+        """CREATE TABLE messages FOR ROLE admin AGE adult"""
+        if self.mysql_pool is None:
+            return {"error": "MySQL not connected"}
+
+        try:
+            table_name, create_sql, info = _role_table(node)
+            async with self._mysql() as (conn, cursor):
+                await cursor.execute(create_sql)
+                await conn.commit()
+
+            await self._register(table_name, info)
+
+            return {
+                "status": "success",
+                "table": table_name,
+                "backend": "MySQL (ACID, 3NF)"
+            }
+
+        except (ValueError, Error) as e:
+            return {"error": str(e)}
+
+    async def _create_collection_for_role(self, node: CreateCollectionForRole) -> Dict:
+        """CREATE COLLECTION sequences FOR ROLE admin"""
+        if self.mongo_db is None:
+            return {"error": "MongoDB not connected"}
+
+        try:
+            coll_name, info = _role_collection(node)
+
+            if coll_name not in await self.mongo_db.list_collection_names():
+                await self.mongo_db.create_collection(coll_name)
+
+            await self.mongo_db[coll_name].create_index("link_id", unique=True)
+            await self.mongo_db[coll_name].create_index("created_at")
+
+            await self._register(coll_name, info)
+
+            return {
+                "status": "success",
+                "collection": coll_name,
+                "backend": "MongoDB (BASE)"
+            }
+
+        except PyMongoError as e:
+            return {"error": str(e)}
+
+    async def _add_row(self, node) -> Dict:
+        """INSERT the row of an ADD statement (see _row_insert) and return its id"""
+        if self.mysql_pool is None:
+            return {"error": "MySQL not connected"}
+
+        try:
+            columns, params, id_key = _row_insert(node)
+            async with self._mysql() as (conn, cursor):
+                await cursor.execute(_insert_sql(node.table, columns), params)
+                await conn.commit()
+                return {"status": "success", id_key: cursor.lastrowid}
+
+        except Error as e:
+            return {"error": str(e)}
+
+    async def _add_algorithm(self, node: AddAlgorithm) -> Dict:
+        """ADD ALGORITHM TO algorithms_admin {...}"""
+        return await self._add_row(node)
+
+    async def _add_key(self, node: AddKey) -> Dict:
+        """ADD KEY TO keys_admin {...}"""
+        return await self._add_row(node)
+
+    async def _add_hash(self, node: AddHash) -> Dict:
+        """ADD HASH TO hashes_admin {...}"""
+        return await self._add_row(node)
+
+    async def _store_sequence(self, node: StoreSequence) -> Dict:
+        """STORE SEQUENCE IN sequences_admin {...}"""
+        if self.mongo_db is None:
+            return {"error": "MongoDB not connected"}
+
+        try:
+            sequence_doc = self._sequence_doc(node.collection, node.data)
+            result = await self.mongo_db[node.collection].insert_one(sequence_doc)
+            await self._route_sequences(node.collection, [sequence_doc['link_id']])
+
+            return {
+                "status": "success",
+                "sequence_id": str(result.inserted_id),
+                "link_id": node.data['link_id']
+            }
+
+        except PyMongoError as e:
+            return {"error": str(e)}
+        except KeyError as e:
+            return {"error": f"Missing required field: {str(e)}"}
+        except Exception as e:
+            return {"error": f"Store sequence failed: {str(e)}"}
+
+    async def _store_sequences(self, node: StoreSequences) -> Dict:
+        """STORE SEQUENCES IN sequences_admin [{...}, {...}, ...]"""
+        return await self.store_sequences(node.collection, node.rows)
+
+    async def store_sequences(self, coll_name: str, sequences) -> Dict:
+        """Bulk STORE SEQUENCE; see DNACryptDB.store_sequences"""
+        await self._ready(StoreSequences)
+        if self.mongo_db is None:
+            return {"error": "MongoDB not connected"}
+
+        collection = self.mongo_db[coll_name]
+        inserted = 0
+        errors = []
+        chunk = []
+        positions = []
+
+        try:
+            for index, data in enumerate(sequences):
+                try:
+                    chunk.append(self._sequence_doc(coll_name, data))
+                    positions.append(index)
+                except KeyError as e:
+                    errors.append({"index": index, "error": f"Missing required field: {str(e)}"})
+                except (TypeError, AttributeError):
+                    errors.append({"index": index, "error": "Sequence must be an object"})
+
+                if len(chunk) >= self.chunk_size:
+                    inserted += await self._insert_sequence_chunk(collection, chunk, positions, errors)
+                    chunk, positions = [], []
+
+            if chunk:
+                inserted += await self._insert_sequence_chunk(collection, chunk, positions, errors)
+
+            errors.sort(key=lambda error: error['index'])
+            return {
+                "status": "success",
+                "inserted": inserted,
+                "failed": len(errors),
+                "errors": errors
+            }
+
+        except PyMongoError as e:
+            return {"error": str(e), "inserted": inserted}
+
+    async def _insert_sequence_chunk(self, collection, chunk: List[Dict],
+                                     positions: List[int], errors: List[Dict]) -> int:
+        """insert_many one chunk unordered, recording per-document failures"""
+        try:
+            result = await collection.insert_many(chunk, ordered=False)
+            await self._route_sequences(collection.name, [doc['link_id'] for doc in chunk])
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            failures, stored = _sequence_write_errors(e.details, chunk, positions)
+            await self._route_sequences(collection.name, stored)
+            errors.extend(failures)
+            return e.details.get('nInserted', 0)
+
+    async def _route_sequences(self, coll_name: str, link_ids: List[str]):
+        """Record the collection now holding these link_ids; see DNACryptDB._route_sequences"""
+        if self.mysql_pool is None or not link_ids:
+            return
+        try:
+            async with self._mysql() as (conn, cursor):
+                await cursor.executemany(ROUTE_SQL['sequence_collection'],
+                                         [(link_id, coll_name) for link_id in link_ids])
+                await conn.commit()
+        except Error:
+            pass
+
+    async def _get_message(self, node: GetMessage) -> Dict:
+        """GET MESSAGE FROM messages_admin_adult WHERE message_id = "..."""
+        if self.mysql_pool is None:
+            return {"error": "MySQL not connected"}
+
+        try:
+            async with self._mysql() as (conn, cursor):
+                await cursor.execute(_select_by_sql(node.table, node.field), (node.value,))
+                result = await cursor.fetchone()
+
+            if not result:
+                return {"error": "Message not found"}
+
+            return {"status": "success", "message": _iso_timestamp(result)}
+
+        except Error as e:
+            return {"error": str(e)}
+
+    async def _get_sequence(self, node: GetSequence) -> Dict:
+        """GET SEQUENCE FROM sequences_admin WHERE link_id = "..."""
+        if self.mongo_db is None:
+            return {"error": "MongoDB not connected"}
+
+        try:
+            sequence = await self.mongo_db[node.collection].find_one({"link_id": node.link_id})
+
+            if not sequence:
+                return {"error": "Sequence not found"}
+
+            return {"status": "success", "sequence": self._clean_doc(sequence)}
+
+        except PyMongoError as e:
+            return {"error": str(e)}
+
+    async def _link_data(self, node: LinkData) -> Dict:
+        """
+        LINK DATA WHERE link_id = "uuid"; see DNACryptDB._link_data
+
+        Inside a transaction the MySQL lookups run on the held connection
+        without a timeout, since cancelling a query part way would leave
+        that connection unusable.
+        """
+        link_id = node.link_id
+        in_transaction = self._txn.get() is not None
+
+        async def bounded(backend, lookup):
+            if backend == 'mysql' and in_transaction:
+                return await lookup
+            try:
+                return await asyncio.wait_for(lookup, self.link_timeouts[backend])
+            except asyncio.TimeoutError:
+                return None
+
+        route = {}
+        if self.mysql_pool is not None:
+            route = await bounded('mysql', self._link_route(link_id)) or {}
+
+        lookups = {
+            'mysql': self._link_mysql(link_id, route.get('message_table')),
+            'mongodb': self._link_mongo(link_id, route.get('sequence_collection')),
+            'neo4j': self._link_graph(link_id)
+        }
+        answers = await asyncio.gather(*map(bounded, lookups, lookups.values()))
+
+        result = {"status": "success", "link_id": link_id}
+        for backend, data in zip(lookups, answers):
+            result[f"{backend}_data"] = data if data is not None else {}
+        result["timed_out"] = [backend for backend, data in zip(lookups, answers) if data is None]
+        return result
+
+    async def _link_route(self, link_id: str) -> Dict:
+        """The _dnacdb_links row for link_id, or {} if it has none"""
+        try:
+            async with self._mysql() as (conn, cursor):
+                await cursor.execute(ROUTE_LOOKUP_SQL, (link_id,))
+                return await cursor.fetchone() or {}
+        except Error:
+            return {}
+
+    async def _link_mysql(self, link_id: str, table: str = None) -> Dict:
+        """The message with this link_id from table, else the first messages table holding it"""
+        if self.mysql_pool is None:
+            return {}
+
+        # Before taking a connection: loading the registry takes one of its own
+        candidates = _link_candidates(self.schema_registry, 'mysql', table)
+        async with self._mysql() as (conn, cursor):
+            for table_name in candidates:
+                try:
+                    await cursor.execute(_select_by_sql(table_name, 'link_id'), (link_id,))
+                    msg = await cursor.fetchone()
+                except Error:
+                    continue
+
+                if msg:
+                    return {'message': _iso_timestamp(msg), 'table': table_name}
+        return {}
+
+    async def _link_mongo(self, link_id: str, collection: str = None) -> Dict:
+        """The sequence with this link_id from collection, else the first collection holding it"""
+        if self.mongo_db is None:
+            return {}
+
+        for coll_name in _link_candidates(self.schema_registry, 'mongodb', collection):
+            try:
+                seq = await self.mongo_db[coll_name].find_one({"link_id": link_id})
+            except PyMongoError:
+                continue
+
+            if seq:
+                return {'sequence': self._clean_doc(seq), 'collection': coll_name}
+        return {}
+
+    async def _link_graph(self, link_id: str) -> Dict:
+        """Sender, receiver and accesses of the Message node with this link_id"""
+        if not self.neo4j_driver:
+            return {}
+
+        try:
+            async with self.neo4j_driver.session() as session:
+                result = await session.run(LINK_DATA_CYPHER, link_id=link_id)
+                record = await result.single()
+        except Neo4jError:
+            return {}
+
+        return _link_graph_result(record)
+
+    async def _polyglot_join(self, node: Join) -> Dict:
+        """JOIN messages_admin_adult WITH sequences_admin ON link_id"""
+        if self.mysql_pool is None:
+            return {"error": "MySQL not connected"}
+        if self.mongo_db is None:
+            return {"error": "MongoDB not connected"}
+
+        try:
+            async with self._mysql() as (conn, cursor):
+                plan = await self._plan_join(node, cursor)
+                joined_results = [row async for row in self._join_rows(node, plan, cursor)]
+
+            return _join_result(node, plan, joined_results)
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def _explain_join(self, node: ExplainJoin) -> Dict:
+        """EXPLAIN JOIN messages_admin_adult WITH sequences_admin ON link_id"""
+        if self.mysql_pool is None:
+            return {"error": "MySQL not connected"}
+        if self.mongo_db is None:
+            return {"error": "MongoDB not connected"}
+
+        try:
+            async with self._mysql() as (conn, cursor):
+                return {"status": "success", **await self._plan_join(node, cursor)}
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def _plan_join(self, node: Join, cursor) -> Dict:
+        """Estimate both sides of a JOIN and pick its strategy"""
+        await cursor.execute(TABLE_ROWS_SQL, (node.table,))
+        row = await cursor.fetchone()
+        mysql_rows = (row or {}).get('TABLE_ROWS') or 0
+        mongo_docs = await self.mongo_db[node.collection].estimated_document_count()
+
+        # Merge order is only shared for string keys, so check both sides
+        string_keys = False
+        if node.field == 'link_id':
+            await cursor.execute(KEY_TYPE_SQL, (node.table, node.field))
+            row = await cursor.fetchone()
+            string_keys = ((row or {}).get('DATA_TYPE') or '').lower() in STRING_KEY_TYPES
+        if string_keys:
+            string_keys = await self.mongo_db[node.collection].find_one(
+                {node.field: NON_STRING_KEY}) is None
+
+        return _join_plan(node, mysql_rows, mongo_docs, self.chunk_size, string_keys)
+
+    async def _join_rows(self, node: Join, plan: Dict, cursor):
+        """Yield joined rows, reading MySQL in chunks through cursor"""
+        strategy = plan['strategy']
+        join_field = node.field
+        collection = self.mongo_db[node.collection]
+        await cursor.execute(*_join_select(node, strategy, escape=True))
+
+        lookup = None
+        if strategy == 'hash':
+            lookup = await self._mongo_lookup(node.collection, join_field)
+        elif strategy == 'merge':
+            docs = collection.find({join_field: {"$ne": None}}, batch_size=self.chunk_size,
+                                   sort=[(join_field, 1)])
+            head = await self._next_doc(docs)
+
+        while True:
+            rows = await cursor.fetchmany(self.chunk_size)
+            if not rows:
+                break
+
+            # NULL keys never join, whichever strategy runs
+            rows = [row for row in rows if row.get(join_field) is not None]
+            if strategy == 'batch':
+                keys = list(dict.fromkeys(row[join_field] for row in rows))
+                lookup = await self._mongo_lookup(node.collection, join_field, keys) if keys else {}
+
+            for mysql_row in rows:
+                link_value = mysql_row[join_field]
+                if strategy == 'merge':
+                    # Both sides ascend, so documents behind this key never match again
+                    while head is not None and _merge_key(head[join_field]) < _merge_key(link_value):
+                        head = await self._next_doc(docs)
+                    matched = head is not None and head[join_field] == link_value
+                    mongo_doc = head if matched else None
+                elif strategy == 'nested_loop':
+                    mongo_doc = await collection.find_one({join_field: link_value})
+                    if mongo_doc is not None:
+                        mongo_doc = self._clean_doc(mongo_doc)
+                else:
+                    mongo_doc = lookup.get(link_value)
+
+                if mongo_doc is not None:
+                    yield self._joined_row(mysql_row, mongo_doc, join_field, link_value)
+
+    async def _next_doc(self, docs):
+        """Next cleaned document from an async cursor, or None when exhausted"""
+        try:
+            return self._clean_doc(await docs.__anext__())
+        except StopAsyncIteration:
+            return None
+
+    async def _mongo_lookup(self, coll_name: str, field: str, keys: List = None) -> Dict:
+        """Map field value -> first matching document, for keys or the whole collection"""
+        query = {field: {"$in": keys}} if keys is not None else {field: {"$ne": None}}
+        lookup = {}
+        async for doc in self.mongo_db[coll_name].find(query, batch_size=self.chunk_size):
+            lookup.setdefault(doc[field], self._clean_doc(doc))
+        return lookup
+
+    async def _list_messages(self, node: ListMessages) -> Dict:
+        """LIST MESSAGES FROM messages_admin_adult"""
+        if self.mysql_pool is None:
+            return {"error": "MySQL not connected"}
+
+        try:
+            async with self._mysql() as (conn, cursor):
+                results = [row async for row in self._message_rows(node, cursor)]
+
+            return {
+                "status": "success",
+                "count": len(results),
+                "messages": results
+            }
+
+        except Error as e:
+            return {"error": str(e)}
+
+    async def _message_rows(self, node: ListMessages, cursor):
+        """Yield LIST MESSAGES rows newest first, reading in chunks through cursor"""
+        await cursor.execute(*_message_select(node, escape=True))
+        while True:
+            results = await cursor.fetchmany(self.chunk_size)
+            if not results:
+                break
+            for result in results:
+                yield _iso_timestamp(result)
+
+    # ========================================================================
+    # Legacy syntax
+    # ========================================================================
+
+    async def _make_table(self, node: MakeTable) -> Dict:
+        """MAKE TABLE users WITH (name:text, age:int)"""
+        if self.mysql_pool is None:
+            return {"error": "MySQL not connected"}
+
+        try:
+            create_sql, info = _table_ddl(node)
+            async with self._mysql() as (conn, cursor):
+                await cursor.execute(create_sql)
+                await conn.commit()
+
+            await self._register(node.table, info)
+            return {"status": "success", "table": node.table}
+
+        except Error as e:
+            return {"error": str(e)}
+
+    async def _make_collection(self, node: MakeCollection) -> Dict:
+        """MAKE COLLECTION logs"""
+        if self.mongo_db is None:
+            return {"error": "MongoDB not connected"}
+
+        try:
+            if node.collection not in await self.mongo_db.list_collection_names():
+                await self.mongo_db.create_collection(node.collection)
+
+            await self._register(node.collection, {'backend': 'mongodb'})
+            return {"status": "success", "collection": node.collection}
+
+        except PyMongoError as e:
+            return {"error": str(e)}
+
+    async def _put_data(self, node: PutData) -> Dict:
+        """PUT INTO target DATA {...}"""
+        try:
+            target = node.target
+            data = dict(node.data)
+
+            if target not in self.schema_registry:
+                return {"error": f"Target '{target}' does not exist"}
+
+            if self.schema_registry[target]['backend'] == 'mysql':
+                fields = tuple(data.keys())
+                async with self._mysql() as (conn, cursor):
+                    await cursor.execute(_insert_sql(target, fields), tuple(data[f] for f in fields))
+                    await conn.commit()
+                    return {"status": "success", "inserted_id": cursor.lastrowid}
+
+            data['created_at'] = datetime.utcnow()
+            result = await self.mongo_db[target].insert_one(data)
+            return {"status": "success", "inserted_id": str(result.inserted_id)}
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def _fetch_data(self, node: FetchData) -> Dict:
+        """FETCH FROM source WHERE/ALL"""
+        try:
+            source = node.source
+
+            if source not in self.schema_registry:
+                return {"error": f"Source '{source}' does not exist"}
+
+            if self.schema_registry[source]['backend'] == 'mysql':
+                async with self._mysql() as (conn, cursor):
+                    await cursor.execute(*_fetch_sql(node, escape=True))
+                    results = await cursor.fetchall()
+                return {"status": "success", "count": len(results), "data": list(results)}
+
+            mongo_filter = self._parse_condition(node.condition) if node.condition else {}
+            results = [self._clean_doc(doc) async for doc in self.mongo_db[source].find(mongo_filter)]
+            return {"status": "success", "count": len(results), "data": results}
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def _change_data(self, node: ChangeData) -> Dict:
+        """CHANGE IN target SET field=value WHERE condition"""
+        try:
+            target = node.target
+
+            if target not in self.schema_registry:
+                return {"error": f"Target '{target}' does not exist"}
+
+            if self.schema_registry[target]['backend'] == 'mysql':
+                async with self._mysql() as (conn, cursor):
+                    await cursor.execute(*_update_sql(node, escape=True))
+                    await conn.commit()
+                    return {"status": "success", "updated": cursor.rowcount}
+
+            mongo_filter = self._parse_condition(node.condition)
+            result = await self.mongo_db[target].update_many(mongo_filter, _mongo_update(node.set_clause))
+            return {"status": "success", "updated": result.modified_count}
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def _remove_data(self, node: RemoveData) -> Dict:
+        """REMOVE FROM target WHERE condition"""
+        try:
+            target = node.target
+
+            if target not in self.schema_registry:
+                return {"error": f"Target '{target}' does not exist"}
+
+            if self.schema_registry[target]['backend'] == 'mysql':
+                async with self._mysql() as (conn, cursor):
+                    await cursor.execute(*_delete_sql(node, escape=True))
+                    await conn.commit()
+                    return {"status": "success", "deleted": cursor.rowcount}
+
+            result = await self.mongo_db[target].delete_many(self._parse_condition(node.condition))
+            return {"status": "success", "deleted": result.deleted_count}
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def _show_tables(self, node: ShowTables) -> Dict:
+        """Show all tables"""
+        tables = [name for name, info in list(self.schema_registry.items())
+                  if info.get('backend') == 'mysql']
+        return {"status": "success", "tables": tables, "count": len(tables)}
+
+    async def _show_collections(self, node: ShowCollections) -> Dict:
+        """Show all collections"""
+        collections = [name for name, info in list(self.schema_registry.items())
+                       if info.get('backend') == 'mongodb']
+        return {"status": "success", "collections": collections, "count": len(collections)}
+
+    async def _drop(self, node: Drop) -> Dict:
+        """DROP target"""
+        try:
+            target = node.target
+            if target not in self.schema_registry:
+                return {"error": f"Target '{target}' does not exist"}
+
+            if self.schema_registry[target]['backend'] == 'mysql':
+                async with self._mysql() as (conn, cursor):
+                    await cursor.execute(f"DROP TABLE {target}")
+                    await cursor.execute(UNROUTE_SQL['message_table'], (target,))
+                    await conn.commit()
+            else:
+                await self.mongo_db[target].drop()
+                if self.mysql_pool is not None:
+                    async with self._mysql() as (conn, cursor):
+                        await cursor.execute(UNROUTE_SQL['sequence_collection'], (target,))
+                        await conn.commit()
+
+            await self._unregister(target)
+            return {"status": "success"}
+
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def close(self):
+        """Close all database connections"""
+        if self.mysql_pool is not None:
+            self.mysql_pool.close()
+            await self.mysql_pool.wait_closed()
+        if self.mongo_client:
+            await self.mongo_client.close()
+        if self.neo4j_driver:
+            await self.neo4j_driver.close()
+        _release_logger(self._logger)
@@ -307,47 +307,196 @@ Provides commands for running scripts and interactive mode
 """
 
 import argparse
+import glob
 import json
+import logging
 import sys
 import os
-from .core import DNACryptDB
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .core import DNACryptDB, _summarize
+
+
+class _Progress:
+    """
+    One status line on stderr - statements, statements/s and errors, plus
+    a bar over the scripts when there are several - redrawn at most every
+    interval seconds. Without a terminal it prints a plain line instead,
+    less often.
+    """
+    
+    def __init__(self, scripts, interval=0.2, width=24, stream=None):
+        self.stream = stream or sys.stderr
+        self.live = self.stream.isatty()
+        self.interval = interval if self.live else 5.0
+        self.width = width
+        self.scripts = scripts
+        self.done = 0
+        self.statements = 0
+        self.errors = 0
+        self.started = self.drawn = time.monotonic()
+    
+    def track(self, results):
+        """Pass one script's results through, counting them"""
+        for result in results:
+            self.statements += 1
+            if result.get('error'):
+                self.errors += 1
+            if time.monotonic() - self.drawn >= self.interval:
+                self.draw()
+            yield result
+    
+    def script_done(self, summary=None):
+        """Count a finished script; summary carries the counts of a worker process's run"""
+        self.done += 1
+        if summary is not None:
+            self.statements += summary.get('total', 0)
+            self.errors += summary.get('errors', 1 if 'error' in summary else 0)
+        self.draw()
+    
+    def message(self, text):
+        """Print a line above the status line"""
+        self.stream.write(f"\r\033[K{text}\n" if self.live else f"{text}\n")
+        self.draw()
+    
+    def draw(self, final=False):
+        self.drawn = time.monotonic()
+        elapsed = self.drawn - self.started
+        rate = self.statements / elapsed if elapsed > 0 else 0.0
+        line = f"{self.statements:,} statements  {rate:,.0f}/s  {self.errors:,} errors"
+        if self.scripts > 1:
+            filled = self.width * self.done // self.scripts
+            bar = '█' * filled + '·' * (self.width - filled)
+            line = f"[{bar}] {self.done}/{self.scripts} scripts  {line}"
+        if self.live:
+            self.stream.write(f"\r\033[K{line}" + ("\n" if final else ""))
+        elif final or self.drawn - self.started >= self.interval:
+            self.stream.write(f"{line}\n")
+        self.stream.flush()
+
+
+def _expand_scripts(patterns):
+    """Script paths for the run arguments, expanding glob patterns in order"""
+    paths = []
+    for pattern in patterns:
+        if any(ch in pattern for ch in '*?['):
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                raise FileNotFoundError(f"No files match: {pattern}")
+        else:
+            matches = [pattern]
+        paths.extend(path for path in matches if path not in paths)
+    return paths
+
+
+def _run_script(config, path, commit_every, verbose, progress=None):
+    """Run one script on its own DNACryptDB instance and return its summary"""
+    try:
+        db = DNACryptDB(config_file=config, verbose=verbose)
+    except Exception as e:
+        return {"error": str(e)}
+    
+    try:
+        # Results are counted as they stream in, so large scripts run in constant memory
+        if progress is not None:
+            return _summarize(progress.track(db.iter_file(path, commit_every)))
+        return db.execute_file(path, summary_only=True, commit_every=commit_every)
+    except Exception as e:
+        return {"error": str(e)}
+    finally:
+        db.close()
+
+
+def _script_result(path, summary):
+    """One line for a finished script in a multi-script run"""
+    if 'error' in summary:
+        return f"✗ {path}: {summary['error']}"
+    mark = "✓" if summary['errors'] == 0 else "✗"
+    return f"{mark} {path}: {summary['total']} queries, {summary['errors']} errors"
 
 
 def cli_run(args):
-    """Run a .dnacdb script file"""
-    print(f"DNACryptDB - Running: {args.file}")
-    print("="*70)
-    
+    """Run .dnacdb script files, up to --jobs of them at once in worker processes"""
     try:
-        db = DNACryptDB(config_file=args.config, verbose=True)
-        results = db.execute_file(args.file)
-        
-        # Summary
-        print("\n" + "="*70)
-        print(f"Execution Summary")
-        print("="*70)
-        
-        total = len(results)
-        success = sum(1 for r in results if r.get('status') == 'success')
-        errors = sum(1 for r in results if r.get('error'))
-        comments = sum(1 for r in results if r.get('status') == 'comment')
-        
-        print(f"Total queries: {total}")
-        print(f"✓ Success: {success}")
-        print(f"✗ Errors: {errors}")
-        print(f"# Comments: {comments}")
-        print("="*70)
-        
-        db.close()
-        
-        return 0 if errors == 0 else 1
-        
+        files = _expand_scripts(args.files)
     except FileNotFoundError as e:
         print(f"✗ Error: {e}")
         return 1
+    
+    parallel = args.jobs > 1 and len(files) > 1
+    # Statement output goes through logging; --quiet and --progress turn
+    # it off and leave backend warnings (--progress) or nothing (--quiet)
+    verbose = not (args.quiet or args.progress)
+    progress = _Progress(len(files)) if args.progress else None
+    if progress is not None:
+        logging.basicConfig(level=logging.WARNING, format='%(message)s')
+    
+    def report(path, summary):
+        if progress is not None:
+            progress.script_done(summary if parallel else None)
+            if 'error' in summary or summary['errors']:
+                progress.message(_script_result(path, summary))
+        elif not args.quiet and len(files) > 1:
+            print(_script_result(path, summary))
+    
+    if len(files) == 1:
+        print(f"DNACryptDB - Running: {files[0]}")
+    else:
+        print(f"DNACryptDB - Running {len(files)} scripts ({args.jobs if parallel else 1} at a time)")
+    print("="*70)
+    
+    summaries = {}
+    try:
+        if parallel:
+            # Each worker process opens its own connections; statement output
+            # would interleave, so only per-file results are printed
+            with ProcessPoolExecutor(max_workers=min(args.jobs, len(files))) as pool:
+                futures = {
+                    pool.submit(_run_script, args.config, path, args.commit_every, False): path
+                    for path in files
+                }
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        summaries[path] = future.result()
+                    except Exception as e:
+                        summaries[path] = {"error": f"Worker failed: {e}"}
+                    report(path, summaries[path])
+        else:
+            for path in files:
+                summaries[path] = _run_script(args.config, path, args.commit_every,
+                                              verbose, progress)
+                report(path, summaries[path])
     except Exception as e:
         print(f"✗ Unexpected error: {e}")
         return 1
+    finally:
+        if progress is not None:
+            progress.draw(final=True)
+    
+    if len(files) == 1 and 'error' in summaries[files[0]]:
+        print(f"✗ Error: {summaries[files[0]]['error']}")
+        return 1
+    
+    completed = [summary for summary in summaries.values() if 'error' not in summary]
+    failed = len(summaries) - len(completed)
+    totals = {key: sum(summary[key] for summary in completed)
+              for key in ('total', 'success', 'errors', 'comments')}
+    
+    # Summary
+    print("\n" + "="*70)
+    print(f"Execution Summary")
+    print("="*70)
+    
+    if len(files) > 1:
+        print(f"Scripts: {len(files)} ({failed} could not run)")
+    print(f"Total queries: {totals['total']}")
+    print(f"✓ Success: {totals['success']}")
+    print(f"✗ Errors: {totals['errors']}")
+    print(f"# Comments: {totals['comments']}")
+    print("="*70)
+    
+    return 0 if totals['errors'] == 0 and not failed else 1
 
 
 def cli_interactive(args):
@@ -462,7 +611,8 @@ def cli_init(args):
             "host": mysql_host,
             "user": mysql_user,
             "password": mysql_pass,
-            "database": mysql_db
+            "database": mysql_db,
+            "pool_size": 5
         },
         "mongodb": {
             "uri": mongo_uri,
@@ -548,6 +698,12 @@ Examples:
   # Run a script file
   dnacryptdb run script.dnacdb
   
+  # Run shard files four at a time
+  dnacryptdb run --jobs 4 "shards/*.dnacdb"
+  
+  # Large script: a progress line instead of per-statement output
+  dnacryptdb run --progress migration.dnacdb
+  
   # Start interactive mode
   dnacryptdb interactive
   
@@ -573,17 +729,44 @@ For more information, visit: https://github.com/yourusername/dnacryptdb
     # Run command
     run_parser = subparsers.add_parser(
         'run',
-        help='Run a .dnacdb script file'
+        help='Run .dnacdb script files'
+    )
+    run_parser.add_argument(
+        'files',
+        nargs='+',
+        metavar='file',
+        help='.dnacdb script files or glob patterns to execute'
     )
     run_parser.add_argument(
-        'file',
-        help='.dnacdb script file to execute'
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Run up to N scripts at once in worker processes (default: 1)'
     )
     run_parser.add_argument(
         '-c', '--config',
         default='dnacdb.config.json',
         help='Config file (default: dnacdb.config.json)'
     )
+    run_parser.add_argument(
+        '--commit-every',
+        type=int,
+        default=0,
+        metavar='N',
+        help='Commit MySQL writes in batches of N statements (default: every statement)'
+    )
+    output_group = run_parser.add_mutually_exclusive_group()
+    output_group.add_argument(
+        '-q', '--quiet',
+        action='store_true',
+        help='Print only the execution summary'
+    )
+    output_group.add_argument(
+        '--progress',
+        action='store_true',
+        help='Show a statements/s and error count line instead of each statement'
+    )
     
     # Interactive command
     interactive_parser = subparsers.add_parser(
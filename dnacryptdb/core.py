@@ -2867,31 +2867,1200 @@ DNACryptDB Triglot Core Engine
 Handles MySQL, MongoDB, and Neo4j with custom query language
 """
 
-import mysql.connector
-from mysql.connector import Error
-from pymongo import MongoClient
-from pymongo.errors import PyMongoError
-from neo4j import GraphDatabase
-from neo4j.exceptions import Neo4jError
+import itertools
 import json
+import logging
 import re
-from typing import Dict, Any, List
+import sys
+from typing import Dict, Any, List, Iterator, Optional, Set, Tuple
 from datetime import datetime
 import os
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from functools import lru_cache
+from .parser import (
+    tokenize, normalize, compile_template, bind, CreateUser, CreateUsers, CreateMessageNode,
+    RelateSent, RelateTrust, RelateMany, FindPath, FindPattern, DetectAnomaly, TrackAccess, ShowGraph,
+    CreateTableForRole, CreateCollectionForRole, SendMessage, SendMessages, AddAlgorithm,
+    AddKey, AddHash, StoreSequence, StoreSequences, GetMessage, GetSequence, LinkData, Join, ExplainJoin,
+    ListMessages, MakeTable, MakeCollection, PutData, FetchData, ChangeData,
+    RemoveData, ShowTables, ShowCollections, Drop, Begin, Commit, Rollback, Parser,
+    ParseError, Clause, _lookup
+)
+
+# Database drivers are imported by the first _connect_* call for their
+# backend, which rebinds these exception names to the driver's own. Until
+# then no driver code can raise, so the placeholders only keep the except
+# clauses valid.
+class Error(Exception):
+    """mysql.connector.Error once MySQL is used"""
+
+
+class PyMongoError(Exception):
+    """pymongo.errors.PyMongoError once MongoDB is used"""
+
+
+class BulkWriteError(PyMongoError):
+    """pymongo.errors.BulkWriteError once MongoDB is used"""
+
+
+class Neo4jError(Exception):
+    """neo4j.exceptions.Neo4jError once Neo4j is used"""
+
+
+# Connection events at INFO, backend problems at WARNING, script
+# statements at DEBUG and their failures at INFO
+logger = logging.getLogger(__name__)
+
+# Silent unless the application configures logging or passes verbose=True.
+# Set here rather than in __init__ so a bare "import dnacryptdb" stays
+# free of the logging import
+logging.getLogger('dnacryptdb').addHandler(logging.NullHandler())
+
+
+# Numbers the per-engine loggers, e.g. dnacryptdb.core.engine1
+_engine_ids = itertools.count(1)
+
+
+def _engine_logger(parent: logging.Logger, verbose: bool) -> logging.Logger:
+    """
+    A child of parent for one engine. With verbose it prints every record
+    to stdout as plain lines, whatever the application's levels, and does
+    not propagate; otherwise it follows the application's logging config.
+    _release_logger undoes this when the engine closes.
+    """
+    engine_logger = parent.getChild(f"engine{next(_engine_ids)}")
+    if verbose:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        engine_logger.addHandler(handler)
+        engine_logger.setLevel(logging.DEBUG)
+        engine_logger.propagate = False
+    return engine_logger
+
+
+def _release_logger(engine_logger: logging.Logger):
+    """Detach a closed engine's stdout handler and hand its logger back to the config"""
+    for handler in list(engine_logger.handlers):
+        engine_logger.removeHandler(handler)
+    engine_logger.setLevel(logging.NOTSET)
+    engine_logger.propagate = True
+
+
+# Column lists for the DNACrypt INSERT statements
+MESSAGE_COLUMNS = ('message_id', 'content_text', 'sender', 'receiver',
+                   'urgency', 'link_id', 'role', 'age_group')
+ALGORITHM_COLUMNS = ('message_id', 'algorithm_name', 'algorithm_type',
+                     'parameters', 'execution_order', 'role')
+KEY_COLUMNS = ('message_id', 'public_key', 'key_type', 'key_size', 'role')
+HASH_COLUMNS = ('message_id', 'hash_value', 'hash_algorithm', 'salt', 'role')
+
+# Pooled MySQL connections unless "pool_size" is set in the mysql config
+MYSQL_POOL_SIZE = 5
+
+# Default rows per executemany / UNWIND round trip in the bulk statements,
+# overridable with "chunk_size" in dnacdb.config.json
+BULK_CHUNK_SIZE = 1000
+
+# Seconds LINK DATA waits on each backend before answering without it,
+# overridable with "link_timeout" in dnacdb.config.json: a number, or an
+# object keyed by backend ({"mysql": 1.0, "mongodb": 1.0, "neo4j": 3.0})
+LINK_DATA_TIMEOUT = 2.0
+
+# Threads shared by LINK DATA lookups, three per statement in flight
+LINK_DATA_WORKERS = 12
+
+# Graph side of SEND MESSAGE(S): users, message and both edges in one statement
+SEND_MESSAGES_CYPHER = """
+    UNWIND $rows AS row
+    MERGE (s:User {email: row.sender}) ON CREATE SET s.created_at = $ts
+    MERGE (r:User {email: row.receiver}) ON CREATE SET r.created_at = $ts
+    CREATE (m:Message {
+        message_id: row.message_id,
+        link_id: row.link_id,
+        urgency: row.urgency,
+        timestamp: $ts
+    })
+    CREATE (s)-[:SENT {timestamp: $ts}]->(m)
+    CREATE (m)-[:RECEIVED {timestamp: $ts}]->(r)
+"""
+
+# LINK DATA: the message node, its sender/receiver and who accessed it
+LINK_DATA_CYPHER = """
+    MATCH (m:Message {link_id: $link_id})
+    OPTIONAL MATCH (sender:User)-[sent:SENT]->(m)
+    OPTIONAL MATCH (m)-[received:RECEIVED]->(receiver:User)
+    OPTIONAL MATCH (u:User)-[accessed:ACCESSED]->(m)
+    RETURN m, sender, receiver, 
+           COUNT(accessed) as access_count,
+           COLLECT(DISTINCT u.email) as accessed_by
+"""
+
+# JOIN strategies, selectable with JOIN ... USING <strategy>
+JOIN_STRATEGIES = ('nested_loop', 'batch', 'hash', 'merge')
+
+# Row estimate for the MySQL side of a JOIN
+TABLE_ROWS_SQL = ("SELECT TABLE_ROWS FROM information_schema.TABLES "
+                  "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s")
+
+# JOIN loads the whole collection into a hash table at or below this size
+HASH_JOIN_MAX_DOCS = 10000
+
+# Column type of the MySQL join key, to check a merge join's key order
+KEY_TYPE_SQL = ("SELECT DATA_TYPE FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s")
+
+# MySQL column types whose binary order matches MongoDB's string order
+STRING_KEY_TYPES = ('char', 'varchar', 'tinytext', 'text', 'mediumtext', 'longtext')
+
+# A document whose join key is set but is not a string
+NON_STRING_KEY = {"$ne": None, "$not": {"$type": "string"}}
+
+# CREATE USERS: one MERGE per row keyed on the unique email
+CREATE_USERS_CYPHER = """
+    UNWIND $rows AS row
+    MERGE (u:User {email: row.email}) ON CREATE SET u.created_at = $ts
+    SET u += row.props, u.user_id = coalesce(u.user_id, row.user_id)
+"""
+
+# RELATE MANY: relationship types cannot be parameters, so one query per type
+RELATE_MANY_CYPHER = {
+    'SENT': """
+        UNWIND $rows AS row
+        MATCH (u:User {email: row.from})
+        MATCH (m:Message {message_id: row.to})
+        MERGE (u)-[r:SENT]->(m)
+        SET r.timestamp = coalesce(row.at, $ts)
+    """,
+    'TRUSTS': """
+        UNWIND $rows AS row
+        MATCH (u1:User {email: row.from})
+        MATCH (u2:User {email: row.to})
+        MERGE (u1)-[r:TRUSTS]->(u2)
+        SET r.level = row.level, r.since = $ts
+    """,
+}
+
+# CREATE USER: MERGEd on the unique email like CREATE USERS, so an existing
+# user is updated; CREATE MESSAGE NODE: one node from the statement's object
+CREATE_USER_CYPHER = """
+    MERGE (u:User {email: $email}) ON CREATE SET u.created_at = $ts
+    SET u += $props, u.user_id = coalesce(u.user_id, $user_id)
+    RETURN u.user_id as user_id, u.email as email
+"""
+CREATE_MESSAGE_CYPHER = """
+    CREATE (m:Message $props)
+    RETURN m.message_id as message_id
+"""
+
+# RELATE: one relationship between existing nodes, by type
+RELATE_CYPHER = {
+    'SENT': """
+        MATCH (u:User {email: $email})
+        MATCH (m:Message {message_id: $msg_id})
+        CREATE (u)-[r:SENT {timestamp: $ts}]->(m)
+        RETURN r
+    """,
+    'TRUSTS': """
+        MATCH (u1:User {email: $email1})
+        MATCH (u2:User {email: $email2})
+        CREATE (u1)-[r:TRUSTS {level: $level, since: $ts}]->(u2)
+        RETURN r
+    """,
+}
+
+# FIND PATH: path length bounds cannot be parameters, so MAX is formatted in
+FIND_PATH_CYPHER = """
+    MATCH path = shortestPath(
+        (start:User {{email: $start}})-[*1..{max_depth}]-(end:User {{email: $end}})
+    )
+    RETURN path, length(path) as hops
+"""
+
+# FIND PATTERN users WHO accessed MORE THAN n messages
+EXCESSIVE_ACCESS_CYPHER = """
+    MATCH (u:User)-[:ACCESSED]->(m:Message)
+    WITH u, COUNT(m) as access_count
+    WHERE access_count > $threshold
+    RETURN u.email as email, access_count
+    ORDER BY access_count DESC
+"""
+
+# DETECT ANOMALY: users who reopen the same messages far more than others
+DETECT_ANOMALY_CYPHER = """
+    MATCH (u:User)-[a:ACCESSED]->(m:Message)
+    WITH u, COUNT(DISTINCT m) as msg_count,
+         COUNT(a) as access_count,
+         AVG(a.duration) as avg_duration
+    WHERE access_count > msg_count * 3
+    RETURN u.email as email,
+           msg_count,
+           access_count,
+           (access_count * 1.0 / msg_count) as access_ratio
+    ORDER BY access_ratio DESC
+    LIMIT 10
+"""
+
+# TRACK ACCESS: one ACCESSED edge per access
+TRACK_ACCESS_CYPHER = """
+    MATCH (u:User {email: $email})
+    MATCH (m:Message {message_id: $msg_id})
+    CREATE (u)-[a:ACCESSED {
+        timestamp: $ts,
+        action: $action,
+        success: $success,
+        ip_address: $ip
+    }]->(m)
+"""
+
+# SHOW GRAPH: one count per node label and relationship type
+GRAPH_COUNT_CYPHER = {
+    'users': "MATCH (u:User) RETURN COUNT(u) as count",
+    'messages': "MATCH (m:Message) RETURN COUNT(m) as count",
+    'sent': "MATCH ()-[r:SENT]->() RETURN COUNT(r) as count",
+    'trusts': "MATCH ()-[r:TRUSTS]->() RETURN COUNT(r) as count",
+    'accessed': "MATCH ()-[r:ACCESSED]->() RETURN COUNT(r) as count",
+}
+
+# MAKE TABLE field types -> MySQL column types
+SQL_TYPES = {
+    'int': 'INT', 'integer': 'INT', 'text': 'VARCHAR(255)',
+    'float': 'FLOAT', 'date': 'DATE', 'datetime': 'DATETIME',
+    'bool': 'BOOLEAN'
+}
+
+# CREATE TABLE ... FOR ROLE: DDL per table type
+ROLE_TABLE_TEMPLATES = {
+    'messages': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            message_id VARCHAR(36) PRIMARY KEY,
+            content_text TEXT NOT NULL,
+            sender VARCHAR(255) NOT NULL,
+            receiver VARCHAR(255) NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            urgency ENUM('low', 'medium', 'high', 'critical') DEFAULT 'medium',
+            status ENUM('pending', 'sent', 'delivered', 'read') DEFAULT 'pending',
+            link_id VARCHAR(36) UNIQUE NOT NULL,
+            role VARCHAR(50),
+            age_group VARCHAR(50),
+            INDEX idx_sender (sender),
+            INDEX idx_receiver (receiver),
+            INDEX idx_timestamp (timestamp),
+            INDEX idx_link (link_id)
+        )
+    """,
+    'algorithms': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            algo_id INT AUTO_INCREMENT PRIMARY KEY,
+            message_id VARCHAR(36) NOT NULL,
+            algorithm_name VARCHAR(100) NOT NULL,
+            algorithm_type ENUM('encryption', 'hashing', 'encoding', 'compression') NOT NULL,
+            parameters JSON,
+            execution_order INT,
+            role VARCHAR(50),
+            INDEX idx_message (message_id)
+        )
+    """,
+    'keys': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            key_id INT AUTO_INCREMENT PRIMARY KEY,
+            message_id VARCHAR(36) NOT NULL,
+            public_key TEXT NOT NULL,
+            key_type ENUM('RSA', 'ECC', 'lattice', 'DNA_based') NOT NULL,
+            key_size INT,
+            role VARCHAR(50),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_message (message_id)
+        )
+    """,
+    'hashes': """
+        CREATE TABLE IF NOT EXISTS {name} (
+            hash_id INT AUTO_INCREMENT PRIMARY KEY,
+            message_id VARCHAR(36) NOT NULL,
+            hash_value VARCHAR(512) NOT NULL,
+            hash_algorithm ENUM('SHA256', 'SHA512', 'Blake2', 'DNA_hash') NOT NULL,
+            salt VARCHAR(255),
+            role VARCHAR(50),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_message (message_id),
+            INDEX idx_hash (hash_value(255))
+        )
+    """
+}
+
+# link_id -> the messages table and sequence collection holding it, kept by
+# SEND MESSAGE(S) and STORE SEQUENCE(S) so LINK DATA reads one of each
+LINK_ROUTES_DDL = """
+    CREATE TABLE IF NOT EXISTS _dnacdb_links (
+        link_id VARCHAR(255) PRIMARY KEY,
+        message_table VARCHAR(255),
+        sequence_collection VARCHAR(255)
+    )
+"""
+ROUTE_LOOKUP_SQL = "SELECT message_table, sequence_collection FROM _dnacdb_links WHERE link_id = %s"
+ROUTE_SQL = {
+    column: (f"INSERT INTO _dnacdb_links (link_id, {column}) VALUES (%s, %s) "
+             f"ON DUPLICATE KEY UPDATE {column} = VALUES({column})")
+    for column in ('message_table', 'sequence_collection')
+}
+UNROUTE_SQL = {
+    column: f"UPDATE _dnacdb_links SET {column} = NULL WHERE {column} = %s"
+    for column in ('message_table', 'sequence_collection')
+}
+
+# schema_registry persisted per backend: a MySQL table for tables and a
+# MongoDB collection for collections, both named _dnacdb_catalog
+CATALOG_NAME = "_dnacdb_catalog"
+CATALOG_DDL = """
+    CREATE TABLE IF NOT EXISTS _dnacdb_catalog (
+        name VARCHAR(255) PRIMARY KEY,
+        info JSON NOT NULL
+    )
+"""
+CATALOG_PUT_SQL = ("INSERT INTO _dnacdb_catalog (name, info) VALUES (%s, %s) "
+                   "ON DUPLICATE KEY UPDATE info = VALUES(info)")
+CATALOG_DELETE_SQL = "DELETE FROM _dnacdb_catalog WHERE name = %s"
+
+# Every table in the database with its catalog entry, if any, in one query
+CATALOG_TABLES_SQL = """
+    SELECT t.TABLE_NAME AS name, c.info
+    FROM information_schema.TABLES t
+    LEFT JOIN _dnacdb_catalog c ON c.name = t.TABLE_NAME
+    WHERE t.TABLE_SCHEMA = DATABASE() AND LEFT(t.TABLE_NAME, 8) <> '_dnacdb_'
+"""
+
+# Bookkeeping tables created at startup
+MYSQL_SCHEMA = (LINK_ROUTES_DDL, CATALOG_DDL)
+
+# Created at startup so MERGE/MATCH on these keys are index lookups
+GRAPH_SCHEMA = (
+    "CREATE CONSTRAINT user_email IF NOT EXISTS "
+    "FOR (u:User) REQUIRE u.email IS UNIQUE",
+    "CREATE CONSTRAINT message_id IF NOT EXISTS "
+    "FOR (m:Message) REQUIRE m.message_id IS UNIQUE",
+    "CREATE INDEX message_link_id IF NOT EXISTS "
+    "FOR (m:Message) ON (m.link_id)",
+)
+
+
+def _chunked(rows, size: int):
+    """Yield lists of up to size items from any iterable"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _sql_args(clause, escape: bool = False) -> Tuple[str, Optional[tuple]]:
+    """
+    SQL text and driver args for a bound WHERE/SET clause; a Clause's
+    $parameters become %s placeholders. With escape, for drivers that
+    %-format the whole statement (PyMySQL), literal % signs are doubled
+    and args is always a tuple so the driver undoes that.
+    """
+    if not isinstance(clause, Clause):
+        if not escape:
+            return clause, None
+        return (clause.replace('%', '%%') if clause else clause), ()
+    segments = clause.segments
+    if escape:
+        segments = [segment.replace('%', '%%') for segment in segments]
+    return '%s'.join(segments), clause.args
+
+
+def _join_select(node, strategy: str, escape: bool = False) -> Tuple[str, Optional[tuple]]:
+    """SELECT and its args for the MySQL side of a JOIN"""
+    select_query = f"SELECT * FROM {node.table}"
+    args = None
+    if node.where:
+        where, args = _sql_args(node.where, escape)
+        select_query += f" WHERE {where}"
+    if strategy == 'merge':
+        # Byte order, as MongoDB sorts strings, not the case-insensitive collation
+        select_query += f" ORDER BY CAST({node.field} AS BINARY)"
+    return select_query, args
+
+
+def _merge_key(value) -> Tuple[int, Any]:
+    """Merge join sort key in MongoDB's order: numbers, then strings by code point"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    if isinstance(value, str):
+        return (1, value)
+    return (2, str(value))
+
+
+def _join_plan(node, mysql_rows: int, mongo_docs: int, chunk_size: int,
+               string_keys: bool = False) -> Dict:
+    """
+    Pick a join strategy from the estimated size of each side, unless
+    one was requested with USING:
+    
+    - hash: the collection is small enough to hold in memory
+    - merge: both sides are read whole in link_id byte order and zipped
+      together with O(1) memory; ON link_id only, and only when
+      string_keys says both sides hold string keys, since the MySQL
+      order only matches MongoDB's for strings
+    - batch: one $in query per chunk of MySQL rows
+    - nested_loop: one find_one per MySQL row (USING only)
+    """
+    plan = {"mysql_rows": mysql_rows, "mongo_docs": mongo_docs}
+    whole = node.field == 'link_id' and not node.where and mysql_rows * 2 >= mongo_docs
+    if node.strategy:
+        strategy = node.strategy.lower()
+        if strategy not in JOIN_STRATEGIES:
+            raise ValueError(f"Unknown join strategy: {node.strategy}")
+        if strategy == 'merge' and node.field != 'link_id':
+            raise ValueError("USING merge needs ON link_id")
+        if strategy == 'merge' and not string_keys:
+            raise ValueError("USING merge needs string link_id keys on both sides")
+        plan['strategy'] = strategy
+        plan['reason'] = "requested with USING"
+    elif mongo_docs <= HASH_JOIN_MAX_DOCS and mongo_docs < mysql_rows:
+        plan['strategy'] = 'hash'
+        plan['reason'] = (f"collection has ~{mongo_docs} documents (<= {HASH_JOIN_MAX_DOCS}), "
+                          f"fewer than ~{mysql_rows} rows; loaded once into memory")
+    elif whole and string_keys:
+        plan['strategy'] = 'merge'
+        plan['reason'] = (f"both sides are read whole "
+                          f"(~{mysql_rows} rows, ~{mongo_docs} documents); "
+                          f"streamed in link_id byte order")
+    elif whole and mongo_docs <= HASH_JOIN_MAX_DOCS:
+        plan['strategy'] = 'hash'
+        plan['reason'] = (f"both sides are read whole, but link_id keys are not all "
+                          f"strings, so their orders may differ; ~{mongo_docs} documents "
+                          f"loaded once into memory")
+    else:
+        plan['strategy'] = 'batch'
+        plan['reason'] = (f"one $in query per {chunk_size} of ~{mysql_rows} rows "
+                          f"against ~{mongo_docs} documents")
+    
+    field = node.field
+    plan['mysql_query'] = _join_select(node, plan['strategy'])[0]
+    plan['mongo_query'] = {
+        'nested_loop': f"find_one({{{field}: <value>}}) per row",
+        'batch': f"find({{{field}: {{$in: [...]}}}}) per {chunk_size} rows",
+        'hash': f"find({{{field}: {{$ne: null}}}}) once",
+        'merge': f"find({{{field}: {{$ne: null}}}}).sort({{{field}: 1}})",
+    }[plan['strategy']]
+    return plan
+
+
+def _link_timeouts(setting) -> Dict[str, float]:
+    """Per-backend LINK DATA timeouts from the "link_timeout" config value"""
+    if isinstance(setting, dict):
+        return {backend: float(setting.get(backend, LINK_DATA_TIMEOUT))
+                for backend in ('mysql', 'mongodb', 'neo4j')}
+    return dict.fromkeys(('mysql', 'mongodb', 'neo4j'), float(setting))
+
+
+# ${var.path} references in script statements: a variable name and a
+# dotted path into its result, e.g. ${msg.link_id} or ${batch.ids.0}
+SCRIPT_REF = re.compile(r'\$\{(\w+)\.(\w+(?:\.\w+)*)\}')
+
+# Characters that change the statement splitter's state: quotes, escapes
+# inside strings, and the statement terminator
+SCRIPT_SPECIAL = re.compile(r'["\'\\;]')
+
+# Statements execute_file(jobs > 1) schedules together; each window
+# finishes before the next is read, so memory stays bounded
+SCRIPT_DAG_WINDOW = 1000
+
+# Script footprint resources: all of Neo4j, and anything (a barrier)
+GRAPH_RESOURCE = ':graph'
+ANY_RESOURCE = '*'
+
+
+def _footprint(node) -> Tuple[Set[str], Set[str], Set[str]]:
+    """
+    Resources a statement reads, appends to and writes, for ordering
+    script statements: table/collection names, GRAPH_RESOURCE, or
+    ANY_RESOURCE when it may touch anything. Appends are inserts of new
+    rows, documents or MERGEd nodes; they commute with each other but not
+    with reads or writes of the same resource.
+    """
+    if isinstance(node, (CreateUser, CreateUsers, CreateMessageNode, RelateSent,
+                         RelateTrust, RelateMany, TrackAccess)):
+        return set(), set(), {GRAPH_RESOURCE}
+    if isinstance(node, (FindPath, FindPattern, DetectAnomaly, ShowGraph)):
+        return {GRAPH_RESOURCE}, set(), set()
+    if isinstance(node, (SendMessage, SendMessages)):
+        return set(), {node.table, GRAPH_RESOURCE}, set()
+    if isinstance(node, (AddAlgorithm, AddKey, AddHash)):
+        return set(), {node.table}, set()
+    if isinstance(node, (StoreSequence, StoreSequences)):
+        return set(), {node.collection}, set()
+    if isinstance(node, PutData):
+        return set(), {node.target}, set()
+    if isinstance(node, (GetMessage, ListMessages)):
+        return {node.table}, set(), set()
+    if isinstance(node, GetSequence):
+        return {node.collection}, set(), set()
+    if isinstance(node, Join):
+        return {node.table, node.collection}, set(), set()
+    if isinstance(node, FetchData):
+        return {node.source}, set(), set()
+    if isinstance(node, CreateTableForRole):
+        parts = [node.table_type, node.role] + ([node.age_group] if node.age_group else [])
+        return set(), set(), {'_'.join(parts).lower()}
+    if isinstance(node, CreateCollectionForRole):
+        return set(), set(), {f"{node.coll_type}_{node.role}".lower()}
+    if isinstance(node, MakeTable):
+        return set(), set(), {node.table}
+    if isinstance(node, MakeCollection):
+        return set(), set(), {node.collection}
+    if isinstance(node, (ChangeData, RemoveData, Drop)):
+        return set(), set(), {node.target}
+    if isinstance(node, (LinkData, ShowTables, ShowCollections)):
+        return {ANY_RESOURCE}, set(), set()
+    return set(), set(), {ANY_RESOURCE}
+
+
+def _script_statements(lines) -> Iterator[str]:
+    """
+    Split .dnacdb script lines into statements as they are read. A ';'
+    outside a string literal ends a statement, so several may share a line
+    and a string (or the JSON around it) may hold ';' or span lines; line
+    breaks inside a string are kept. Blank lines and lines starting with
+    # or -- are skipped outside strings.
+    """
+    current = []
+    quote = None
+    for raw in lines:
+        if quote:
+            line = raw.rstrip('\r\n')
+            current.append('\n')
+        else:
+            line = raw.strip()
+            if not line or line.startswith(('#', '--')):
+                continue
+            if current:
+                current.append(' ')
+        
+        start = skip = 0
+        for match in SCRIPT_SPECIAL.finditer(line):
+            pos = match.start()
+            if pos < skip:
+                continue
+            char = match.group()
+            if quote:
+                if char == '\\':
+                    skip = pos + 2
+                elif char == quote:
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char == ';':
+                current.append(line[start:pos])
+                statement = ''.join(current).strip()
+                if statement:
+                    yield statement
+                current = []
+                start = pos + 1
+                # A comment after the terminator runs to the end of the line
+                if line[start:].lstrip().startswith(('#', '--')):
+                    start = len(line)
+                    break
+        
+        rest = line[start:]
+        if quote or rest.strip():
+            current.append(rest)
+    
+    statement = ''.join(current).strip()
+    if statement:
+        yield statement
+
+
+@lru_cache(maxsize=256)
+def _script_template(query: str) -> tuple:
+    """
+    Split a statement into its literal text and ${var.path} references,
+    once per distinct statement; references are (name.path, source) pairs
+    """
+    parts = []
+    start = 0
+    for match in SCRIPT_REF.finditer(query):
+        parts.append(query[start:match.start()])
+        parts.append((match.group(1) + '.' + match.group(2), match.group()))
+        start = match.end()
+    parts.append(query[start:])
+    return tuple(parts)
+
+
+def _substitute(query: str, variables: Dict[str, Dict]) -> str:
+    """Fill ${var.path} references from earlier results; unknown ones stay as written"""
+    if '${' not in query:
+        return query
+    
+    out = []
+    for part in _script_template(query):
+        if isinstance(part, str):
+            out.append(part)
+            continue
+        path, source = part
+        try:
+            out.append(str(_lookup(variables, path)))
+        except ParseError:
+            out.append(source)
+    return ''.join(out)
+
+
+def _summarize(results) -> Dict[str, int]:
+    """Count script results by outcome without keeping them"""
+    summary = {"total": 0, "success": 0, "errors": 0, "comments": 0}
+    for result in results:
+        summary["total"] += 1
+        if result.get('status') == 'success':
+            summary["success"] += 1
+        elif result.get('status') == 'comment':
+            summary["comments"] += 1
+        if result.get('error'):
+            summary["errors"] += 1
+    return summary
+
+
+def _transaction_control(query: str):
+    """Begin, Commit or Rollback for a transaction statement, else None"""
+    entry = Parser.resolve(query)
+    if entry and entry[0] in (Begin, Commit, Rollback):
+        return entry[0]
+    return None
+
+
+class _HeldConnection:
+    """
+    A pooled MySQL connection held by an open transaction. Handlers see it
+    through _mysql() and call commit() as usual; that is a no-op until
+    COMMIT ends the transaction.
+    """
+    
+    def __init__(self, conn):
+        self.conn = conn
+        # Registry changes made in the transaction, applied at COMMIT
+        self.registry = {}
+        # Whether the current script statement used the connection, and
+        # whether an exception escaped its MySQL work; see iter_file
+        self.used = False
+        self.failed = False
+    
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+    
+    def commit(self):
+        pass
+
+
+def _apply_registry(registry: Dict[str, Dict], changes: Dict[str, Optional[Dict]]) -> Dict[str, Dict]:
+    """Apply staged registry changes to registry and return it; None drops a name"""
+    for name, info in changes.items():
+        if info is None:
+            registry.pop(name, None)
+        else:
+            registry[name] = info
+    return registry
+
+
+def _table_info(name: str) -> Dict:
+    """Registry entry for a table missing from the catalog, read off its name"""
+    parts = name.split('_')
+    if parts[0] in ROLE_TABLE_TEMPLATES and len(parts) > 1:
+        return {
+            'backend': 'mysql',
+            'type': parts[0],
+            'role': parts[1],
+            'age_group': parts[2] if len(parts) > 2 else None
+        }
+    return {'backend': 'mysql'}
+
+
+@lru_cache(maxsize=256)
+def _insert_sql(table: str, columns: tuple) -> str:
+    """INSERT statement text for a table and column list"""
+    placeholders = ', '.join(['%s'] * len(columns))
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+@lru_cache(maxsize=256)
+def _select_by_sql(table: str, field: str) -> str:
+    """SELECT statement text for a single-field equality lookup"""
+    return f"SELECT * FROM {table} WHERE {field} = %s"
+
+
+# ============================================================================
+# Statement building, shared with AsyncDNACryptDB
+# ============================================================================
+# Everything between a parsed statement and a driver call - SQL, Cypher,
+# documents, validation and result shaping - lives here, so the engines
+# differ only in how they do I/O.
+
+def _iso_timestamp(row: Dict) -> Dict:
+    """Make a MySQL row's timestamp JSON-friendly"""
+    if row.get('timestamp'):
+        row['timestamp'] = row['timestamp'].isoformat()
+    return row
+
+
+def _graph_statement(node) -> Tuple[str, Dict]:
+    """Cypher and parameters for a single-statement graph operation"""
+    ts = datetime.utcnow().isoformat()
+    
+    if isinstance(node, CreateUser):
+        if not node.props.get('email'):
+            raise ValueError("Missing required field: 'email'")
+        return CREATE_USER_CYPHER, {
+            'email': node.props['email'], 'props': node.props,
+            'user_id': str(uuid.uuid4()), 'ts': ts
+        }
+    if isinstance(node, CreateMessageNode):
+        return CREATE_MESSAGE_CYPHER, {'props': dict(node.props, created_at=ts)}
+    if isinstance(node, RelateSent):
+        return RELATE_CYPHER['SENT'], {
+            'email': node.email, 'msg_id': node.message_id, 'ts': node.timestamp
+        }
+    if isinstance(node, RelateTrust):
+        return RELATE_CYPHER['TRUSTS'], {
+            'email1': node.email, 'email2': node.other_email, 'level': node.level, 'ts': ts
+        }
+    if isinstance(node, FindPath):
+        return FIND_PATH_CYPHER.format(max_depth=node.max_depth), {
+            'start': node.start, 'end': node.end
+        }
+    if isinstance(node, FindPattern):
+        if node.pattern != 'excessive_access':
+            raise ValueError("Unknown pattern")
+        return EXCESSIVE_ACCESS_CYPHER, {'threshold': node.threshold}
+    if isinstance(node, DetectAnomaly):
+        return DETECT_ANOMALY_CYPHER, {}
+    return TRACK_ACCESS_CYPHER, {
+        'email': node.email, 'msg_id': node.message_id, 'action': node.action,
+        'success': node.success, 'ts': ts, 'ip': "0.0.0.0"
+    }
+
+
+def _graph_result(node, records: List) -> Dict:
+    """Result of a single-statement graph operation from its records"""
+    if isinstance(node, FindPath) and not records:
+        return {
+            "status": "success",
+            "message": "No path found",
+            "from": node.start,
+            "to": node.end
+        }
+    
+    result = {"status": "success", "backend": "Neo4j (Graph)"}
+    if isinstance(node, CreateUser):
+        result.update(user_id=records[0]['user_id'], email=records[0]['email'])
+    elif isinstance(node, CreateMessageNode):
+        result.update(message_id=records[0]['message_id'])
+    elif isinstance(node, RelateSent):
+        result.update({"relationship": "SENT", "from": node.email, "to": node.message_id})
+    elif isinstance(node, RelateTrust):
+        result.update({"relationship": "TRUSTS", "from": node.email, "to": node.other_email,
+                       "level": node.level})
+    elif isinstance(node, FindPath):
+        result.update({
+            "from": node.start,
+            "to": node.end,
+            "hops": records[0]['hops'],
+            "path": [path_node['email'] for path_node in records[0]['path'].nodes]
+        })
+    elif isinstance(node, FindPattern):
+        results = [dict(record) for record in records]
+        result.update(pattern=node.pattern, threshold=node.threshold,
+                      count=len(results), results=results)
+    elif isinstance(node, DetectAnomaly):
+        anomalies = [dict(record) for record in records]
+        result.update(anomaly_type="excessive_repeated_access",
+                      count=len(anomalies), anomalies=anomalies)
+    else:
+        result.update(access_tracked=True)
+    return result
+
+
+def _graph_stats(totals: Dict[str, int]) -> Dict:
+    """SHOW GRAPH result from the GRAPH_COUNT_CYPHER counts"""
+    return {
+        "status": "success",
+        "backend": "Neo4j (Graph)",
+        "nodes": {
+            "users": totals['users'],
+            "messages": totals['messages'],
+            "total": totals['users'] + totals['messages']
+        },
+        "relationships": {
+            "sent": totals['sent'],
+            "trusts": totals['trusts'],
+            "accessed": totals['accessed'],
+            "total": totals['sent'] + totals['trusts'] + totals['accessed']
+        }
+    }
+
+
+def _user_rows(rows, errors: List[Dict]) -> Iterator[Dict]:
+    """CREATE USERS rows for CREATE_USERS_CYPHER; invalid ones go to errors"""
+    for index, data in enumerate(rows):
+        if not isinstance(data, dict):
+            errors.append({"index": index, "error": "User must be an object"})
+        elif not data.get('email'):
+            errors.append({"index": index, "error": "Missing required field: 'email'"})
+        else:
+            yield {"email": data['email'], "props": data, "user_id": str(uuid.uuid4())}
+
+
+def _relationship_rows(rows, errors: List[Dict]) -> Iterator[Tuple[str, Dict]]:
+    """RELATE MANY rows as (type, RELATE_MANY_CYPHER row); invalid ones go to errors"""
+    for index, data in enumerate(rows):
+        if not isinstance(data, dict):
+            errors.append({"index": index, "error": "Relationship must be an object"})
+            continue
+        rel_type = str(data.get('type', '')).upper()
+        if rel_type not in RELATE_MANY_CYPHER:
+            errors.append({"index": index, "error": f"Invalid relationship type: {data.get('type')}"})
+            continue
+        if not data.get('from') or not data.get('to'):
+            errors.append({"index": index, "error": "Missing required field: 'from' or 'to'"})
+            continue
+        if rel_type == 'TRUSTS' and not isinstance(data.get('level'), int):
+            errors.append({"index": index, "error": "TRUSTS requires an integer level"})
+            continue
+        
+        yield rel_type, {
+            "from": data['from'],
+            "to": data['to'],
+            "level": data.get('level'),
+            "at": data.get('at')
+        }
+
+
+def _bulk_result(count: int, created: int, errors: List[Dict]) -> Dict:
+    """CREATE USERS / RELATE MANY result"""
+    return {
+        "status": "success",
+        "backend": "Neo4j (Graph)",
+        "count": count,
+        "created": created,
+        "failed": len(errors),
+        "errors": errors
+    }
+
+
+def _message_params(table_name: str, rows) -> Tuple[List[tuple], List[Dict]]:
+    """
+    MESSAGE_COLUMNS rows and SEND_MESSAGES_CYPHER rows for SEND MESSAGES.
+    Raises KeyError for a missing field and TypeError or AttributeError
+    for a row that is not an object.
+    """
+    parts = table_name.split('_')
+    role = parts[1] if len(parts) > 1 else None
+    age_group = parts[2] if len(parts) > 2 else None
+    
+    params = []
+    graph_rows = []
+    for data in rows:
+        message_id = str(uuid.uuid4())
+        link_id = str(uuid.uuid4())
+        urgency = data.get('urgency', 'medium')
+        params.append((
+            message_id,
+            data['content'],
+            data['sender'],
+            data['receiver'],
+            urgency,
+            link_id,
+            role,
+            age_group
+        ))
+        graph_rows.append({
+            'message_id': message_id,
+            'link_id': link_id,
+            'sender': data['sender'],
+            'receiver': data['receiver'],
+            'urgency': urgency
+        })
+    return params, graph_rows
+
+
+def _sent_result(graph_rows: List[Dict], graph_created: bool) -> Dict:
+    """SEND MESSAGES result"""
+    return {
+        "status": "success",
+        "count": len(graph_rows),
+        "results": [
+            {"message_id": row['message_id'], "link_id": row['link_id']}
+            for row in graph_rows
+        ],
+        "graph_created": graph_created
+    }
+
+
+def _role_table(node: CreateTableForRole) -> Tuple[str, str, Dict]:
+    """Name, DDL and registry entry for CREATE TABLE ... FOR ROLE"""
+    table_type = node.table_type.lower()
+    role = node.role.lower()
+    age_group = node.age_group.lower() if node.age_group else None
+    
+    if table_type not in ROLE_TABLE_TEMPLATES:
+        raise ValueError(f"Invalid table type: {table_type}")
+    
+    if age_group:
+        table_name = f"{table_type}_{role}_{age_group}"
+    else:
+        table_name = f"{table_type}_{role}"
+    
+    info = {'backend': 'mysql', 'type': table_type, 'role': role, 'age_group': age_group}
+    return table_name, ROLE_TABLE_TEMPLATES[table_type].format(name=table_name), info
+
+
+def _role_collection(node: CreateCollectionForRole) -> Tuple[str, Dict]:
+    """Name and registry entry for CREATE COLLECTION ... FOR ROLE"""
+    coll_type = node.coll_type.lower()
+    role = node.role.lower()
+    return f"{coll_type}_{role}", {'backend': 'mongodb', 'type': coll_type, 'role': role}
+
+
+def _row_insert(node) -> Tuple[tuple, tuple, str]:
+    """Columns, values and result key for ADD ALGORITHM / ADD KEY / ADD HASH"""
+    data = node.data
+    role = node.table.split('_')[1] if '_' in node.table else None
+    
+    if isinstance(node, AddAlgorithm):
+        return ALGORITHM_COLUMNS, (
+            data['message_id'],
+            data['algorithm'],
+            data['type'],
+            json.dumps(data.get('parameters', {})),
+            data.get('order', 1),
+            role
+        ), 'algo_id'
+    if isinstance(node, AddKey):
+        return KEY_COLUMNS, (
+            data['message_id'],
+            data['public_key'],
+            data['type'],
+            data.get('size', 2048),
+            role
+        ), 'key_id'
+    return HASH_COLUMNS, (
+        data['message_id'],
+        data['hash'],
+        data['algorithm'],
+        data.get('salt', ''),
+        role
+    ), 'hash_id'
+
+
+def _sequence_write_errors(details: Dict, chunk: List[Dict],
+                           positions: List[int]) -> Tuple[List[Dict], List[str]]:
+    """
+    Per-document errors of a failed unordered insert_many, indexed by
+    input position, and the link_ids of the documents that were stored
+    """
+    write_errors = details.get('writeErrors', [])
+    failed = {write_error['index'] for write_error in write_errors}
+    errors = []
+    for write_error in write_errors:
+        doc = chunk[write_error['index']]
+        if write_error.get('code') == 11000:
+            message = f"Duplicate link_id: {doc['link_id']}"
+        else:
+            message = write_error.get('errmsg', 'Write failed')
+        errors.append({
+            "index": positions[write_error['index']],
+            "link_id": doc['link_id'],
+            "error": message
+        })
+    return errors, [doc['link_id'] for index, doc in enumerate(chunk) if index not in failed]
+
+
+def _link_candidates(registry: Dict[str, Dict], backend: str, routed: str = None) -> List[str]:
+    """The routed table or collection, else every registered one that may hold a link_id"""
+    if routed:
+        return [routed]
+    return [name for name, info in list(registry.items())
+            if info.get('backend') == backend
+            and (backend != 'mysql' or info.get('type') == 'messages')]
+
+
+def _link_graph_result(record) -> Dict:
+    """LINK DATA's graph part from its LINK_DATA_CYPHER record"""
+    if not record:
+        return {}
+    return {
+        'sender': record['sender']['email'] if record['sender'] else None,
+        'receiver': record['receiver']['email'] if record['receiver'] else None,
+        'access_count': record['access_count'],
+        'accessed_by': record['accessed_by']
+    }
+
+
+def _join_result(node: Join, plan: Dict, joined_results: List[Dict]) -> Dict:
+    """JOIN result"""
+    return {
+        "status": "success",
+        "join_type": "MySQL ⟕ MongoDB",
+        "strategy": plan['strategy'],
+        "mysql_table": node.table,
+        "mongodb_collection": node.collection,
+        "join_field": node.field,
+        "count": len(joined_results),
+        "results": joined_results
+    }
+
+
+def _message_select(node: ListMessages, escape: bool = False) -> Tuple[str, Optional[tuple]]:
+    """SELECT and its args for LIST MESSAGES, newest first"""
+    where, args = _sql_args(node.where, escape)
+    if where:
+        return f"SELECT * FROM {node.table} WHERE {where} ORDER BY timestamp DESC", args
+    return f"SELECT * FROM {node.table} ORDER BY timestamp DESC", args
+
+
+def _table_ddl(node: MakeTable) -> Tuple[str, Dict]:
+    """DDL and registry entry for MAKE TABLE"""
+    fields = ['id INT AUTO_INCREMENT PRIMARY KEY']
+    field_schema = {}
+    
+    for name, ftype in node.fields:
+        if name.lower() != 'id':
+            fields.append(f"{name} {SQL_TYPES.get(ftype, 'VARCHAR(255)')}")
+            field_schema[name] = ftype
+    
+    create_sql = f"CREATE TABLE IF NOT EXISTS {node.table} ({', '.join(fields)})"
+    return create_sql, {'backend': 'mysql', 'fields': field_schema}
+
+
+def _fetch_sql(node: FetchData, escape: bool = False) -> Tuple[str, Optional[tuple]]:
+    """SELECT and its args for FETCH FROM"""
+    where, args = _sql_args(node.condition, escape)
+    if where:
+        return f"SELECT * FROM {node.source} WHERE {where}", args
+    return f"SELECT * FROM {node.source}", args
+
+
+def _update_sql(node: ChangeData, escape: bool = False) -> Tuple[str, Optional[tuple]]:
+    """UPDATE and its args for CHANGE IN"""
+    assignments, set_args = _sql_args(node.set_clause, escape)
+    where, where_args = _sql_args(node.condition, escape)
+    args = (set_args or ()) + (where_args or ())
+    if not escape:
+        args = args or None
+    return f"UPDATE {node.target} SET {assignments} WHERE {where}", args
+
+
+def _delete_sql(node: RemoveData, escape: bool = False) -> Tuple[str, Optional[tuple]]:
+    """DELETE and its args for REMOVE FROM"""
+    where, args = _sql_args(node.condition, escape)
+    return f"DELETE FROM {node.target} WHERE {where}", args
+
+
+def _mongo_update(set_clause: str) -> Dict:
+    """$set document for CHANGE IN on a collection"""
+    parts = set_clause.split('=')
+    field = parts[0].strip()
+    value = parts[1].strip().strip('"\'')
+    try:
+        value = float(value) if '.' in value else int(value)
+    except ValueError:
+        pass
+    return {"$set": {field: value}}
+
+
+def _health_result(backends: Dict[str, Dict]) -> Dict:
+    """health() result; backends that are not configured do not count against it"""
+    return {
+        "status": "success",
+        "healthy": all(info['status'] != 'error' for info in backends.values()),
+        "backends": backends
+    }
+
 
 class DNACryptDB:
     """Triglot DNACryptDB Engine - MySQL + MongoDB + Neo4j"""
     
-    def __init__(self, config_file: str = "dnacdb.config.json", verbose: bool = True):
-        """Initialize DNACryptDB with all three backends"""
-        self.mysql_conn = None
-        self.mysql_cursor = None
-        self.mongo_client = None
-        self.mongo_db = None
-        self.neo4j_driver = None
-        self.schema_registry = {}
+    # Parsed statement node -> handler
+    _HANDLERS = {
+        # Graph operations (Neo4j)
+        CreateUser: '_create_user_node',
+        CreateUsers: '_create_users',
+        CreateMessageNode: '_create_message_node',
+        RelateSent: '_create_relationship',
+        RelateTrust: '_create_relationship',
+        RelateMany: '_relate_many',
+        FindPath: '_find_path',
+        FindPattern: '_find_pattern',
+        DetectAnomaly: '_detect_anomaly',
+        TrackAccess: '_track_access',
+        ShowGraph: '_show_graph',
+        # DNACrypt-specific syntax
+        CreateTableForRole: '_create_table_for_role',
+        CreateCollectionForRole: '_create_collection_for_role',
+        SendMessage: '_send_message',
+        SendMessages: '_send_messages',
+        AddAlgorithm: '_add_algorithm',
+        AddKey: '_add_key',
+        AddHash: '_add_hash',
+        StoreSequence: '_store_sequence',
+        StoreSequences: '_store_sequences',
+        GetMessage: '_get_message',
+        GetSequence: '_get_sequence',
+        LinkData: '_link_data',
+        Join: '_polyglot_join',
+        ExplainJoin: '_explain_join',
+        ListMessages: '_list_messages',
+        # Legacy syntax
+        MakeTable: '_make_table',
+        MakeCollection: '_make_collection',
+        PutData: '_put_data',
+        FetchData: '_fetch_data',
+        ChangeData: '_change_data',
+        RemoveData: '_remove_data',
+        ShowTables: '_show_tables',
+        ShowCollections: '_show_collections',
+        Drop: '_drop',
+        # Transactions
+        Begin: '_begin_transaction',
+        Commit: '_commit_transaction',
+        Rollback: '_rollback_transaction',
+    }
+    
+    def __init__(self, config_file: str = "dnacdb.config.json", verbose: bool = True,
+                 plan_cache_size: int = 256):
+        """Read the config; each backend connects on its first use"""
+        # Backends connect on first use; see _backend()
+        self._config = {}
+        self._attempted = set()
+        self._connect_lock = threading.Lock()
+        self._mysql_pool = None
+        self._mysql_slots = None
+        self._mongo_client = None
+        self._mongo_db = None
+        self._neo4j_driver = None
+        self._schema_registry = None
+        self._catalog_lock = threading.Lock()
+        # This thread's open BEGIN ... COMMIT, as a _HeldConnection in .conn
+        self._txn = threading.local()
         self.verbose = verbose
+        # This engine's records; verbose prints them without touching other engines
+        self._logger = _engine_logger(logger, verbose)
+        self.chunk_size = BULK_CHUNK_SIZE
+        self.link_timeouts = _link_timeouts(LINK_DATA_TIMEOUT)
+        self._fanout = ThreadPoolExecutor(max_workers=LINK_DATA_WORKERS,
+                                          thread_name_prefix="dnacryptdb-link")
+        
+        # Parsed statement templates keyed by shape, least recently used first
+        self.plan_cache_size = plan_cache_size
+        self._plan_cache = OrderedDict()
+        self._plan_hits = 0
+        self._plan_misses = 0
+        self._plan_lock = threading.Lock()
         
         if os.path.exists(config_file):
             self._load_config(config_file)
@@ -2906,575 +4075,989 @@ class DNACryptDB:
         with open(config_file, 'r') as f:
             config = json.load(f)
         
-        mysql_config = config.get('mysql', {})
-        mongo_config = config.get('mongodb', {})
-        neo4j_config = config.get('neo4j', {})
+        self._config = config
+        self.chunk_size = config.get('chunk_size', BULK_CHUNK_SIZE)
+        self.link_timeouts = _link_timeouts(config.get('link_timeout', LINK_DATA_TIMEOUT))
+    
+    def _backend(self, backend: str):
+        """
+        Connect a configured backend the first time it is used. A failed
+        attempt leaves it disconnected until health() retries it.
+        """
+        if backend not in self._attempted:
+            with self._connect_lock:
+                if backend not in self._attempted:
+                    if backend in self._config:
+                        getattr(self, f"_connect_{backend}")(self._config[backend])
+                    self._attempted.add(backend)
+    
+    @property
+    def mysql_pool(self):
+        self._backend('mysql')
+        return self._mysql_pool
+    
+    @property
+    def mongo_client(self):
+        self._backend('mongodb')
+        return self._mongo_client
+    
+    @property
+    def mongo_db(self):
+        self._backend('mongodb')
+        return self._mongo_db
+    
+    @property
+    def neo4j_driver(self):
+        self._backend('neo4j')
+        return self._neo4j_driver
+    
+    def _connect_mysql(self, mysql_config: Dict):
+        global Error
+        try:
+            import mysql.connector
+            from mysql.connector import errorcode
+            from mysql.connector.pooling import MySQLConnectionPool
+        except ImportError as e:
+            self._logger.warning("⚠ MySQL driver not installed: %s", e)
+            return
+        Error = mysql.connector.Error
+        
+        try:
+            pool_config = dict(mysql_config)
+            pool_size = pool_config.pop('pool_size', MYSQL_POOL_SIZE)
+            try:
+                pool = MySQLConnectionPool(pool_name="dnacryptdb", pool_size=pool_size, **pool_config)
+            except Error as e:
+                if e.errno != errorcode.ER_BAD_DB_ERROR:
+                    raise
+                # First run against this server: create the database, then retry
+                temp_conn = mysql.connector.connect(
+                    host=mysql_config['host'],
+                    user=mysql_config['user'],
+                    password=mysql_config['password']
+                )
+                temp_cursor = temp_conn.cursor()
+                temp_cursor.execute(f"CREATE DATABASE IF NOT EXISTS {mysql_config['database']}")
+                temp_cursor.close()
+                temp_conn.close()
+                pool = MySQLConnectionPool(pool_name="dnacryptdb", pool_size=pool_size, **pool_config)
+            
+            conn = pool.get_connection()
+            try:
+                cursor = conn.cursor()
+                for statement in MYSQL_SCHEMA:
+                    cursor.execute(statement)
+                cursor.close()
+            finally:
+                conn.close()
+            
+            # get_connection() fails rather than waits when the pool is empty
+            self._mysql_slots = threading.BoundedSemaphore(pool_size)
+            self._mysql_pool = pool
+            
+            self._logger.info("✓ MySQL connected: %s", mysql_config['database'])
+        except Error as e:
+            self._logger.warning("⚠ MySQL connection failed: %s", e)
+    
+    def _connect_mongodb(self, mongo_config: Dict):
+        global PyMongoError, BulkWriteError
+        try:
+            from pymongo import MongoClient
+            from pymongo import errors
+        except ImportError as e:
+            self._logger.warning("⚠ MongoDB driver not installed: %s", e)
+            return
+        PyMongoError, BulkWriteError = errors.PyMongoError, errors.BulkWriteError
         
-        # Connect to MySQL
+        # MongoClient connects in the background; health() pings it
         try:
-            temp_conn = mysql.connector.connect(
-                host=mysql_config['host'],
-                user=mysql_config['user'],
-                password=mysql_config['password']
+            self._mongo_client = MongoClient(
+                mongo_config['uri'],
+                serverSelectionTimeoutMS=5000
             )
-            temp_cursor = temp_conn.cursor()
-            temp_cursor.execute(f"CREATE DATABASE IF NOT EXISTS {mysql_config['database']}")
-            temp_cursor.close()
-            temp_conn.close()
+            self._mongo_db = self._mongo_client[mongo_config['database']]
             
-            self.mysql_conn = mysql.connector.connect(**mysql_config)
-            self.mysql_cursor = self.mysql_conn.cursor(dictionary=True)
+            self._logger.info("✓ MongoDB client ready: %s", mongo_config['database'])
+        except Exception as e:
+            self._logger.warning("⚠ MongoDB connection failed: %s", e)
+    
+    def _connect_neo4j(self, neo4j_config: Dict):
+        global Neo4jError
+        try:
+            from neo4j import GraphDatabase
+            from neo4j.exceptions import Neo4jError
+        except ImportError as e:
+            self._logger.warning("⚠ Neo4j driver not installed: %s", e)
+            return
+        
+        try:
+            driver = GraphDatabase.driver(
+                neo4j_config['uri'],
+                auth=(neo4j_config.get('user', 'neo4j'),
+                      neo4j_config.get('password', 'password'))
+            )
+            # Also the connection test: an unreachable server raises here
+            self._ensure_graph_schema(driver)
+        except Exception as e:
+            self._logger.warning("⚠ Neo4j connection failed: %s", e)
+            return
+        
+        self._neo4j_driver = driver
+        self._logger.info("✓ Neo4j connected: %s", neo4j_config['uri'])
+    
+    def health(self) -> Dict:
+        """
+        Check every configured backend with one round trip each, connecting
+        it first if nothing has used it yet. Backends whose connection
+        failed earlier are retried.
+        """
+        clients = {'mysql': '_mysql_pool', 'mongodb': '_mongo_client', 'neo4j': '_neo4j_driver'}
+        with self._connect_lock:
+            for backend, attr in clients.items():
+                if getattr(self, attr) is None:
+                    self._attempted.discard(backend)
+        
+        checks = {
+            'mysql': self._check_mysql,
+            'mongodb': self._check_mongodb,
+            'neo4j': self._check_neo4j
+        }
+        backends = {}
+        for backend, check in checks.items():
+            if backend not in self._config:
+                backends[backend] = {"status": "not configured"}
+                continue
+            started = time.monotonic()
+            try:
+                check()
+                backends[backend] = {
+                    "status": "ok",
+                    "latency_ms": round((time.monotonic() - started) * 1000, 1)
+                }
+            except Exception as e:
+                backends[backend] = {"status": "error", "error": str(e)}
+        
+        return _health_result(backends)
+    
+    def _check_mysql(self):
+        with self._mysql() as (conn, cursor):
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+    
+    def _check_mongodb(self):
+        if self.mongo_client is None:
+            raise ConnectionError("MongoDB not connected")
+        self.mongo_client.admin.command('ping')
+    
+    def _check_neo4j(self):
+        if self.neo4j_driver is None:
+            raise ConnectionError("Neo4j not connected")
+        self.neo4j_driver.verify_connectivity()
+    
+    @property
+    def schema_registry(self) -> Dict[str, Dict]:
+        """
+        Tables and collections by name, loaded from the catalogs on first
+        use. Inside a transaction this thread also sees the changes it
+        will apply at COMMIT.
+        """
+        registry = self._committed_registry()
+        held = getattr(self._txn, 'conn', None)
+        if held is not None and held.registry:
+            return _apply_registry(dict(registry), held.registry)
+        return registry
+    
+    def _committed_registry(self) -> Dict[str, Dict]:
+        """schema_registry without this thread's uncommitted changes"""
+        if self._schema_registry is None:
+            with self._catalog_lock:
+                if self._schema_registry is None:
+                    self._schema_registry = self._load_catalog()
+        return self._schema_registry
+    
+    def _load_catalog(self) -> Dict[str, Dict]:
+        """
+        Build the registry from one information_schema query and one
+        list_collection_names. Objects missing from _dnacdb_catalog, such as
+        tables created before it existed, are registered from their names.
+        """
+        registry = {}
+        
+        if self.mysql_pool is not None:
+            try:
+                with self._mysql() as (conn, cursor):
+                    cursor.execute(CATALOG_TABLES_SQL)
+                    for row in cursor.fetchall():
+                        registry[row['name']] = json.loads(row['info']) if row['info'] else _table_info(row['name'])
+            except Error as e:
+                self._logger.warning("⚠ MySQL catalog not loaded: %s", e)
+        
+        if self.mongo_db is not None:
+            try:
+                names = self.mongo_db.list_collection_names()
+                cataloged = {}
+                if CATALOG_NAME in names:
+                    cataloged = {doc.pop('_id'): doc for doc in self.mongo_db[CATALOG_NAME].find()}
+                for name in names:
+                    if not name.startswith(('_dnacdb_', 'system.')):
+                        registry[name] = cataloged.get(name, {'backend': 'mongodb'})
+            except PyMongoError as e:
+                self._logger.warning("⚠ MongoDB catalog not loaded: %s", e)
+        
+        return registry
+    
+    def _register(self, name: str, info: Dict):
+        """Add a table or collection to the registry and its backend's catalog"""
+        self._catalog_change(name, info)
+    
+    def _unregister(self, name: str):
+        """Remove a dropped table or collection from the registry and its catalog"""
+        info = self.schema_registry.get(name)
+        if info is not None:
+            self._catalog_change(name, None, info['backend'])
+    
+    def _catalog_change(self, name: str, info: Optional[Dict], backend: str = None):
+        """
+        Write one catalog change (None removes the name), then apply it to
+        the registry. A MySQL catalog row written inside a transaction
+        commits with it, so its registry change waits for COMMIT too.
+        """
+        if (backend or info['backend']) == 'mysql':
+            with self._mysql() as (conn, cursor):
+                if info is None:
+                    cursor.execute(CATALOG_DELETE_SQL, (name,))
+                else:
+                    cursor.execute(CATALOG_PUT_SQL, (name, json.dumps(info)))
+                conn.commit()
+                if isinstance(conn, _HeldConnection):
+                    conn.registry[name] = info
+                    return
+        elif info is None:
+            self.mongo_db[CATALOG_NAME].delete_one({'_id': name})
+        else:
+            self.mongo_db[CATALOG_NAME].replace_one({'_id': name}, dict(info, _id=name), upsert=True)
+        _apply_registry(self._committed_registry(), {name: info})
+    
+    def _ensure_graph_schema(self, driver):
+        """Create the User/Message constraints and indexes if missing"""
+        with driver.session() as session:
+            for statement in GRAPH_SCHEMA:
+                try:
+                    session.run(statement).consume()
+                except Neo4jError as e:
+                    # e.g. existing duplicate emails block the constraint
+                    self._logger.warning("⚠ Neo4j schema setup skipped: %s", e)
+    
+    def execute(self, query: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Execute single DNACryptDB query
+        
+        $name placeholders in the query are filled from params, so payloads
+        can be passed as Python objects instead of formatted into the text:
+        
+            db.execute("SEND MESSAGE TO $t", {"t": "messages_admin_adult",
+                                              "payload": {"content": "hi", ...}})
+        
+        A statement whose object literal is omitted takes params["payload"].
+        """
+        query = query.strip()
+        
+        if not query or query.startswith('#') or query.startswith('--'):
+            return {"status": "comment"}
+        
+        try:
+            node = self._prepare(query, params)
+            return getattr(self, self._HANDLERS[type(node)])(node)
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def execute_many(self, queries, workers: int = 4) -> List[Dict]:
+        """
+        Execute independent queries concurrently on a thread pool
+        
+        Each item is a query string or a (query, params) pair. Results come
+        back in input order. Workers share the MySQL pool (waiting for a
+        free connection beyond pool_size), MongoClient's pool and the Neo4j
+        driver's session pool, so statements must not depend on each other.
+        """
+        def run(item):
+            if isinstance(item, str):
+                return self.execute(item)
+            return self.execute(*item)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run, queries))
+    
+    def _prepare(self, query: str, params: Dict[str, Any] = None):
+        """Parse a query, reusing the cached template for its shape"""
+        tokens = tokenize(query)
+        key, literals = normalize(tokens)
+        
+        with self._plan_lock:
+            template = self._plan_cache.get(key)
+            if template is not None:
+                self._plan_hits += 1
+                self._plan_cache.move_to_end(key)
+            else:
+                self._plan_misses += 1
+        
+        if template is None:
+            template = compile_template(query, tokens)
+            if self.plan_cache_size > 0:
+                with self._plan_lock:
+                    self._plan_cache[key] = template
+                    if len(self._plan_cache) > self.plan_cache_size:
+                        self._plan_cache.popitem(last=False)
+        
+        return bind(template, literals, params)
+    
+    def stream(self, query: str, params: Dict[str, Any] = None,
+               page_size: int = None) -> Iterator:
+        """
+        Stream the rows of a JOIN or LIST MESSAGES statement
+        
+        Rows are read through an unbuffered MySQL cursor and yielded one at
+        a time, or as lists of page_size rows, so memory stays flat however
+        large the table is:
+        
+            for row in db.stream("JOIN messages_admin_adult WITH sequences_admin ON link_id"):
+                ...
+        
+        The connection is busy until the generator is exhausted or closed.
+        """
+        node = self._prepare(query.strip().rstrip(';'), params)
+        if type(node) not in (Join, ListMessages):
+            raise ValueError("stream() supports JOIN and LIST MESSAGES")
+        if self.mysql_pool is None:
+            raise ConnectionError("MySQL not connected")
+        if isinstance(node, Join) and self.mongo_db is None:
+            raise ConnectionError("MongoDB not connected")
+        
+        plan = None
+        if isinstance(node, Join):
+            with self._mysql() as (conn, cursor):
+                plan = self._plan_join(node, cursor)
+        
+        with self._mysql(buffered=False) as (conn, cursor):
+            if plan is not None:
+                rows = self._join_rows(node, plan, cursor)
+            else:
+                rows = self._message_rows(node, cursor)
             
-            if self.verbose:
-                print(f"✓ MySQL connected: {mysql_config['database']}")
-        except Error as e:
-            if self.verbose:
-                print(f"⚠ MySQL connection failed: {e}")
+            if page_size:
+                yield from _chunked(rows, page_size)
+            else:
+                yield from rows
+    
+    @contextmanager
+    def _mysql(self, buffered: bool = True):
+        """
+        Check out a pooled connection and a dictionary cursor for one
+        operation. An exception rolls the connection back; either way it
+        goes back to the pool on exit. Unbuffered cursors leave rows on the
+        server until fetched.
+        
+        Inside a transaction the thread's held connection is used instead;
+        its commits wait for COMMIT and failures are left to the caller.
+        """
+        if self.mysql_pool is None:
+            raise ConnectionError("MySQL not connected")
+        
+        held = getattr(self._txn, 'conn', None)
+        if held is not None:
+            held.used = True
+            cursor = held.cursor(dictionary=True, buffered=buffered)
+            try:
+                yield held, cursor
+            except Exception:
+                held.failed = True
+                raise
+            finally:
+                if held.unread_result:
+                    held.consume_results()
+                cursor.close()
+            return
+        
+        with self._mysql_slots:
+            conn = self.mysql_pool.get_connection()
+            try:
+                cursor = conn.cursor(dictionary=True, buffered=buffered)
+                try:
+                    yield conn, cursor
+                except Exception:
+                    try:
+                        conn.rollback()
+                    except Error:
+                        pass
+                    raise
+                finally:
+                    # Drain anything left by a consumer that stopped early
+                    if conn.unread_result:
+                        conn.consume_results()
+                    cursor.close()
+            finally:
+                conn.close()
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the statement plan and SQL text caches"""
+        sql_hits = sql_misses = sql_size = 0
+        for builder in (_insert_sql, _select_by_sql):
+            info = builder.cache_info()
+            sql_hits += info.hits
+            sql_misses += info.misses
+            sql_size += info.currsize
+        
+        return {
+            "plan_cache": {
+                "hits": self._plan_hits,
+                "misses": self._plan_misses,
+                "size": len(self._plan_cache),
+                "capacity": self.plan_cache_size
+            },
+            "sql_cache": {
+                "hits": sql_hits,
+                "misses": sql_misses,
+                "size": sql_size
+            }
+        }
+    
+    def execute_file(self, filepath: str, jobs: int = 1, summary_only: bool = False,
+                     commit_every: int = 0):
+        """
+        Execute all queries in a .dnacdb file with variable support
         
-        # Connect to MongoDB
-        try:
-            self.mongo_client = MongoClient(
-                mongo_config['uri'], 
-                serverSelectionTimeoutMS=5000
-            )
-            self.mongo_client.admin.command('ping')
-            self.mongo_db = self.mongo_client[mongo_config['database']]
-            
-            if self.verbose:
-                print(f"✓ MongoDB connected: {mongo_config['database']}")
-        except Exception as e:
-            if self.verbose:
-                print(f"⚠ MongoDB connection failed: {e}")
+        With jobs > 1, up to jobs statements run at once. Each waits only
+        for the assignments whose ${var.field} it references and for earlier
+        statements touching the same table, collection or graph (see
+        _footprint). Statements are scheduled SCRIPT_DAG_WINDOW at a time,
+        each window finishing before the next is read, so the script is
+        never held in memory whole. Results keep file order either way.
         
-        # Connect to Neo4j
-        try:
-            self.neo4j_driver = GraphDatabase.driver(
-                neo4j_config['uri'],
-                auth=(neo4j_config.get('user', 'neo4j'), 
-                      neo4j_config.get('password', 'password'))
-            )
-            # Test connection
-            with self.neo4j_driver.session() as session:
-                session.run("RETURN 1")
-            
-            if self.verbose:
-                print(f"✓ Neo4j connected: {neo4j_config['uri']}")
-        except Exception as e:
-            if self.verbose:
-                print(f"⚠ Neo4j connection failed: {e}")
+        With summary_only, results are counted and dropped as they arrive
+        and a dict of total/success/errors/comments is returned instead of
+        the list. Use iter_file to consume results one at a time. See
+        iter_file for commit_every and BEGIN ... COMMIT blocks, which need
+        jobs=1.
+        """
+        if jobs > 1:
+            if commit_every:
+                raise ValueError("commit_every needs jobs=1")
+            results = self._iter_script_dag(filepath, jobs)
+        else:
+            results = self.iter_file(filepath, commit_every)
+        
+        if summary_only:
+            return _summarize(results)
+        return list(results)
     
-    def execute(self, query: str) -> Dict[str, Any]:
-        """Execute single DNACryptDB query"""
-        query = query.strip()
+    def iter_file(self, filepath: str, commit_every: int = 0) -> Iterator[Dict]:
+        """
+        Execute a .dnacdb file statement by statement, yielding each result
+        as it finishes. The file is read incrementally, so memory does not
+        grow with the script.
         
-        if not query or query.startswith('#') or query.startswith('--'):
-            return {"status": "comment"}
+        MySQL writes between BEGIN and COMMIT share one connection and
+        commit once. With commit_every=N, statements outside such blocks
+        are grouped the same way, N to a commit. Results inside a
+        transaction are held back until it ends, so a success is only
+        reported once committed: if the transaction is rolled back, each
+        held result whose MySQL work was undone becomes an error naming
+        the cause. A statement rolls back its open batch only when its
+        MySQL work fails ("rolled_back" counts the statements undone), and
+        the rest of such a BEGIN block is skipped up to its COMMIT or
+        ROLLBACK; other failures are reported and the batch goes on. A
+        script ending inside BEGIN is rolled back, with an error result of
+        its own. MongoDB and Neo4j writes are not deferred.
+        """
+        variables = {}
+        pending = []       # [result, used MySQL] per statement in the open transaction
+        auto = False       # the open transaction was started by commit_every
+        aborted = False    # skipping the rest of a rolled-back BEGIN block
+        
+        def settle(cause=None):
+            """Release the held results; with a cause, the transaction was rolled back"""
+            undone = 0
+            for entry in pending:
+                if cause and entry[1] and not entry[0].get('error'):
+                    entry[0] = {"error": f"Rolled back: {cause}"}
+                    undone += 1
+            released = [result for result, used in pending]
+            pending.clear()
+            return released, undone
         
         try:
-            # Graph operations (Neo4j)
-            if query.upper().startswith('CREATE USER'):
-                return self._create_user_node(query)
-            elif query.upper().startswith('CREATE MESSAGE NODE'):
-                return self._create_message_node(query)
-            elif query.upper().startswith('RELATE'):
-                return self._create_relationship(query)
-            elif query.upper().startswith('FIND PATH'):
-                return self._find_path(query)
-            elif query.upper().startswith('FIND PATTERN'):
-                return self._find_pattern(query)
-            elif query.upper().startswith('DETECT ANOMALY'):
-                return self._detect_anomaly(query)
-            elif query.upper().startswith('TRACK ACCESS'):
-                return self._track_access(query)
-            elif query.upper().startswith('SHOW GRAPH'):
-                return self._show_graph(query)
-            # DNACrypt-specific syntax
-            elif query.upper().startswith('CREATE TABLE') and 'FOR ROLE' in query.upper():
-                return self._create_table_for_role(query)
-            elif query.upper().startswith('CREATE COLLECTION') and 'FOR ROLE' in query.upper():
-                return self._create_collection_for_role(query)
-            elif query.upper().startswith('SEND MESSAGE'):
-                return self._send_message(query)
-            elif query.upper().startswith('ADD ALGORITHM'):
-                return self._add_algorithm(query)
-            elif query.upper().startswith('ADD KEY'):
-                return self._add_key(query)
-            elif query.upper().startswith('ADD HASH'):
-                return self._add_hash(query)
-            elif query.upper().startswith('STORE SEQUENCE'):
-                return self._store_sequence(query)
-            elif query.upper().startswith('GET MESSAGE'):
-                return self._get_message(query)
-            elif query.upper().startswith('GET SEQUENCE'):
-                return self._get_sequence(query)
-            elif query.upper().startswith('LINK DATA'):
-                return self._link_data(query)
-            elif query.upper().startswith('JOIN'):
-                return self._polyglot_join(query)
-            elif query.upper().startswith('LIST MESSAGES'):
-                return self._list_messages(query)
-            # Legacy syntax
-            elif query.upper().startswith('MAKE TABLE'):
-                return self._make_table(query)
-            elif query.upper().startswith('MAKE COLLECTION'):
-                return self._make_collection(query)
-            elif query.upper().startswith('PUT INTO'):
-                return self._put_data(query)
-            elif query.upper().startswith('FETCH FROM'):
-                return self._fetch_data(query)
-            elif query.upper().startswith('CHANGE IN'):
-                return self._change_data(query)
-            elif query.upper().startswith('REMOVE FROM'):
-                return self._remove_data(query)
-            elif query.upper().startswith('SHOW TABLES'):
-                return self._show_tables()
-            elif query.upper().startswith('SHOW COLLECTIONS'):
-                return self._show_collections()
-            elif query.upper().startswith('DROP'):
-                return self._drop(query)
-            else:
-                return {"error": "Unknown command"}
-        except Exception as e:
-            return {"error": str(e)}
+            for i, query in enumerate(self._read_script(filepath), 1):
+                control = _transaction_control(query)
+                
+                if aborted:
+                    if control is Rollback:
+                        result = {"status": "success"}
+                    elif control is Commit:
+                        result = {"error": "Transaction was rolled back"}
+                    else:
+                        result = {"error": "Skipped: transaction was rolled back"}
+                    aborted = control not in (Commit, Rollback)
+                    yield result
+                    continue
+                
+                if auto and control is not None:
+                    # The script's own transaction statements end the batch first
+                    flushed = self._commit_transaction()
+                    auto = False
+                    released, undone = settle(flushed.get('error') and "batch commit failed")
+                    yield from released
+                    if flushed.get('error'):
+                        yield dict(flushed, rolled_back=undone)
+                        continue
+                if commit_every and control is None and not self._in_transaction():
+                    auto = self._begin_transaction().get('status') == 'success'
+                
+                held = getattr(self._txn, 'conn', None)
+                if held is not None:
+                    held.used = held.failed = False
+                
+                var_name, result = self._script_step(i, query, variables)
+                if var_name and result.get('status') == 'success':
+                    variables[var_name] = result
+                
+                if control is not None:
+                    if control is Commit and held is not None:
+                        released, undone = settle(result.get('error') and f"COMMIT at statement {i} failed")
+                        yield from released
+                    elif control is Rollback and held is not None and result.get('status') == 'success':
+                        released, undone = settle(f"ROLLBACK at statement {i}")
+                        yield from released
+                elif held is not None and held.failed:
+                    # The statement's own MySQL work failed: undo the batch
+                    self._rollback_transaction()
+                    released, undone = settle(f"statement {i} failed")
+                    yield from released
+                    result['rolled_back'] = undone
+                    aborted = not auto
+                    auto = False
+                elif held is not None:
+                    pending.append([result, held.used])
+                    if auto and len(pending) >= commit_every:
+                        committed = self._commit_transaction()
+                        auto = False
+                        released, undone = settle(committed.get('error') and "batch commit failed")
+                        yield from released
+                        if committed.get('error'):
+                            yield {"error": committed['error'], "rolled_back": undone}
+                    continue
+                
+                yield result
+            
+            if auto:
+                committed = self._commit_transaction()
+                released, undone = settle(committed.get('error') and "batch commit failed")
+                yield from released
+                if committed.get('error'):
+                    yield {"error": committed['error'], "rolled_back": undone}
+            elif self._in_transaction():
+                self._rollback_transaction()
+                released, undone = settle("the script ended before COMMIT")
+                yield from released
+                yield {"error": "Transaction was not committed", "rolled_back": undone}
+        finally:
+            # A script ending inside BEGIN, or a consumer stopping early, commits nothing
+            if self._in_transaction():
+                self._rollback_transaction()
     
-    def execute_file(self, filepath: str) -> List[Dict]:
-        """Execute all queries in a .dnacdb file with variable support"""
+    def _read_script(self, filepath: str) -> Iterator[str]:
+        """Stream the statements of a .dnacdb file (see _script_statements)"""
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"File not found: {filepath}")
         
         with open(filepath, 'r') as f:
-            lines = f.readlines()
+            yield from _script_statements(f)
+    
+    def _script_step(self, i: int, query: str, variables: Dict[str, Dict]) -> Tuple[Optional[str], Dict]:
+        """
+        Run script statement number i. Returns the variable it assigns, if
+        any, and its result; the caller stores successful assignments.
         
-        queries = []
-        current_query = []
-        variables = {}
+        Each statement is logged at DEBUG and each failure at INFO, with
+        the statement number in the record's "statement" attribute.
+        """
+        extra = {"statement": i}
         
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('#') or line.startswith('--'):
-                continue
-            current_query.append(line)
-            if line.endswith(';'):
-                full_query = ' '.join(current_query).rstrip(';')
-                queries.append(full_query)
-                current_query = []
-        
-        if current_query:
-            full_query = ' '.join(current_query)
-            queries.append(full_query)
-        
-        results = []
-        for i, query in enumerate(queries, 1):
-            query = query.strip()
-            if not query:
-                continue
+        # Variable assignment
+        var_match = re.match(r'\$(\w+)\s*=\s*(.+)', query)
+        if var_match:
+            var_name = var_match.group(1)
+            actual_query = var_match.group(2)
             
-            # Variable assignment
-            var_match = re.match(r'\$(\w+)\s*=\s*(.+)', query)
-            if var_match:
-                var_name = var_match.group(1)
-                actual_query = var_match.group(2)
-                
-                if self.verbose:
-                    print(f"\n[Query {i}] ${var_name} = {actual_query[:50]}...")
-                
-                result = self.execute(actual_query)
-                results.append(result)
-                
-                if result.get('status') == 'success':
-                    variables[var_name] = result
-                    if self.verbose:
-                        print(f"  ✓ Success - stored in ${var_name}")
-                elif result.get('error'):
-                    if self.verbose:
-                        print(f"  ✗ Error: {result['error']}")
-                continue
+            self._logger.debug("[Query %s] $%s = %s...", i, var_name, actual_query[:50], extra=extra)
             
-            # Replace variables
-            original_query = query
-            for var_name, var_value in variables.items():
-                for field in ['link_id', 'message_id', 'sequence_id', 'inserted_id', 
-                             'algo_id', 'key_id', 'hash_id', 'user_id', 'node_id']:
-                    placeholder = f"${{{var_name}.{field}}}"
-                    if placeholder in query:
-                        if field in var_value:
-                            query = query.replace(placeholder, str(var_value[field]))
-            
-            if self.verbose:
-                if query != original_query:
-                    print(f"\n[Query {i}] {original_query[:60]}...")
-                    print(f"         → {query[:60]}...")
-                else:
-                    print(f"\n[Query {i}] {query[:60]}{'...' if len(query) > 60 else ''}")
+            result = self.execute(actual_query)
             
-            result = self.execute(query)
-            results.append(result)
+            if result.get('status') == 'success':
+                self._logger.debug("  ✓ Success - stored in $%s", var_name, extra=extra)
+            elif result.get('error'):
+                self._logger.info("  ✗ Error: %s", result['error'], extra=extra)
+            return var_name, result
+        
+        # Replace variables
+        original_query = query
+        query = _substitute(query, variables)
+        
+        if self._logger.isEnabledFor(logging.DEBUG):
+            if query != original_query:
+                self._logger.debug("[Query %s] %s...\n         → %s...",
+                             i, original_query[:60], query[:60], extra=extra)
+            else:
+                self._logger.debug("[Query %s] %s%s", i, query[:60], '...' if len(query) > 60 else '',
+                             extra=extra)
+        
+        result = self.execute(query)
+        
+        if result.get('status') == 'success':
+            self._logger.debug("  ✓ Success", extra=extra)
+        elif result.get('error'):
+            self._logger.info("  ✗ Error: %s", result['error'], extra=extra)
+        
+        return None, result
+    
+    def _script_dag(self, queries: List[str]) -> Tuple[List[Set[int]], List[Set[str]]]:
+        """
+        Dependencies of each script statement on earlier ones, plus the
+        variables each references. Statements sharing a resource conflict
+        unless both only read it or both only append to it. Variables are
+        resources too, so an assignment also waits for earlier readers of
+        the old value.
+        """
+        deps = []
+        refs = []
+        last_write = {}
+        readers = {}
+        appenders = {}
+        any_readers = []
+        
+        for i, query in enumerate(queries):
+            var_match = re.match(r'\$(\w+)\s*=\s*(.+)', query)
+            text = var_match.group(2) if var_match else query
+            if _transaction_control(text):
+                # Transactions are per thread, so a block cannot span workers
+                raise ValueError("BEGIN ... COMMIT blocks need jobs=1")
+            names = set() if var_match else {name for name, _ in SCRIPT_REF.findall(text)}
+            refs.append(names)
             
-            if self.verbose:
-                if result.get('status') == 'success':
-                    print(f"  ✓ Success")
-                elif result.get('error'):
-                    print(f"  ✗ Error: {result['error']}")
+            try:
+                reads, appends, writes = _footprint(self._prepare(SCRIPT_REF.sub('_', text)))
+            except Exception:
+                # Unknown footprint: run it as a barrier
+                reads, appends, writes = set(), set(), {ANY_RESOURCE}
+            reads = reads | {f"${name}" for name in names}
+            if var_match:
+                writes = writes | {f"${var_match.group(1)}"}
+            
+            depends = set()
+            if ANY_RESOURCE in writes:
+                depends.update(last_write.values(), any_readers)
+                for pending in list(readers.values()) + list(appenders.values()):
+                    depends.update(pending)
+                last_write, readers, appenders, any_readers = {ANY_RESOURCE: i}, {}, {}, []
+            else:
+                if ANY_RESOURCE in last_write:
+                    depends.add(last_write[ANY_RESOURCE])
+                if ANY_RESOURCE in reads:
+                    depends.update(last_write.values())
+                    for pending in appenders.values():
+                        depends.update(pending)
+                    any_readers.append(i)
+                for resource in reads - {ANY_RESOURCE}:
+                    if resource in last_write:
+                        depends.add(last_write[resource])
+                    depends.update(appenders.get(resource, []))
+                    readers.setdefault(resource, []).append(i)
+                for resource in appends - writes:
+                    previous = last_write.get(resource, -1)
+                    if previous >= 0:
+                        depends.add(previous)
+                    depends.update(readers.pop(resource, []))
+                    depends.update(k for k in any_readers if k > previous)
+                    appenders.setdefault(resource, []).append(i)
+                for resource in writes:
+                    previous = last_write.get(resource, -1)
+                    if previous >= 0:
+                        depends.add(previous)
+                    depends.update(readers.pop(resource, []), appenders.pop(resource, []))
+                    depends.update(k for k in any_readers if k > previous)
+                    last_write[resource] = i
+            
+            depends.discard(i)
+            deps.append(depends)
+        
+        return deps, refs
+    
+    def _iter_script_dag(self, filepath: str, jobs: int) -> Iterator[Dict]:
+        """
+        Run a script's statements on up to jobs threads, one window of
+        SCRIPT_DAG_WINDOW statements at a time, yielding results in file
+        order. Assignments carry over to later windows. The file is checked
+        for BEGIN ... COMMIT first, so a rejected script runs nothing.
+        """
+        for query in self._read_script(filepath):
+            var_match = re.match(r'\$(\w+)\s*=\s*(.+)', query)
+            if _transaction_control(var_match.group(2) if var_match else query):
+                raise ValueError("BEGIN ... COMMIT blocks need jobs=1")
+        
+        variables = {}
+        start = 0
+        statements = self._read_script(filepath)
+        while True:
+            window = list(itertools.islice(statements, SCRIPT_DAG_WINDOW))
+            if not window:
+                return
+            yield from self._execute_script_dag(window, jobs, variables, start)
+            start += len(window)
+    
+    def _execute_script_dag(self, queries: List[str], jobs: int,
+                            variables: Dict[str, Dict] = None, start: int = 0) -> List[Dict]:
+        """
+        Run script statements on up to jobs threads as their dependencies
+        finish. variables holds earlier assignments and receives this
+        run's; start numbers the statements for logging.
+        """
+        deps, refs = self._script_dag(queries)
+        dependents = [[] for _ in queries]
+        for i, depends in enumerate(deps):
+            for j in depends:
+                dependents[j].append(i)
+        waiting = [len(depends) for depends in deps]
+        
+        results = [None] * len(queries)
+        if variables is None:
+            variables = {}
+        
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            running = {}
+            
+            def submit(i):
+                # Only finished assignments are passed, so workers never see variables change
+                needed = {name: variables[name] for name in refs[i] if name in variables}
+                running[executor.submit(self._script_step, start + i + 1, queries[i], needed)] = i
+            
+            for i in range(len(queries)):
+                if not waiting[i]:
+                    submit(i)
+            
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = running.pop(future)
+                    var_name, result = future.result()
+                    results[i] = result
+                    if var_name and result.get('status') == 'success':
+                        variables[var_name] = result
+                    for j in dependents[i]:
+                        waiting[j] -= 1
+                        if not waiting[j]:
+                            submit(j)
         
         return results
     
+    # ========================================================================
+    # Transactions (MySQL)
+    # ========================================================================
+    
+    def _in_transaction(self) -> bool:
+        return getattr(self._txn, 'conn', None) is not None
+    
+    def _begin_transaction(self, node: Begin = None) -> Dict:
+        """BEGIN - hold one MySQL connection for this thread until COMMIT/ROLLBACK"""
+        if self.mysql_pool is None:
+            return {"error": "MySQL not connected"}
+        if self._in_transaction():
+            return {"error": "Transaction already open"}
+        
+        self._mysql_slots.acquire()
+        try:
+            self._txn.conn = _HeldConnection(self.mysql_pool.get_connection())
+        except Error as e:
+            self._mysql_slots.release()
+            return {"error": str(e)}
+        
+        return {"status": "success"}
+    
+    def _commit_transaction(self, node: Commit = None) -> Dict:
+        """COMMIT - write everything since BEGIN in one commit"""
+        return self._end_transaction(commit=True)
+    
+    def _rollback_transaction(self, node: Rollback = None) -> Dict:
+        """ROLLBACK - discard the MySQL writes since BEGIN"""
+        return self._end_transaction(commit=False)
+    
+    def _end_transaction(self, commit: bool) -> Dict:
+        """Commit or roll back the open transaction and return its connection"""
+        held = getattr(self._txn, 'conn', None)
+        if held is None:
+            return {"error": "No transaction open"}
+        
+        self._txn.conn = None
+        try:
+            if commit:
+                held.conn.commit()
+                _apply_registry(self._committed_registry(), held.registry)
+            else:
+                held.conn.rollback()
+            return {"status": "success"}
+        except Error as e:
+            try:
+                held.conn.rollback()
+            except Error:
+                pass
+            return {"error": str(e)}
+        finally:
+            held.conn.close()
+            self._mysql_slots.release()
+    
     # ========================================================================
     # Neo4j Graph Operations
     # ========================================================================
     
-    def _create_user_node(self, query: str) -> Dict:
-        """CREATE USER {"email": "alice@dnacrypt.com", "role": "admin", "trust_score": 95}"""
+    def _run_graph(self, node) -> Dict:
+        """Run a single-statement graph operation (see _graph_statement)"""
         if not self.neo4j_driver:
             return {"error": "Neo4j not connected"}
         
         try:
-            match = re.search(r'CREATE USER\s*({.*?})$', query, re.IGNORECASE | re.DOTALL)
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            data_str = match.group(1).replace("'", '"')
-            data = json.loads(data_str)
-            
-            # Generate user_id if not provided
-            user_id = data.get('user_id', str(uuid.uuid4()))
-            data['user_id'] = user_id
-            data['created_at'] = datetime.utcnow().isoformat()
-            
-            # Create node in Neo4j
+            cypher, params = _graph_statement(node)
             with self.neo4j_driver.session() as session:
-                result = session.run(
-                    """
-                    CREATE (u:User $props)
-                    RETURN u.user_id as user_id, u.email as email
-                    """,
-                    props=data
-                )
-                record = result.single()
-            
-            return {
-                "status": "success",
-                "backend": "Neo4j (Graph)",
-                "user_id": record['user_id'],
-                "email": record['email']
-            }
+                records = list(session.run(cypher, params))
+            return _graph_result(node, records)
             
+        except ValueError as e:
+            return {"error": str(e)}
         except Neo4jError as e:
             return {"error": f"Neo4j error: {str(e)}"}
-        except json.JSONDecodeError as e:
-            return {"error": f"Invalid JSON: {str(e)}"}
     
-    def _create_message_node(self, query: str) -> Dict:
-        """CREATE MESSAGE NODE {"message_id": "xyz", "urgency": "high"}"""
+    def _create_user_node(self, node: CreateUser) -> Dict:
+        """CREATE USER {"email": "alice@dnacrypt.com", "role": "admin", "trust_score": 95}"""
+        return self._run_graph(node)
+    
+    def _create_users(self, node: CreateUsers) -> Dict:
+        """CREATE USERS [{"email": "alice@dnacrypt.com", "role": "admin"}, ...]"""
+        return self.create_users(node.rows)
+    
+    def create_users(self, rows, chunk_size: int = None) -> Dict:
+        """
+        Bulk CREATE USER
+        
+        MERGEs users on email with one UNWIND statement per chunk, each in
+        a managed write transaction, so re-running a bootstrap updates the
+        existing users instead of duplicating them.
+        """
         if not self.neo4j_driver:
             return {"error": "Neo4j not connected"}
         
+        ts = datetime.utcnow().isoformat()
+        errors = []
+        count = 0
+        created = 0
+        
         try:
-            match = re.search(r'CREATE MESSAGE NODE\s*({.*?})$', query, re.IGNORECASE | re.DOTALL)
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            data_str = match.group(1).replace("'", '"')
-            data = json.loads(data_str)
-            data['created_at'] = datetime.utcnow().isoformat()
-            
             with self.neo4j_driver.session() as session:
-                result = session.run(
-                    """
-                    CREATE (m:Message $props)
-                    RETURN m.message_id as message_id
-                    """,
-                    props=data
-                )
-                record = result.single()
+                for chunk in _chunked(_user_rows(rows, errors), chunk_size or self.chunk_size):
+                    summary = session.execute_write(
+                        lambda tx: tx.run(CREATE_USERS_CYPHER, rows=chunk, ts=ts).consume()
+                    )
+                    count += len(chunk)
+                    created += summary.counters.nodes_created
             
-            return {
-                "status": "success",
-                "backend": "Neo4j (Graph)",
-                "message_id": record['message_id']
-            }
+            return _bulk_result(count, created, errors)
             
         except Neo4jError as e:
-            return {"error": f"Neo4j error: {str(e)}"}
+            return {"error": f"Neo4j error: {str(e)}", "count": count}
     
-    def _create_relationship(self, query: str) -> Dict:
+    def _create_message_node(self, node: CreateMessageNode) -> Dict:
+        """CREATE MESSAGE NODE {"message_id": "xyz", "urgency": "high"}"""
+        return self._run_graph(node)
+    
+    def _create_relationship(self, node) -> Dict:
         """
         RELATE USER "alice@dnacrypt.com" SENT MESSAGE "xyz-789" AT "2025-11-15T10:00:00"
         RELATE USER "alice@dnacrypt.com" TRUSTS USER "bob@dnacrypt.com" LEVEL 85
         """
+        return self._run_graph(node)
+    
+    def _relate_many(self, node: RelateMany) -> Dict:
+        """RELATE MANY [{"from": "alice@dnacrypt.com", "type": "TRUSTS", "to": "bob@dnacrypt.com", "level": 85}, ...]"""
+        return self.relate_many(node.rows)
+    
+    def relate_many(self, rows, chunk_size: int = None) -> Dict:
+        """
+        Bulk RELATE
+        
+        Rows are {"from", "type", "to"} plus "level" for TRUSTS or an
+        optional "at" for SENT. Each relationship type is MERGEd with one
+        UNWIND statement per chunk, each in a managed write transaction.
+        """
         if not self.neo4j_driver:
             return {"error": "Neo4j not connected"}
         
-        try:
-            # Parse SENT relationship
-            sent_match = re.search(
-                r'RELATE USER ["\'](.+?)["\'] SENT MESSAGE ["\'](.+?)["\'] AT ["\'](.+?)["\']',
-                query, re.IGNORECASE
-            )
-            
-            if sent_match:
-                user_email = sent_match.group(1)
-                message_id = sent_match.group(2)
-                timestamp = sent_match.group(3)
-                
-                with self.neo4j_driver.session() as session:
-                    session.run(
-                        """
-                        MATCH (u:User {email: $email})
-                        MATCH (m:Message {message_id: $msg_id})
-                        CREATE (u)-[r:SENT {timestamp: $ts}]->(m)
-                        RETURN r
-                        """,
-                        email=user_email, msg_id=message_id, ts=timestamp
-                    )
-                
-                return {
-                    "status": "success",
-                    "backend": "Neo4j (Graph)",
-                    "relationship": "SENT",
-                    "from": user_email,
-                    "to": message_id
-                }
-            
-            # Parse TRUSTS relationship
-            trust_match = re.search(
-                r'RELATE USER ["\'](.+?)["\'] TRUSTS USER ["\'](.+?)["\'] LEVEL (\d+)',
-                query, re.IGNORECASE
+        size = chunk_size or self.chunk_size
+        ts = datetime.utcnow().isoformat()
+        pending = {rel_type: [] for rel_type in RELATE_MANY_CYPHER}
+        errors = []
+        count = 0
+        created = 0
+        
+        def flush(session, rel_type):
+            chunk = pending[rel_type]
+            pending[rel_type] = []
+            summary = session.execute_write(
+                lambda tx: tx.run(RELATE_MANY_CYPHER[rel_type], rows=chunk, ts=ts).consume()
             )
-            
-            if trust_match:
-                user1 = trust_match.group(1)
-                user2 = trust_match.group(2)
-                level = int(trust_match.group(3))
-                
-                with self.neo4j_driver.session() as session:
-                    session.run(
-                        """
-                        MATCH (u1:User {email: $email1})
-                        MATCH (u2:User {email: $email2})
-                        CREATE (u1)-[r:TRUSTS {level: $level, since: $ts}]->(u2)
-                        RETURN r
-                        """,
-                        email1=user1, email2=user2, level=level, 
-                        ts=datetime.utcnow().isoformat()
-                    )
-                
-                return {
-                    "status": "success",
-                    "backend": "Neo4j (Graph)",
-                    "relationship": "TRUSTS",
-                    "from": user1,
-                    "to": user2,
-                    "level": level
-                }
-            
-            return {"error": "Invalid RELATE syntax"}
-            
-        except Neo4jError as e:
-            return {"error": f"Neo4j error: {str(e)}"}
-    
-    def _find_path(self, query: str) -> Dict:
-        """FIND PATH FROM "alice@dnacrypt.com" TO "eve@dnacrypt.com" MAX 5"""
-        if not self.neo4j_driver:
-            return {"error": "Neo4j not connected"}
+            return len(chunk), summary.counters.relationships_created
         
         try:
-            match = re.search(
-                r'FIND PATH FROM ["\'](.+?)["\'] TO ["\'](.+?)["\'](?:\s+MAX\s+(\d+))?',
-                query, re.IGNORECASE
-            )
-            
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            start_email = match.group(1)
-            end_email = match.group(2)
-            max_depth = int(match.group(3)) if match.group(3) else 5
-            
             with self.neo4j_driver.session() as session:
-                result = session.run(
-                    f"""
-                    MATCH path = shortestPath(
-                        (start:User {{email: $start}})-[*1..{max_depth}]-(end:User {{email: $end}})
-                    )
-                    RETURN path, length(path) as hops
-                    """,
-                    start=start_email, end=end_email
-                )
+                for rel_type, row in _relationship_rows(rows, errors):
+                    pending[rel_type].append(row)
+                    if len(pending[rel_type]) >= size:
+                        sent, made = flush(session, rel_type)
+                        count += sent
+                        created += made
                 
-                record = result.single()
-                if record:
-                    path_nodes = [node['email'] for node in record['path'].nodes]
-                    return {
-                        "status": "success",
-                        "backend": "Neo4j (Graph)",
-                        "from": start_email,
-                        "to": end_email,
-                        "hops": record['hops'],
-                        "path": path_nodes
-                    }
-                else:
-                    return {
-                        "status": "success",
-                        "message": "No path found",
-                        "from": start_email,
-                        "to": end_email
-                    }
+                for rel_type in RELATE_MANY_CYPHER:
+                    if pending[rel_type]:
+                        sent, made = flush(session, rel_type)
+                        count += sent
+                        created += made
+            
+            return _bulk_result(count, created, errors)
             
         except Neo4jError as e:
-            return {"error": f"Neo4j error: {str(e)}"}
+            return {"error": f"Neo4j error: {str(e)}", "count": count}
+    
+    def _find_path(self, node: FindPath) -> Dict:
+        """FIND PATH FROM "alice@dnacrypt.com" TO "eve@dnacrypt.com" MAX 5"""
+        return self._run_graph(node)
     
-    def _find_pattern(self, query: str) -> Dict:
+    def _find_pattern(self, node: FindPattern) -> Dict:
         """FIND PATTERN users WHO accessed MORE THAN 100 messages"""
-        if not self.neo4j_driver:
-            return {"error": "Neo4j not connected"}
-        
-        try:
-            # Pattern: excessive access
-            if 'ACCESSED MORE THAN' in query.upper():
-                match = re.search(r'MORE THAN (\d+)', query, re.IGNORECASE)
-                threshold = int(match.group(1)) if match else 100
-                
-                with self.neo4j_driver.session() as session:
-                    result = session.run(
-                        """
-                        MATCH (u:User)-[:ACCESSED]->(m:Message)
-                        WITH u, COUNT(m) as access_count
-                        WHERE access_count > $threshold
-                        RETURN u.email as email, access_count
-                        ORDER BY access_count DESC
-                        """,
-                        threshold=threshold
-                    )
-                    
-                    records = [dict(record) for record in result]
-                
-                return {
-                    "status": "success",
-                    "backend": "Neo4j (Graph)",
-                    "pattern": "excessive_access",
-                    "threshold": threshold,
-                    "count": len(records),
-                    "results": records
-                }
-            
-            return {"error": "Unknown pattern"}
-            
-        except Neo4jError as e:
-            return {"error": f"Neo4j error: {str(e)}"}
+        return self._run_graph(node)
     
-    def _detect_anomaly(self, query: str) -> Dict:
+    def _detect_anomaly(self, node: DetectAnomaly) -> Dict:
         """DETECT ANOMALY IN access patterns"""
-        if not self.neo4j_driver:
-            return {"error": "Neo4j not connected"}
-        
-        try:
-            with self.neo4j_driver.session() as session:
-                # Find users with unusual access patterns
-                result = session.run(
-                    """
-                    MATCH (u:User)-[a:ACCESSED]->(m:Message)
-                    WITH u, COUNT(DISTINCT m) as msg_count,
-                         COUNT(a) as access_count,
-                         AVG(a.duration) as avg_duration
-                    WHERE access_count > msg_count * 3
-                    RETURN u.email as email, 
-                           msg_count, 
-                           access_count,
-                           (access_count * 1.0 / msg_count) as access_ratio
-                    ORDER BY access_ratio DESC
-                    LIMIT 10
-                    """
-                )
-                
-                anomalies = [dict(record) for record in result]
-            
-            return {
-                "status": "success",
-                "backend": "Neo4j (Graph)",
-                "anomaly_type": "excessive_repeated_access",
-                "count": len(anomalies),
-                "anomalies": anomalies
-            }
-            
-        except Neo4jError as e:
-            return {"error": f"Neo4j error: {str(e)}"}
+        return self._run_graph(node)
     
-    def _track_access(self, query: str) -> Dict:
+    def _track_access(self, node: TrackAccess) -> Dict:
         """TRACK ACCESS BY "alice@dnacrypt.com" TO MESSAGE "xyz-789" ACTION "decrypt" SUCCESS true"""
-        if not self.neo4j_driver:
-            return {"error": "Neo4j not connected"}
-        
-        try:
-            match = re.search(
-                r'TRACK ACCESS BY ["\'](.+?)["\'] TO MESSAGE ["\'](.+?)["\'] ACTION ["\'](.+?)["\'] SUCCESS (\w+)',
-                query, re.IGNORECASE
-            )
-            
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            user_email = match.group(1)
-            message_id = match.group(2)
-            action = match.group(3)
-            success = match.group(4).lower() == 'true'
-            
-            with self.neo4j_driver.session() as session:
-                session.run(
-                    """
-                    MATCH (u:User {email: $email})
-                    MATCH (m:Message {message_id: $msg_id})
-                    CREATE (u)-[a:ACCESSED {
-                        timestamp: $ts,
-                        action: $action,
-                        success: $success,
-                        ip_address: $ip
-                    }]->(m)
-                    """,
-                    email=user_email, msg_id=message_id, action=action,
-                    success=success, ts=datetime.utcnow().isoformat(),
-                    ip="0.0.0.0"
-                )
-            
-            return {
-                "status": "success",
-                "backend": "Neo4j (Graph)",
-                "access_tracked": True
-            }
-            
-        except Neo4jError as e:
-            return {"error": f"Neo4j error: {str(e)}"}
+        return self._run_graph(node)
     
-    def _show_graph(self, query: str) -> Dict:
+    def _show_graph(self, node: ShowGraph) -> Dict:
         """SHOW GRAPH stats"""
         if not self.neo4j_driver:
             return {"error": "Neo4j not connected"}
         
         try:
             with self.neo4j_driver.session() as session:
-                # Count nodes
-                user_count = session.run("MATCH (u:User) RETURN COUNT(u) as count").single()['count']
-                message_count = session.run("MATCH (m:Message) RETURN COUNT(m) as count").single()['count']
-                
-                # Count relationships
-                sent_count = session.run("MATCH ()-[r:SENT]->() RETURN COUNT(r) as count").single()['count']
-                trust_count = session.run("MATCH ()-[r:TRUSTS]->() RETURN COUNT(r) as count").single()['count']
-                access_count = session.run("MATCH ()-[r:ACCESSED]->() RETURN COUNT(r) as count").single()['count']
-            
-            return {
-                "status": "success",
-                "backend": "Neo4j (Graph)",
-                "nodes": {
-                    "users": user_count,
-                    "messages": message_count,
-                    "total": user_count + message_count
-                },
-                "relationships": {
-                    "sent": sent_count,
-                    "trusts": trust_count,
-                    "accessed": access_count,
-                    "total": sent_count + trust_count + access_count
-                }
-            }
+                totals = {name: session.run(cypher).single()['count']
+                          for name, cypher in GRAPH_COUNT_CYPHER.items()}
+            return _graph_stats(totals)
             
         except Neo4jError as e:
             return {"error": f"Neo4j error: {str(e)}"}
@@ -3483,217 +5066,94 @@ class DNACryptDB:
     # Enhanced SEND MESSAGE (now creates graph relationships too!)
     # ========================================================================
     
-    def _send_message(self, query: str) -> Dict:
+    def _send_message(self, node: SendMessage) -> Dict:
         """SEND MESSAGE TO messages_admin_adult {...} - Now with graph tracking!"""
-        if not self.mysql_cursor:
-            return {"error": "MySQL not connected"}
+        result = self.send_messages(node.table, [node.data])
+        if result.get('status') != 'success':
+            return result
         
+        return {
+            "status": "success",
+            "message_id": result['results'][0]['message_id'],
+            "link_id": result['results'][0]['link_id'],
+            "graph_created": result['graph_created']
+        }
+    
+    def _write_message_graph(self, graph_rows: List[Dict]) -> bool:
+        """
+        Create the users, Message nodes and SENT/RECEIVED edges for sent
+        messages with one UNWIND statement per chunk, each in a managed
+        write transaction. Returns False if the graph write failed.
+        """
+        ts = datetime.utcnow().isoformat()
         try:
-            match = re.search(
-                r'SEND MESSAGE TO (\w+)\s*({.*?})',
-                query, re.IGNORECASE | re.DOTALL
-            )
-            
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            table_name = match.group(1)
-            data_str = match.group(2).replace("'", '"')
-            data = json.loads(data_str)
-            
-            message_id = str(uuid.uuid4())
-            link_id = str(uuid.uuid4())
-            
-            parts = table_name.split('_')
-            role = parts[1] if len(parts) > 1 else None
-            age_group = parts[2] if len(parts) > 2 else None
-            
-            # Insert into MySQL
-            insert_query = f"""
-                INSERT INTO {table_name}
-                (message_id, content_text, sender, receiver, urgency, link_id, role, age_group)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            params = (
-                message_id,
-                data['content'],
-                data['sender'],
-                data['receiver'],
-                data.get('urgency', 'medium'),
-                link_id,
-                role,
-                age_group
-            )
-            
-            self.mysql_cursor.execute(insert_query, params)
-            self.mysql_conn.commit()
-            
-            # Also create in Neo4j graph if connected
-            if self.neo4j_driver:
-                try:
-                    with self.neo4j_driver.session() as session:
-                        # Create or merge users
-                        session.run(
-                            "MERGE (u:User {email: $email}) ON CREATE SET u.created_at = $ts",
-                            email=data['sender'], ts=datetime.utcnow().isoformat()
-                        )
-                        session.run(
-                            "MERGE (u:User {email: $email}) ON CREATE SET u.created_at = $ts",
-                            email=data['receiver'], ts=datetime.utcnow().isoformat()
-                        )
-                        
-                        # Create message node
-                        session.run(
-                            """
-                            CREATE (m:Message {
-                                message_id: $msg_id,
-                                link_id: $link_id,
-                                urgency: $urgency,
-                                timestamp: $ts
-                            })
-                            """,
-                            msg_id=message_id, link_id=link_id,
-                            urgency=data.get('urgency', 'medium'),
-                            ts=datetime.utcnow().isoformat()
-                        )
-                        
-                        # Create SENT relationship
-                        session.run(
-                            """
-                            MATCH (u:User {email: $sender})
-                            MATCH (m:Message {message_id: $msg_id})
-                            CREATE (u)-[:SENT {timestamp: $ts}]->(m)
-                            """,
-                            sender=data['sender'], msg_id=message_id,
-                            ts=datetime.utcnow().isoformat()
-                        )
-                        
-                        # Create RECEIVED relationship
-                        session.run(
-                            """
-                            MATCH (m:Message {message_id: $msg_id})
-                            MATCH (u:User {email: $receiver})
-                            CREATE (m)-[:RECEIVED {timestamp: $ts}]->(u)
-                            """,
-                            msg_id=message_id, receiver=data['receiver'],
-                            ts=datetime.utcnow().isoformat()
-                        )
-                except Neo4jError:
-                    # Continue even if graph creation fails
-                    pass
-            
-            return {
-                "status": "success",
-                "message_id": message_id,
-                "link_id": link_id,
-                "graph_created": self.neo4j_driver is not None
-            }
-            
-        except Error as e:
-            self.mysql_conn.rollback()
-            return {"error": str(e)}
-        except json.JSONDecodeError as e:
-            return {"error": f"Invalid JSON: {str(e)}"}
+            with self.neo4j_driver.session() as session:
+                for chunk in _chunked(graph_rows, self.chunk_size):
+                    session.execute_write(
+                        lambda tx: tx.run(SEND_MESSAGES_CYPHER, rows=chunk, ts=ts).consume()
+                    )
+            return True
+        except Neo4jError:
+            # Continue even if graph creation fails
+            return False
     
-    # ========================================================================
-    # MySQL Operations (Keep existing code)
-    # ========================================================================
+    def _send_messages(self, node: SendMessages) -> Dict:
+        """SEND MESSAGES TO messages_admin_adult [{...}, {...}, ...]"""
+        return self.send_messages(node.table, node.rows)
     
-    def _create_table_for_role(self, query: str) -> Dict:
-        """CREATE TABLE messages FOR ROLE admin AGE adult"""
-        if not self.mysql_cursor:
+    def send_messages(self, table_name: str, rows: List[Dict]) -> Dict:
+        """
+        Bulk SEND MESSAGE
+        
+        Inserts all rows with multi-row INSERTs (executemany) in a single
+        MySQL transaction, then writes the graph side with one UNWIND
+        statement per chunk of chunk_size rows.
+        """
+        if self.mysql_pool is None:
             return {"error": "MySQL not connected"}
+        if not re.fullmatch(r'\w+', table_name):
+            return {"error": f"Invalid table name: {table_name}"}
         
         try:
-            match = re.search(
-                r'CREATE TABLE (\w+) FOR ROLE (\w+)(?:\s+AGE\s+(\w+))?',
-                query, re.IGNORECASE
-            )
+            params, graph_rows = _message_params(table_name, rows)
             
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            table_type = match.group(1).lower()
-            role = match.group(2).lower()
-            age_group = match.group(3).lower() if match.group(3) else None
-            
-            templates = {
-                'messages': """
-                    CREATE TABLE IF NOT EXISTS {name} (
-                        message_id VARCHAR(36) PRIMARY KEY,
-                        content_text TEXT NOT NULL,
-                        sender VARCHAR(255) NOT NULL,
-                        receiver VARCHAR(255) NOT NULL,
-                        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        urgency ENUM('low', 'medium', 'high', 'critical') DEFAULT 'medium',
-                        status ENUM('pending', 'sent', 'delivered', 'read') DEFAULT 'pending',
-                        link_id VARCHAR(36) UNIQUE NOT NULL,
-                        role VARCHAR(50),
-                        age_group VARCHAR(50),
-                        INDEX idx_sender (sender),
-                        INDEX idx_receiver (receiver),
-                        INDEX idx_timestamp (timestamp),
-                        INDEX idx_link (link_id)
-                    )
-                """,
-                'algorithms': """
-                    CREATE TABLE IF NOT EXISTS {name} (
-                        algo_id INT AUTO_INCREMENT PRIMARY KEY,
-                        message_id VARCHAR(36) NOT NULL,
-                        algorithm_name VARCHAR(100) NOT NULL,
-                        algorithm_type ENUM('encryption', 'hashing', 'encoding', 'compression') NOT NULL,
-                        parameters JSON,
-                        execution_order INT,
-                        role VARCHAR(50),
-                        INDEX idx_message (message_id)
-                    )
-                """,
-                'keys': """
-                    CREATE TABLE IF NOT EXISTS {name} (
-                        key_id INT AUTO_INCREMENT PRIMARY KEY,
-                        message_id VARCHAR(36) NOT NULL,
-                        public_key TEXT NOT NULL,
-                        key_type ENUM('RSA', 'ECC', 'lattice', 'DNA_based') NOT NULL,
-                        key_size INT,
-                        role VARCHAR(50),
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        INDEX idx_message (message_id)
-                    )
-                """,
-                'hashes': """
-                    CREATE TABLE IF NOT EXISTS {name} (
-                        hash_id INT AUTO_INCREMENT PRIMARY KEY,
-                        message_id VARCHAR(36) NOT NULL,
-                        hash_value VARCHAR(512) NOT NULL,
-                        hash_algorithm ENUM('SHA256', 'SHA512', 'Blake2', 'DNA_hash') NOT NULL,
-                        salt VARCHAR(255),
-                        role VARCHAR(50),
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        INDEX idx_message (message_id),
-                        INDEX idx_hash (hash_value(255))
-                    )
-                """
-            }
+            insert_query = _insert_sql(table_name, MESSAGE_COLUMNS)
+            with self._mysql() as (conn, cursor):
+                for chunk in _chunked(params, self.chunk_size):
+                    cursor.executemany(insert_query, chunk)
+                    cursor.executemany(ROUTE_SQL['message_table'],
+                                       [(row[5], table_name) for row in chunk])
+                conn.commit()
             
-            if table_type not in templates:
-                return {"error": f"Invalid table type: {table_type}"}
+            graph_created = False
+            if self.neo4j_driver:
+                graph_created = self._write_message_graph(graph_rows)
             
-            if age_group:
-                table_name = f"{table_type}_{role}_{age_group}"
-            else:
-                table_name = f"{table_type}_{role}"
+            return _sent_result(graph_rows, graph_created)
             
-            create_sql = templates[table_type].format(name=table_name)
-            self.mysql_cursor.execute(create_sql)
-            self.mysql_conn.commit()
+        except Error as e:
+            return {"error": str(e)}
+        except KeyError as e:
+            return {"error": f"Missing required field: {str(e)}"}
+        except (TypeError, AttributeError):
+            return {"error": "Each message must be an object"}
+    
+    # ========================================================================
+    # MySQL Operations (Keep existing code)
+    # ========================================================================
+    
+    def _create_table_for_role(self, node: CreateTableForRole) -> Dict:
+        """CREATE TABLE messages FOR ROLE admin AGE adult"""
+        if self.mysql_pool is None:
+            return {"error": "MySQL not connected"}
+        
+        try:
+            table_name, create_sql, info = _role_table(node)
+            with self._mysql() as (conn, cursor):
+                cursor.execute(create_sql)
+                conn.commit()
             
-            self.schema_registry[table_name] = {
-                'backend': 'mysql',
-                'type': table_type,
-                'role': role,
-                'age_group': age_group
-            }
+            self._register(table_name, info)
             
             return {
                 "status": "success",
@@ -3701,28 +5161,18 @@ class DNACryptDB:
                 "backend": "MySQL (ACID, 3NF)"
             }
             
+        except ValueError as e:
+            return {"error": str(e)}
         except Error as e:
-            self.mysql_conn.rollback()
             return {"error": str(e)}
     
-    def _create_collection_for_role(self, query: str) -> Dict:
+    def _create_collection_for_role(self, node: CreateCollectionForRole) -> Dict:
         """CREATE COLLECTION sequences FOR ROLE admin"""
         if self.mongo_db is None:
             return {"error": "MongoDB not connected"}
         
         try:
-            match = re.search(
-                r'CREATE COLLECTION (\w+) FOR ROLE (\w+)',
-                query, re.IGNORECASE
-            )
-            
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            coll_type = match.group(1).lower()
-            role = match.group(2).lower()
-            
-            coll_name = f"{coll_type}_{role}"
+            coll_name, info = _role_collection(node)
             
             if coll_name not in self.mongo_db.list_collection_names():
                 self.mongo_db.create_collection(coll_name)
@@ -3730,11 +5180,7 @@ class DNACryptDB:
             self.mongo_db[coll_name].create_index("link_id", unique=True)
             self.mongo_db[coll_name].create_index("created_at")
             
-            self.schema_registry[coll_name] = {
-                'backend': 'mongodb',
-                'type': coll_type,
-                'role': role
-            }
+            self._register(coll_name, info)
             
             return {
                 "status": "success",
@@ -3745,191 +5191,45 @@ class DNACryptDB:
         except PyMongoError as e:
             return {"error": str(e)}
     
-    def _add_algorithm(self, query: str) -> Dict:
-        """ADD ALGORITHM TO algorithms_admin {...}"""
-        if not self.mysql_cursor:
+    def _add_row(self, node) -> Dict:
+        """INSERT the row of an ADD statement (see _row_insert) and return its id"""
+        if self.mysql_pool is None:
             return {"error": "MySQL not connected"}
         
         try:
-            match = re.search(
-                r'ADD ALGORITHM TO (\w+)\s*({.*?})',
-                query, re.IGNORECASE | re.DOTALL
-            )
-            
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            table_name = match.group(1)
-            data_str = match.group(2).replace("'", '"')
-            data = json.loads(data_str)
-            
-            role = table_name.split('_')[1] if '_' in table_name else None
-            
-            insert_query = f"""
-                INSERT INTO {table_name}
-                (message_id, algorithm_name, algorithm_type, parameters, execution_order, role)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            
-            params = (
-                data['message_id'],
-                data['algorithm'],
-                data['type'],
-                json.dumps(data.get('parameters', {})),
-                data.get('order', 1),
-                role
-            )
-            
-            self.mysql_cursor.execute(insert_query, params)
-            self.mysql_conn.commit()
-            
-            return {
-                "status": "success",
-                "algo_id": self.mysql_cursor.lastrowid
-            }
-            
+            columns, params, id_key = _row_insert(node)
+            with self._mysql() as (conn, cursor):
+                cursor.execute(_insert_sql(node.table, columns), params)
+                conn.commit()
+                return {"status": "success", id_key: cursor.lastrowid}
+                
         except Error as e:
-            self.mysql_conn.rollback()
             return {"error": str(e)}
     
-    def _add_key(self, query: str) -> Dict:
+    def _add_algorithm(self, node: AddAlgorithm) -> Dict:
+        """ADD ALGORITHM TO algorithms_admin {...}"""
+        return self._add_row(node)
+    
+    def _add_key(self, node: AddKey) -> Dict:
         """ADD KEY TO keys_admin {...}"""
-        if not self.mysql_cursor:
-            return {"error": "MySQL not connected"}
-        
-        try:
-            match = re.search(
-                r'ADD KEY TO (\w+)\s*({.*?})',
-                query, re.IGNORECASE | re.DOTALL
-            )
-            
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            table_name = match.group(1)
-            data_str = match.group(2).replace("'", '"')
-            data = json.loads(data_str)
-            
-            role = table_name.split('_')[1] if '_' in table_name else None
-            
-            insert_query = f"""
-                INSERT INTO {table_name}
-                (message_id, public_key, key_type, key_size, role)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            
-            params = (
-                data['message_id'],
-                data['public_key'],
-                data['type'],
-                data.get('size', 2048),
-                role
-            )
-            
-            self.mysql_cursor.execute(insert_query, params)
-            self.mysql_conn.commit()
-            
-            return {
-                "status": "success",
-                "key_id": self.mysql_cursor.lastrowid
-            }
-            
-        except Error as e:
-            self.mysql_conn.rollback()
-            return {"error": str(e)}
+        return self._add_row(node)
     
-    def _add_hash(self, query: str) -> Dict:
+    def _add_hash(self, node: AddHash) -> Dict:
         """ADD HASH TO hashes_admin {...}"""
-        if not self.mysql_cursor:
-            return {"error": "MySQL not connected"}
-        
-        try:
-            match = re.search(
-                r'ADD HASH TO (\w+)\s*({.*?})',
-                query, re.IGNORECASE | re.DOTALL
-            )
-            
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            table_name = match.group(1)
-            data_str = match.group(2).replace("'", '"')
-            data = json.loads(data_str)
-            
-            role = table_name.split('_')[1] if '_' in table_name else None
-            
-            insert_query = f"""
-                INSERT INTO {table_name}
-                (message_id, hash_value, hash_algorithm, salt, role)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            
-            params = (
-                data['message_id'],
-                data['hash'],
-                data['algorithm'],
-                data.get('salt', ''),
-                role
-            )
-            
-            self.mysql_cursor.execute(insert_query, params)
-            self.mysql_conn.commit()
-            
-            return {
-                "status": "success",
-                "hash_id": self.mysql_cursor.lastrowid
-            }
-            
-        except Error as e:
-            self.mysql_conn.rollback()
-            return {"error": str(e)}
+        return self._add_row(node)
     
-    def _store_sequence(self, query: str) -> Dict:
+    def _store_sequence(self, node: StoreSequence) -> Dict:
         """STORE SEQUENCE IN sequences_admin {...}"""
         if self.mongo_db is None:
             return {"error": "MongoDB not connected"}
         
         try:
-            match = re.search(
-                r'STORE SEQUENCE IN (\w+)\s*({.*})',
-                query, re.IGNORECASE | re.DOTALL
-            )
-            
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            coll_name = match.group(1)
-            data_str = match.group(2)
-            
-            try:
-                data_str_clean = data_str.replace("'", '"')
-                data = json.loads(data_str_clean)
-            except json.JSONDecodeError:
-                try:
-                    import ast
-                    data = ast.literal_eval(data_str)
-                except:
-                    return {"error": "Invalid JSON format"}
-            
-            metadata = data.get('metadata', {})
-            if isinstance(metadata, str):
-                try:
-                    metadata = json.loads(metadata)
-                except:
-                    metadata = {}
-            
-            sequence_doc = {
-                "link_id": data['link_id'],
-                "original_sequence": data.get('original', ''),
-                "encrypted_sequence": data.get('encrypted', ''),
-                "digest_sequence": data.get('digest', ''),
-                "final_sequence": data.get('final', ''),
-                "metadata": metadata,
-                "role": coll_name.split('_')[1] if '_' in coll_name else None,
-                "created_at": datetime.utcnow()
-            }
+            coll_name = node.collection
+            data = node.data
             
+            sequence_doc = self._sequence_doc(coll_name, data)
             result = self.mongo_db[coll_name].insert_one(sequence_doc)
+            self._route_sequences(coll_name, [sequence_doc['link_id']])
             
             return {
                 "status": "success",
@@ -3944,249 +5244,382 @@ class DNACryptDB:
         except Exception as e:
             return {"error": f"Store sequence failed: {str(e)}"}
     
-    def _get_message(self, query: str) -> Dict:
-        """GET MESSAGE FROM messages_admin_adult WHERE message_id = "..."""
-        if not self.mysql_cursor:
-            return {"error": "MySQL not connected"}
+    def _sequence_doc(self, coll_name: str, data: Dict) -> Dict:
+        """Build the MongoDB document for one STORE SEQUENCE payload"""
+        metadata = data.get('metadata', {})
+        if isinstance(metadata, str):
+            try:
+                metadata = json.loads(metadata)
+            except:
+                metadata = {}
+        
+        return {
+            "link_id": data['link_id'],
+            "original_sequence": data.get('original', ''),
+            "encrypted_sequence": data.get('encrypted', ''),
+            "digest_sequence": data.get('digest', ''),
+            "final_sequence": data.get('final', ''),
+            "metadata": metadata,
+            "role": coll_name.split('_')[1] if '_' in coll_name else None,
+            "created_at": datetime.utcnow()
+        }
+    
+    def _store_sequences(self, node: StoreSequences) -> Dict:
+        """STORE SEQUENCES IN sequences_admin [{...}, {...}, ...]"""
+        return self.store_sequences(node.collection, node.rows)
+    
+    def store_sequences(self, coll_name: str, sequences) -> Dict:
+        """
+        Bulk STORE SEQUENCE
+        
+        Streams documents from any iterable into insert_many(ordered=False)
+        in chunks of chunk_size. A duplicate link_id or a malformed
+        document is reported under "errors" with its input index instead
+        of aborting the rest of the batch.
+        """
+        if self.mongo_db is None:
+            return {"error": "MongoDB not connected"}
+        
+        collection = self.mongo_db[coll_name]
+        inserted = 0
+        errors = []
+        chunk = []
+        positions = []
         
         try:
-            match = re.search(
-                r'GET MESSAGE FROM (\w+) WHERE\s+(\w+)\s*=\s*["\']?(.*?)["\']?$',
-                query, re.IGNORECASE
-            )
+            for index, data in enumerate(sequences):
+                try:
+                    chunk.append(self._sequence_doc(coll_name, data))
+                    positions.append(index)
+                except KeyError as e:
+                    errors.append({"index": index, "error": f"Missing required field: {str(e)}"})
+                except (TypeError, AttributeError):
+                    errors.append({"index": index, "error": "Sequence must be an object"})
+                
+                if len(chunk) >= self.chunk_size:
+                    inserted += self._insert_sequence_chunk(collection, chunk, positions, errors)
+                    chunk, positions = [], []
             
-            if not match:
-                return {"error": "Invalid syntax"}
+            if chunk:
+                inserted += self._insert_sequence_chunk(collection, chunk, positions, errors)
             
-            table_name = match.group(1)
-            field = match.group(2)
-            value = match.group(3).strip('"\'')
+            errors.sort(key=lambda error: error['index'])
+            return {
+                "status": "success",
+                "inserted": inserted,
+                "failed": len(errors),
+                "errors": errors
+            }
             
-            select_query = f"SELECT * FROM {table_name} WHERE {field} = %s"
-            self.mysql_cursor.execute(select_query, (value,))
-            result = self.mysql_cursor.fetchone()
+        except PyMongoError as e:
+            return {"error": str(e), "inserted": inserted}
+    
+    def _insert_sequence_chunk(self, collection, chunk: List[Dict],
+                               positions: List[int], errors: List[Dict]) -> int:
+        """insert_many one chunk unordered, recording per-document failures"""
+        try:
+            result = collection.insert_many(chunk, ordered=False)
+            self._route_sequences(collection.name, [doc['link_id'] for doc in chunk])
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            failures, stored = _sequence_write_errors(e.details, chunk, positions)
+            self._route_sequences(collection.name, stored)
+            errors.extend(failures)
+            return e.details.get('nInserted', 0)
+    
+    def _route_sequences(self, coll_name: str, link_ids: List[str]):
+        """
+        Record the collection now holding these link_ids. Best effort: an
+        unrouted link_id is still found by LINK DATA, just by scanning.
+        """
+        if self.mysql_pool is None or not link_ids:
+            return
+        try:
+            with self._mysql() as (conn, cursor):
+                cursor.executemany(ROUTE_SQL['sequence_collection'],
+                                   [(link_id, coll_name) for link_id in link_ids])
+                conn.commit()
+        except Error:
+            pass
+    
+    def _get_message(self, node: GetMessage) -> Dict:
+        """GET MESSAGE FROM messages_admin_adult WHERE message_id = "..."""
+        if self.mysql_pool is None:
+            return {"error": "MySQL not connected"}
+        
+        try:
+            with self._mysql() as (conn, cursor):
+                cursor.execute(_select_by_sql(node.table, node.field), (node.value,))
+                result = cursor.fetchone()
             
             if not result:
                 return {"error": "Message not found"}
             
-            if 'timestamp' in result and result['timestamp']:
-                result['timestamp'] = result['timestamp'].isoformat()
-            
-            return {"status": "success", "message": result}
+            return {"status": "success", "message": _iso_timestamp(result)}
             
         except Error as e:
             return {"error": str(e)}
     
-    def _get_sequence(self, query: str) -> Dict:
+    def _get_sequence(self, node: GetSequence) -> Dict:
         """GET SEQUENCE FROM sequences_admin WHERE link_id = "..."""
         if self.mongo_db is None:
             return {"error": "MongoDB not connected"}
         
         try:
-            match = re.search(
-                r'GET SEQUENCE FROM (\w+) WHERE\s+link_id\s*=\s*["\']?(.*?)["\']?$',
-                query, re.IGNORECASE
-            )
-            
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            coll_name = match.group(1)
-            link_id = match.group(2).strip('"\'')
-            
-            sequence = self.mongo_db[coll_name].find_one({"link_id": link_id})
+            sequence = self.mongo_db[node.collection].find_one({"link_id": node.link_id})
             
             if not sequence:
                 return {"error": "Sequence not found"}
             
-            sequence['_id'] = str(sequence['_id'])
-            if 'created_at' in sequence:
-                sequence['created_at'] = sequence['created_at'].isoformat()
-            
-            return {"status": "success", "sequence": sequence}
+            return {"status": "success", "sequence": self._clean_doc(sequence)}
             
         except PyMongoError as e:
             return {"error": str(e)}
     
-    def _link_data(self, query: str) -> Dict:
-        """LINK DATA WHERE link_id = "uuid" - Now includes graph data!"""
+    def _link_data(self, node: LinkData) -> Dict:
+        """
+        LINK DATA WHERE link_id = "uuid"
+        
+        The _dnacdb_links route names the one table and collection to read;
+        link_ids written before it existed fall back to scanning the
+        registry. The three backends are then searched at the same time,
+        each given its link_timeouts entry. A backend that has not answered
+        by then is listed in "timed_out" and its part of the result is left
+        empty.
+        
+        Inside a transaction the MySQL lookups run on this thread's held
+        connection instead, so they see its uncommitted writes and need no
+        second pool slot; they are not bounded by the timeout.
+        """
         try:
-            match = re.search(
-                r'LINK DATA WHERE\s+link_id\s*=\s*["\']?(.*?)["\']?$',
-                query, re.IGNORECASE
-            )
-            
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            link_id = match.group(1).strip('"\'')
+            link_id = node.link_id
+            started = time.monotonic()
+            in_transaction = self._in_transaction()
+            route = {}
+            if in_transaction:
+                route = self._link_route(link_id)
+            elif self.mysql_pool is not None:
+                try:
+                    route = self._fanout.submit(self._link_route, link_id).result(
+                        timeout=self.link_timeouts['mysql'])
+                except FuturesTimeout:
+                    pass
             
-            result = {
-                "status": "success",
-                "link_id": link_id,
-                "mysql_data": {},
-                "mongodb_data": {},
-                "neo4j_data": {}
+            lookups = {
+                'mysql': (self._link_mysql, link_id, route.get('message_table')),
+                'mongodb': (self._link_mongo, link_id, route.get('sequence_collection')),
+                'neo4j': (self._link_graph, link_id)
             }
-            
-            # Search MySQL
-            if self.mysql_cursor:
-                for table_name, table_info in self.schema_registry.items():
-                    if table_info.get('backend') == 'mysql' and table_info.get('type') == 'messages':
-                        try:
-                            query_sql = f"SELECT * FROM {table_name} WHERE link_id = %s"
-                            self.mysql_cursor.execute(query_sql, (link_id,))
-                            msg = self.mysql_cursor.fetchone()
-                            
-                            if msg:
-                                if 'timestamp' in msg and msg['timestamp']:
-                                    msg['timestamp'] = msg['timestamp'].isoformat()
-                                result['mysql_data']['message'] = msg
-                                result['mysql_data']['table'] = table_name
-                                break
-                        except:
-                            continue
-            
-            # Search MongoDB
-            if self.mongo_db is not None:
-                for coll_name, coll_info in self.schema_registry.items():
-                    if coll_info.get('backend') == 'mongodb':
-                        try:
-                            seq = self.mongo_db[coll_name].find_one({"link_id": link_id})
-                            if seq:
-                                seq['_id'] = str(seq['_id'])
-                                if 'created_at' in seq:
-                                    seq['created_at'] = seq['created_at'].isoformat()
-                                result['mongodb_data']['sequence'] = seq
-                                result['mongodb_data']['collection'] = coll_name
-                                break
-                        except:
-                            continue
-            
-            # Search Neo4j
-            if self.neo4j_driver:
+            futures = {backend: self._fanout.submit(*lookup)
+                       for backend, lookup in lookups.items()
+                       if not (in_transaction and backend == 'mysql')}
+            
+            result = {"status": "success", "link_id": link_id}
+            if in_transaction:
+                result["mysql_data"] = self._link_mysql(*lookups['mysql'][1:])
+            timed_out = []
+            for backend, future in futures.items():
+                remaining = self.link_timeouts[backend] - (time.monotonic() - started)
                 try:
-                    with self.neo4j_driver.session() as session:
-                        graph_result = session.run(
-                            """
-                            MATCH (m:Message {link_id: $link_id})
-                            OPTIONAL MATCH (sender:User)-[sent:SENT]->(m)
-                            OPTIONAL MATCH (m)-[received:RECEIVED]->(receiver:User)
-                            OPTIONAL MATCH (u:User)-[accessed:ACCESSED]->(m)
-                            RETURN m, sender, receiver, 
-                                   COUNT(accessed) as access_count,
-                                   COLLECT(DISTINCT u.email) as accessed_by
-                            """,
-                            link_id=link_id
-                        )
-                        
-                        record = graph_result.single()
-                        if record:
-                            result['neo4j_data'] = {
-                                'sender': record['sender']['email'] if record['sender'] else None,
-                                'receiver': record['receiver']['email'] if record['receiver'] else None,
-                                'access_count': record['access_count'],
-                                'accessed_by': record['accessed_by']
-                            }
-                except:
-                    pass
+                    result[f"{backend}_data"] = future.result(timeout=max(remaining, 0))
+                except FuturesTimeout:
+                    future.cancel()
+                    timed_out.append(backend)
+                    result[f"{backend}_data"] = {}
             
+            result["timed_out"] = timed_out
             return result
             
         except Exception as e:
             return {"error": str(e)}
     
-    def _polyglot_join(self, query: str) -> Dict:
-        """JOIN messages_admin_adult WITH sequences_admin ON link_id"""
+    def _link_route(self, link_id: str) -> Dict:
+        """The _dnacdb_links row for link_id, or {} if it has none"""
         try:
-            match = re.search(
-                r'JOIN (\w+) WITH (\w+) ON (\w+)(?:\s+WHERE\s+(.*))?',
-                query, re.IGNORECASE
-            )
-            
-            if not match:
-                return {"error": "Invalid JOIN syntax"}
-            
-            mysql_table = match.group(1)
-            mongo_collection = match.group(2)
-            join_field = match.group(3)
-            where_clause = match.group(4)
-            
-            if where_clause:
-                mysql_query = f"SELECT * FROM {mysql_table} WHERE {where_clause}"
-            else:
-                mysql_query = f"SELECT * FROM {mysql_table}"
-            
-            self.mysql_cursor.execute(mysql_query)
-            mysql_results = self.mysql_cursor.fetchall()
-            
-            joined_results = []
-            
-            for mysql_row in mysql_results:
-                if join_field not in mysql_row:
+            with self._mysql() as (conn, cursor):
+                cursor.execute(ROUTE_LOOKUP_SQL, (link_id,))
+                return cursor.fetchone() or {}
+        except Error:
+            return {}
+    
+    def _link_mysql(self, link_id: str, table: str = None) -> Dict:
+        """The message with this link_id from table, else the first messages table holding it"""
+        if self.mysql_pool is None:
+            return {}
+        
+        # Before taking a connection: loading the registry takes one of its own
+        candidates = _link_candidates(self.schema_registry, 'mysql', table)
+        with self._mysql() as (conn, cursor):
+            for table_name in candidates:
+                try:
+                    cursor.execute(_select_by_sql(table_name, 'link_id'), (link_id,))
+                    msg = cursor.fetchone()
+                except Error:
                     continue
                 
-                link_value = mysql_row[join_field]
-                mongo_doc = self.mongo_db[mongo_collection].find_one({join_field: link_value})
-                
-                if mongo_doc:
-                    mongo_doc['_id'] = str(mongo_doc['_id'])
-                    if 'created_at' in mongo_doc:
-                        mongo_doc['created_at'] = mongo_doc['created_at'].isoformat()
-                    
-                    joined_row = {
-                        'mysql_data': dict(mysql_row),
-                        'mongodb_data': mongo_doc,
-                        'join_field': join_field,
-                        'join_value': link_value
-                    }
-                    
-                    if 'timestamp' in joined_row['mysql_data'] and joined_row['mysql_data']['timestamp']:
-                        joined_row['mysql_data']['timestamp'] = joined_row['mysql_data']['timestamp'].isoformat()
-                    
-                    joined_results.append(joined_row)
+                if msg:
+                    return {'message': _iso_timestamp(msg), 'table': table_name}
+        return {}
+    
+    def _link_mongo(self, link_id: str, collection: str = None) -> Dict:
+        """The sequence with this link_id from collection, else the first collection holding it"""
+        if self.mongo_db is None:
+            return {}
+        
+        for coll_name in _link_candidates(self.schema_registry, 'mongodb', collection):
+            try:
+                seq = self.mongo_db[coll_name].find_one({"link_id": link_id})
+            except PyMongoError:
+                continue
             
-            return {
-                "status": "success",
-                "join_type": "MySQL ⟕ MongoDB",
-                "mysql_table": mysql_table,
-                "mongodb_collection": mongo_collection,
-                "join_field": join_field,
-                "count": len(joined_results),
-                "results": joined_results
-            }
+            if seq:
+                return {'sequence': self._clean_doc(seq), 'collection': coll_name}
+        return {}
+    
+    def _link_graph(self, link_id: str) -> Dict:
+        """Sender, receiver and accesses of the Message node with this link_id"""
+        if not self.neo4j_driver:
+            return {}
+        
+        try:
+            with self.neo4j_driver.session() as session:
+                record = session.run(LINK_DATA_CYPHER, link_id=link_id).single()
+        except Neo4jError:
+            return {}
+        
+        return _link_graph_result(record)
+    
+    def _polyglot_join(self, node: Join) -> Dict:
+        """JOIN messages_admin_adult WITH sequences_admin ON link_id"""
+        if self.mysql_pool is None:
+            return {"error": "MySQL not connected"}
+        if self.mongo_db is None:
+            return {"error": "MongoDB not connected"}
+        
+        try:
+            with self._mysql() as (conn, cursor):
+                plan = self._plan_join(node, cursor)
+                joined_results = list(self._join_rows(node, plan, cursor))
+            
+            return _join_result(node, plan, joined_results)
             
         except Exception as e:
             return {"error": str(e)}
     
-    def _list_messages(self, query: str) -> Dict:
+    def _explain_join(self, node: ExplainJoin) -> Dict:
+        """EXPLAIN JOIN messages_admin_adult WITH sequences_admin ON link_id"""
+        if self.mysql_pool is None:
+            return {"error": "MySQL not connected"}
+        if self.mongo_db is None:
+            return {"error": "MongoDB not connected"}
+        
+        try:
+            with self._mysql() as (conn, cursor):
+                return {"status": "success", **self._plan_join(node, cursor)}
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def _plan_join(self, node: Join, cursor) -> Dict:
+        """Estimate both sides of a JOIN and pick its strategy"""
+        cursor.execute(TABLE_ROWS_SQL, (node.table,))
+        row = cursor.fetchone()
+        mysql_rows = (row or {}).get('TABLE_ROWS') or 0
+        mongo_docs = self.mongo_db[node.collection].estimated_document_count()
+        
+        # Merge order is only shared for string keys, so check both sides
+        string_keys = False
+        if node.field == 'link_id':
+            cursor.execute(KEY_TYPE_SQL, (node.table, node.field))
+            row = cursor.fetchone()
+            string_keys = ((row or {}).get('DATA_TYPE') or '').lower() in STRING_KEY_TYPES
+        if string_keys:
+            string_keys = self.mongo_db[node.collection].find_one(
+                {node.field: NON_STRING_KEY}) is None
+        
+        return _join_plan(node, mysql_rows, mongo_docs, self.chunk_size, string_keys)
+    
+    def _join_rows(self, node: Join, plan: Dict, cursor):
+        """Yield joined rows, reading MySQL in chunks through cursor"""
+        strategy = plan['strategy']
+        join_field = node.field
+        collection = self.mongo_db[node.collection]
+        cursor.execute(*_join_select(node, strategy))
+        
+        lookup = None
+        if strategy == 'hash':
+            lookup = self._mongo_lookup(node.collection, join_field)
+        elif strategy == 'merge':
+            docs = collection.find({join_field: {"$ne": None}}, batch_size=self.chunk_size,
+                                   sort=[(join_field, 1)])
+            docs = map(self._clean_doc, docs)
+            head = next(docs, None)
+        
+        while True:
+            rows = cursor.fetchmany(self.chunk_size)
+            if not rows:
+                break
+            
+            # NULL keys never join, whichever strategy runs
+            rows = [row for row in rows if row.get(join_field) is not None]
+            if strategy == 'batch':
+                keys = list(dict.fromkeys(row[join_field] for row in rows))
+                lookup = self._mongo_lookup(node.collection, join_field, keys) if keys else {}
+            
+            for mysql_row in rows:
+                link_value = mysql_row[join_field]
+                if strategy == 'merge':
+                    # Both sides ascend, so documents behind this key never match again
+                    while head is not None and _merge_key(head[join_field]) < _merge_key(link_value):
+                        head = next(docs, None)
+                    matched = head is not None and head[join_field] == link_value
+                    mongo_doc = head if matched else None
+                elif strategy == 'nested_loop':
+                    mongo_doc = collection.find_one({join_field: link_value})
+                    if mongo_doc is not None:
+                        mongo_doc = self._clean_doc(mongo_doc)
+                else:
+                    mongo_doc = lookup.get(link_value)
+                
+                if mongo_doc is not None:
+                    yield self._joined_row(mysql_row, mongo_doc, join_field, link_value)
+    
+    def _mongo_lookup(self, coll_name: str, field: str, keys: List = None) -> Dict:
+        """Map field value -> first matching document, for keys or the whole collection"""
+        query = {field: {"$in": keys}} if keys is not None else {field: {"$ne": None}}
+        lookup = {}
+        for doc in self.mongo_db[coll_name].find(query, batch_size=self.chunk_size):
+            lookup.setdefault(doc[field], self._clean_doc(doc))
+        return lookup
+    
+    def _clean_doc(self, doc: Dict) -> Dict:
+        """Make a sequence document JSON-friendly"""
+        doc['_id'] = str(doc['_id'])
+        if 'created_at' in doc:
+            doc['created_at'] = doc['created_at'].isoformat()
+        return doc
+    
+    def _joined_row(self, mysql_row: Dict, mongo_doc: Dict, join_field: str, link_value) -> Dict:
+        """One JOIN result row"""
+        joined_row = {
+            'mysql_data': dict(mysql_row),
+            'mongodb_data': dict(mongo_doc),
+            'join_field': join_field,
+            'join_value': link_value
+        }
+        
+        if 'timestamp' in joined_row['mysql_data'] and joined_row['mysql_data']['timestamp']:
+            joined_row['mysql_data']['timestamp'] = joined_row['mysql_data']['timestamp'].isoformat()
+        
+        return joined_row
+    
+    def _list_messages(self, node: ListMessages) -> Dict:
         """LIST MESSAGES FROM messages_admin_adult"""
-        if not self.mysql_cursor:
+        if self.mysql_pool is None:
             return {"error": "MySQL not connected"}
         
         try:
-            match = re.search(
-                r'LIST MESSAGES FROM (\w+)(?:\s+WHERE\s+(.*))?',
-                query, re.IGNORECASE
-            )
-            
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            table_name = match.group(1)
-            where_clause = match.group(2)
-            
-            if where_clause:
-                select_query = f"SELECT * FROM {table_name} WHERE {where_clause} ORDER BY timestamp DESC"
-            else:
-                select_query = f"SELECT * FROM {table_name} ORDER BY timestamp DESC"
-            
-            self.mysql_cursor.execute(select_query)
-            results = self.mysql_cursor.fetchall()
-            
-            for result in results:
-                if 'timestamp' in result and result['timestamp']:
-                    result['timestamp'] = result['timestamp'].isoformat()
+            with self._mysql() as (conn, cursor):
+                results = list(self._message_rows(node, cursor))
             
             return {
                 "status": "success",
@@ -4197,233 +5630,169 @@ class DNACryptDB:
         except Error as e:
             return {"error": str(e)}
     
+    def _message_rows(self, node: ListMessages, cursor):
+        """Yield LIST MESSAGES rows newest first, reading in chunks through cursor"""
+        cursor.execute(*_message_select(node))
+        while True:
+            results = cursor.fetchmany(self.chunk_size)
+            if not results:
+                break
+            for result in results:
+                yield _iso_timestamp(result)
+    
     # ========================================================================
     # Legacy Methods (Keep for backward compatibility)
     # ========================================================================
     
-    def _make_table(self, query: str) -> Dict:
+    def _make_table(self, node: MakeTable) -> Dict:
         """MAKE TABLE users WITH (name:text, age:int)"""
-        if not self.mysql_cursor:
+        if self.mysql_pool is None:
             return {"error": "MySQL not connected"}
         
         try:
-            match = re.search(r'MAKE TABLE (\w+) WITH\s*\((.*?)\)', query, re.IGNORECASE)
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            table_name = match.group(1)
-            fields_str = match.group(2)
-            
-            type_mapping = {
-                'int': 'INT', 'integer': 'INT', 'text': 'VARCHAR(255)',
-                'float': 'FLOAT', 'date': 'DATE', 'datetime': 'DATETIME',
-                'bool': 'BOOLEAN'
-            }
-            
-            fields = ['id INT AUTO_INCREMENT PRIMARY KEY']
-            field_schema = {}
-            
-            for field in fields_str.split(','):
-                field = field.strip()
-                if ':' in field:
-                    name, ftype = field.split(':')
-                    name, ftype = name.strip(), ftype.strip().lower()
-                    if name.lower() != 'id':
-                        sql_type = type_mapping.get(ftype, 'VARCHAR(255)')
-                        fields.append(f"{name} {sql_type}")
-                        field_schema[name] = ftype
+            create_sql, info = _table_ddl(node)
+            with self._mysql() as (conn, cursor):
+                cursor.execute(create_sql)
+                conn.commit()
             
-            create_sql = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(fields)})"
-            self.mysql_cursor.execute(create_sql)
-            self.mysql_conn.commit()
-            
-            self.schema_registry[table_name] = {'backend': 'mysql', 'fields': field_schema}
-            return {"status": "success", "table": table_name}
+            self._register(node.table, info)
+            return {"status": "success", "table": node.table}
             
         except Error as e:
-            self.mysql_conn.rollback()
             return {"error": str(e)}
     
-    def _make_collection(self, query: str) -> Dict:
+    def _make_collection(self, node: MakeCollection) -> Dict:
         """MAKE COLLECTION logs"""
         if self.mongo_db is None:
             return {"error": "MongoDB not connected"}
         
         try:
-            match = re.search(r'MAKE COLLECTION (\w+)', query, re.IGNORECASE)
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            coll_name = match.group(1)
+            coll_name = node.collection
             if coll_name not in self.mongo_db.list_collection_names():
                 self.mongo_db.create_collection(coll_name)
             
-            self.schema_registry[coll_name] = {'backend': 'mongodb'}
+            self._register(coll_name, {'backend': 'mongodb'})
             return {"status": "success", "collection": coll_name}
             
         except PyMongoError as e:
             return {"error": str(e)}
     
-    def _put_data(self, query: str) -> Dict:
+    def _put_data(self, node: PutData) -> Dict:
         """PUT INTO target DATA {...}"""
         try:
-            match = re.search(r'PUT INTO (\w+) DATA\s*({.*?})$', query, re.IGNORECASE | re.DOTALL)
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            target = match.group(1)
-            data_str = match.group(2).replace("'", '"')
-            data = json.loads(data_str)
+            target = node.target
+            data = dict(node.data)
             
             if target not in self.schema_registry:
                 return {"error": f"Target '{target}' does not exist"}
             
-            backend = self.schema_registry[target]['backend']
+            if self.schema_registry[target]['backend'] == 'mysql':
+                fields = tuple(data.keys())
+                with self._mysql() as (conn, cursor):
+                    cursor.execute(_insert_sql(target, fields), tuple(data[f] for f in fields))
+                    conn.commit()
+                    return {"status": "success", "inserted_id": cursor.lastrowid}
+            
+            data['created_at'] = datetime.utcnow()
+            result = self.mongo_db[target].insert_one(data)
+            return {"status": "success", "inserted_id": str(result.inserted_id)}
             
-            if backend == 'mysql':
-                fields = list(data.keys())
-                placeholders = ', '.join(['%s' for _ in fields])
-                values = [data[f] for f in fields]
-                insert_sql = f"INSERT INTO {target} ({', '.join(fields)}) VALUES ({placeholders})"
-                self.mysql_cursor.execute(insert_sql, values)
-                self.mysql_conn.commit()
-                return {"status": "success", "inserted_id": self.mysql_cursor.lastrowid}
-            else:
-                data['created_at'] = datetime.utcnow()
-                result = self.mongo_db[target].insert_one(data)
-                return {"status": "success", "inserted_id": str(result.inserted_id)}
-                
         except Exception as e:
             return {"error": str(e)}
     
-    def _fetch_data(self, query: str) -> Dict:
+    def _fetch_data(self, node: FetchData) -> Dict:
         """FETCH FROM source WHERE/ALL"""
         try:
-            match = re.search(r'FETCH FROM (\w+)\s+(?:WHERE\s+(.*)|ALL)', query, re.IGNORECASE)
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            source = match.group(1)
-            condition = match.group(2)
-            
+            source = node.source
             if source not in self.schema_registry:
                 return {"error": f"Source '{source}' does not exist"}
             
-            backend = self.schema_registry[source]['backend']
-            
-            if backend == 'mysql':
-                if condition:
-                    query_sql = f"SELECT * FROM {source} WHERE {condition}"
-                else:
-                    query_sql = f"SELECT * FROM {source}"
-                self.mysql_cursor.execute(query_sql)
-                results = self.mysql_cursor.fetchall()
-                return {"status": "success", "count": len(results), "data": results}
-            else:
-                mongo_filter = self._parse_condition(condition) if condition else {}
-                results = list(self.mongo_db[source].find(mongo_filter))
-                for r in results:
-                    r['_id'] = str(r['_id'])
-                    if 'created_at' in r:
-                        r['created_at'] = r['created_at'].isoformat()
+            if self.schema_registry[source]['backend'] == 'mysql':
+                with self._mysql() as (conn, cursor):
+                    cursor.execute(*_fetch_sql(node))
+                    results = cursor.fetchall()
                 return {"status": "success", "count": len(results), "data": results}
-                
+            
+            mongo_filter = self._parse_condition(node.condition)
+            results = [self._clean_doc(doc) for doc in self.mongo_db[source].find(mongo_filter)]
+            return {"status": "success", "count": len(results), "data": results}
+            
         except Exception as e:
             return {"error": str(e)}
     
-    def _change_data(self, query: str) -> Dict:
+    def _change_data(self, node: ChangeData) -> Dict:
         """CHANGE IN target SET field=value WHERE condition"""
         try:
-            match = re.search(r'CHANGE IN (\w+) SET\s+(.*?)\s+WHERE\s+(.*)', query, re.IGNORECASE)
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            target, set_clause, condition = match.groups()
-            
+            target = node.target
             if target not in self.schema_registry:
                 return {"error": f"Target '{target}' does not exist"}
             
-            backend = self.schema_registry[target]['backend']
+            if self.schema_registry[target]['backend'] == 'mysql':
+                with self._mysql() as (conn, cursor):
+                    cursor.execute(*_update_sql(node))
+                    conn.commit()
+                    return {"status": "success", "updated": cursor.rowcount}
+            
+            mongo_filter = self._parse_condition(node.condition)
+            result = self.mongo_db[target].update_many(mongo_filter, _mongo_update(node.set_clause))
+            return {"status": "success", "updated": result.modified_count}
             
-            if backend == 'mysql':
-                update_sql = f"UPDATE {target} SET {set_clause} WHERE {condition}"
-                self.mysql_cursor.execute(update_sql)
-                self.mysql_conn.commit()
-                return {"status": "success", "updated": self.mysql_cursor.rowcount}
-            else:
-                parts = set_clause.split('=')
-                field = parts[0].strip()
-                value = parts[1].strip().strip('"\'')
-                try:
-                    value = float(value) if '.' in value else int(value)
-                except:
-                    pass
-                mongo_filter = self._parse_condition(condition)
-                result = self.mongo_db[target].update_many(mongo_filter, {"$set": {field: value}})
-                return {"status": "success", "updated": result.modified_count}
-                
         except Exception as e:
             return {"error": str(e)}
     
-    def _remove_data(self, query: str) -> Dict:
+    def _remove_data(self, node: RemoveData) -> Dict:
         """REMOVE FROM target WHERE condition"""
         try:
-            match = re.search(r'REMOVE FROM (\w+) WHERE\s+(.*)', query, re.IGNORECASE)
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            target, condition = match.groups()
-            
+            target = node.target
             if target not in self.schema_registry:
                 return {"error": f"Target '{target}' does not exist"}
             
-            backend = self.schema_registry[target]['backend']
+            if self.schema_registry[target]['backend'] == 'mysql':
+                with self._mysql() as (conn, cursor):
+                    cursor.execute(*_delete_sql(node))
+                    conn.commit()
+                    return {"status": "success", "deleted": cursor.rowcount}
+            
+            result = self.mongo_db[target].delete_many(self._parse_condition(node.condition))
+            return {"status": "success", "deleted": result.deleted_count}
             
-            if backend == 'mysql':
-                delete_sql = f"DELETE FROM {target} WHERE {condition}"
-                self.mysql_cursor.execute(delete_sql)
-                self.mysql_conn.commit()
-                return {"status": "success", "deleted": self.mysql_cursor.rowcount}
-            else:
-                mongo_filter = self._parse_condition(condition)
-                result = self.mongo_db[target].delete_many(mongo_filter)
-                return {"status": "success", "deleted": result.deleted_count}
-                
         except Exception as e:
             return {"error": str(e)}
     
-    def _show_tables(self) -> Dict:
+    def _show_tables(self, node: ShowTables) -> Dict:
         """Show all tables"""
-        tables = [name for name, info in self.schema_registry.items() 
+        tables = [name for name, info in list(self.schema_registry.items())
                  if info.get('backend') == 'mysql']
         return {"status": "success", "tables": tables, "count": len(tables)}
     
-    def _show_collections(self) -> Dict:
+    def _show_collections(self, node: ShowCollections) -> Dict:
         """Show all collections"""
-        collections = [name for name, info in self.schema_registry.items() 
+        collections = [name for name, info in list(self.schema_registry.items())
                       if info.get('backend') == 'mongodb']
         return {"status": "success", "collections": collections, "count": len(collections)}
     
-    def _drop(self, query: str) -> Dict:
+    def _drop(self, node: Drop) -> Dict:
         """DROP target"""
         try:
-            match = re.search(r'DROP (\w+)', query, re.IGNORECASE)
-            if not match:
-                return {"error": "Invalid syntax"}
-            
-            target = match.group(1)
+            target = node.target
             if target not in self.schema_registry:
                 return {"error": f"Target '{target}' does not exist"}
             
             backend = self.schema_registry[target]['backend']
             
             if backend == 'mysql':
-                self.mysql_cursor.execute(f"DROP TABLE {target}")
-                self.mysql_conn.commit()
+                with self._mysql() as (conn, cursor):
+                    cursor.execute(f"DROP TABLE {target}")
+                    cursor.execute(UNROUTE_SQL['message_table'], (target,))
+                    conn.commit()
             else:
                 self.mongo_db[target].drop()
+                if self.mysql_pool is not None:
+                    with self._mysql() as (conn, cursor):
+                        cursor.execute(UNROUTE_SQL['sequence_collection'], (target,))
+                        conn.commit()
             
-            del self.schema_registry[target]
+            self._unregister(target)
             return {"status": "success"}
             
         except Exception as e:
@@ -4456,14 +5825,15 @@ class DNACryptDB:
     
     def close(self):
         """Close all database connections"""
-        if self.mysql_cursor:
-            self.mysql_cursor.close()
-        if self.mysql_conn:
-            self.mysql_conn.close()
-        if self.mongo_client:
-            self.mongo_client.close()
-        if self.neo4j_driver:
-            self.neo4j_driver.close()
-        
-        if self.verbose:
-            print("✓ All database connections closed")
+        if self._mysql_pool is not None:
+            # Closes the idle pooled connections
+            self._mysql_pool._remove_connections()
+        if self._mongo_client:
+            self._mongo_client.close()
+        if self._neo4j_driver:
+            self._neo4j_driver.close()
+        # Lookups that timed out finish in the background
+        self._fanout.shutdown(wait=False)
+        
+        self._logger.info("✓ All database connections closed")
+        _release_logger(self._logger)
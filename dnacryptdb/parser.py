@@ -0,0 +1,1124 @@
+"""
+DNACryptDB Query Parser
+Tokenizer and recursive-descent parser for the .dnacdb language
+Turns each statement into a typed node that the engine handlers consume
+"""
+
+import json
+import re
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+class ParseError(ValueError):
+    """Raised when a statement does not match the .dnacdb grammar"""
+
+
+# ============================================================================
+# Tokenizer
+# ============================================================================
+
+WORD = 'WORD'
+STRING = 'STRING'
+NUMBER = 'NUMBER'
+VAR = 'VAR'
+OP = 'OP'
+EOF = 'EOF'
+
+_TOKEN_RE = re.compile(r'''
+      (?P<ws>\s+)
+    | (?P<string>"[^"\\]*(?:\\.[^"\\]*)*"|'[^'\\]*(?:\\.[^'\\]*)*')
+    | (?P<var>\$\{[^}]*\}|\$\w+(?:\.\w+)*)
+    | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?(?!\w))
+    | (?P<word>\w+)
+    | (?P<op>>=|<=|!=|<>|\S)
+''', re.VERBOSE)
+
+_ESCAPE_RE = re.compile(r'\\(u[0-9a-fA-F]{4}|.)', re.DOTALL)
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f'}
+
+
+class Token(NamedTuple):
+    """A lexical token with its decoded value and source offset"""
+    kind: str
+    text: str
+    value: Any
+    pos: int
+
+
+def _unescape(match) -> str:
+    """Decode one backslash escape inside a string literal"""
+    code = match.group(1)
+    if len(code) == 5:
+        return chr(int(code[1:], 16))
+    return _ESCAPES.get(code, code)
+
+
+def _decode_string(text: str) -> str:
+    """Strip the quotes from a string literal and resolve escapes"""
+    body = text[1:-1]
+    if '\\' in body:
+        body = _ESCAPE_RE.sub(_unescape, body)
+    return body
+
+
+def _is_float(text: str) -> bool:
+    return '.' in text or 'e' in text or 'E' in text
+
+
+def _decode_number(text: str):
+    """Convert a numeric literal to int or float"""
+    return float(text) if _is_float(text) else int(text)
+
+
+def tokenize(text: str) -> List[Token]:
+    """Split a statement into tokens, ending with an EOF token"""
+    tokens = []
+    for match in _TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == 'ws':
+            continue
+
+        raw = match.group()
+        if kind == 'string':
+            tokens.append(Token(STRING, raw, _decode_string(raw), match.start()))
+        elif kind == 'number':
+            tokens.append(Token(NUMBER, raw, _decode_number(raw), match.start()))
+        elif kind == 'word':
+            tokens.append(Token(WORD, raw, raw, match.start()))
+        elif kind == 'var':
+            tokens.append(Token(VAR, raw, raw.strip('${}'), match.start()))
+        else:
+            tokens.append(Token(OP, raw, raw, match.start()))
+
+    tokens.append(Token(EOF, '', None, len(text)))
+    return tokens
+
+
+# ============================================================================
+# Statement Nodes
+# ============================================================================
+
+class Statement:
+    """Base class for all parsed .dnacdb statements"""
+
+
+# Graph operations (Neo4j)
+
+@dataclass
+class CreateUser(Statement):
+    """CREATE USER {...}"""
+    props: Dict[str, Any]
+
+
+@dataclass
+class CreateUsers(Statement):
+    """CREATE USERS [{...}, ...]"""
+    rows: List[Dict[str, Any]]
+
+
+@dataclass
+class CreateMessageNode(Statement):
+    """CREATE MESSAGE NODE {...}"""
+    props: Dict[str, Any]
+
+
+@dataclass
+class RelateSent(Statement):
+    """RELATE USER "email" SENT MESSAGE "id" AT "timestamp\""""
+    email: str
+    message_id: str
+    timestamp: str
+
+
+@dataclass
+class RelateTrust(Statement):
+    """RELATE USER "email" TRUSTS USER "email" LEVEL n"""
+    email: str
+    other_email: str
+    level: int
+
+
+@dataclass
+class RelateMany(Statement):
+    """RELATE MANY [{"from": "email", "type": "TRUSTS", "to": "email", ...}, ...]"""
+    rows: List[Dict[str, Any]]
+
+
+@dataclass
+class FindPath(Statement):
+    """FIND PATH FROM "email" TO "email" [MAX n]"""
+    start: str
+    end: str
+    max_depth: int = 5
+
+
+@dataclass
+class FindPattern(Statement):
+    """FIND PATTERN users WHO accessed MORE THAN n messages"""
+    pattern: Optional[str]
+    threshold: int = 100
+
+
+@dataclass
+class DetectAnomaly(Statement):
+    """DETECT ANOMALY IN access patterns"""
+
+
+@dataclass
+class TrackAccess(Statement):
+    """TRACK ACCESS BY "email" TO MESSAGE "id" ACTION "action" SUCCESS true"""
+    email: str
+    message_id: str
+    action: str
+    success: bool
+
+
+@dataclass
+class ShowGraph(Statement):
+    """SHOW GRAPH stats"""
+
+
+# DNACrypt-specific syntax
+
+@dataclass
+class CreateTableForRole(Statement):
+    """CREATE TABLE type FOR ROLE role [AGE group]"""
+    table_type: str
+    role: str
+    age_group: Optional[str] = None
+
+
+@dataclass
+class CreateCollectionForRole(Statement):
+    """CREATE COLLECTION type FOR ROLE role"""
+    coll_type: str
+    role: str
+
+
+@dataclass
+class SendMessage(Statement):
+    """SEND MESSAGE TO table {...}"""
+    table: str
+    data: Dict[str, Any]
+
+
+@dataclass
+class SendMessages(Statement):
+    """SEND MESSAGES TO table [{...}, ...]"""
+    table: str
+    rows: List[Dict[str, Any]]
+
+
+@dataclass
+class AddAlgorithm(Statement):
+    """ADD ALGORITHM TO table {...}"""
+    table: str
+    data: Dict[str, Any]
+
+
+@dataclass
+class AddKey(Statement):
+    """ADD KEY TO table {...}"""
+    table: str
+    data: Dict[str, Any]
+
+
+@dataclass
+class AddHash(Statement):
+    """ADD HASH TO table {...}"""
+    table: str
+    data: Dict[str, Any]
+
+
+@dataclass
+class StoreSequence(Statement):
+    """STORE SEQUENCE IN collection {...}"""
+    collection: str
+    data: Dict[str, Any]
+
+
+@dataclass
+class StoreSequences(Statement):
+    """STORE SEQUENCES IN collection [{...}, ...]"""
+    collection: str
+    rows: List[Dict[str, Any]]
+
+
+@dataclass
+class GetMessage(Statement):
+    """GET MESSAGE FROM table WHERE field = value"""
+    table: str
+    field: str
+    value: Any
+
+
+@dataclass
+class GetSequence(Statement):
+    """GET SEQUENCE FROM collection WHERE link_id = value"""
+    collection: str
+    link_id: Any
+
+
+@dataclass
+class LinkData(Statement):
+    """LINK DATA WHERE link_id = value"""
+    link_id: Any
+
+
+@dataclass
+class Join(Statement):
+    """JOIN table WITH collection ON field [USING strategy] [WHERE condition]"""
+    table: str
+    collection: str
+    field: str
+    where: Optional[str] = None
+    strategy: Optional[str] = None
+
+
+@dataclass
+class ExplainJoin(Join):
+    """EXPLAIN JOIN table WITH collection ON field [USING strategy] [WHERE condition]"""
+
+
+@dataclass
+class ListMessages(Statement):
+    """LIST MESSAGES FROM table [WHERE condition]"""
+    table: str
+    where: Optional[str] = None
+
+
+# Legacy syntax
+
+@dataclass
+class MakeTable(Statement):
+    """MAKE TABLE name WITH (field:type, ...)"""
+    table: str
+    fields: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class MakeCollection(Statement):
+    """MAKE COLLECTION name"""
+    collection: str
+
+
+@dataclass
+class PutData(Statement):
+    """PUT INTO target DATA {...}"""
+    target: str
+    data: Dict[str, Any]
+
+
+@dataclass
+class FetchData(Statement):
+    """FETCH FROM source WHERE condition | ALL"""
+    source: str
+    condition: Optional[str] = None
+
+
+@dataclass
+class ChangeData(Statement):
+    """CHANGE IN target SET field=value WHERE condition"""
+    target: str
+    set_clause: str
+    condition: str
+
+
+@dataclass
+class RemoveData(Statement):
+    """REMOVE FROM target WHERE condition"""
+    target: str
+    condition: str
+
+
+@dataclass
+class ShowTables(Statement):
+    """SHOW TABLES"""
+
+
+@dataclass
+class ShowCollections(Statement):
+    """SHOW COLLECTIONS"""
+
+
+@dataclass
+class Drop(Statement):
+    """DROP target"""
+    target: str
+
+
+# Transactions (MySQL)
+
+@dataclass
+class Begin(Statement):
+    """BEGIN [TRANSACTION]"""
+
+
+@dataclass
+class Commit(Statement):
+    """COMMIT [TRANSACTION]"""
+
+
+@dataclass
+class Rollback(Statement):
+    """ROLLBACK [TRANSACTION]"""
+
+
+# ============================================================================
+# Statement Shapes
+# ============================================================================
+
+class Param(NamedTuple):
+    """Placeholder for the n-th literal of a statement shape"""
+    index: int
+
+
+class Var(NamedTuple):
+    """Placeholder for a named $parameter, resolved from execute() params"""
+    name: str
+    kind: str = 'value'
+
+
+class Raw(NamedTuple):
+    """Raw source text (e.g. a WHERE clause) with literal slots"""
+    parts: Tuple[Any, ...]
+    strip_quotes: bool = False
+
+
+class Clause(str):
+    """
+    Bound WHERE/SET text whose $parameters go to the driver separately.
+    The string itself has every value inlined (for MongoDB conditions and
+    messages); segments is the SQL around each value and args the values.
+    """
+
+    def __new__(cls, text: str, segments: Tuple[str, ...], args: Tuple[Any, ...]):
+        clause = super().__new__(cls, text)
+        clause.segments = segments
+        clause.args = args
+        return clause
+
+
+def _literal_kind(tok: Token) -> str:
+    if tok.kind == STRING:
+        return '?s'
+    return '?f' if _is_float(tok.text) else '?i'
+
+
+def normalize(tokens: List[Token]) -> Tuple[str, List[Token]]:
+    """
+    Reduce a token stream to its shape
+    
+    Returns the shape key - the statement text with every string and number
+    literal replaced by a typed '?' - and the literal tokens in order.
+    Statements that differ only in their literals share a key.
+    """
+    key = []
+    literals = []
+    for tok in tokens:
+        if tok.kind == STRING or tok.kind == NUMBER:
+            key.append(_literal_kind(tok))
+            literals.append(tok)
+        else:
+            key.append(tok.text)
+    return ' '.join(key), literals
+
+
+def _template_tokens(tokens: List[Token]) -> List[Token]:
+    """Replace literal values with Param placeholders, numbered in order"""
+    templated = []
+    index = 0
+    for tok in tokens:
+        if tok.kind == STRING or tok.kind == NUMBER:
+            tok = tok._replace(value=Param(index))
+            index += 1
+        templated.append(tok)
+    return templated
+
+
+_FIELD_NAMES = {}
+_IDENTIFIER_RE = re.compile(r'\w+')
+
+
+def _lookup(params: Dict[str, Any], name: str):
+    """Resolve a parameter name, following dotted paths into dicts and lists"""
+    value = params
+    for part in name.split('.'):
+        try:
+            value = value[int(part)] if isinstance(value, (list, tuple)) else value[part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise ParseError(f"Missing parameter: ${name}")
+    return value
+
+
+def _resolve_var(var: Var, params: Dict[str, Any]):
+    """Look up a parameter and check it fits the place it is used"""
+    value = _lookup(params or {}, var.name)
+
+    if var.kind == 'identifier':
+        if not isinstance(value, str) or not _IDENTIFIER_RE.fullmatch(value):
+            raise ParseError(f"Invalid identifier for ${var.name}: {value!r}")
+    elif var.kind == 'string':
+        if not isinstance(value, str):
+            raise ParseError(f"Expected a string for ${var.name}")
+    elif var.kind == 'integer':
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ParseError(f"Expected an integer for ${var.name}")
+    elif var.kind == 'bool':
+        if not isinstance(value, bool):
+            raise ParseError(f"Expected true or false for ${var.name}")
+    elif var.kind == 'object':
+        if not isinstance(value, dict):
+            raise ParseError(f"Expected an object for ${var.name}")
+    elif var.kind == 'array':
+        if not isinstance(value, (list, tuple)):
+            raise ParseError(f"Expected an array for ${var.name}")
+    return value
+
+
+def _render_sql(value) -> str:
+    """Render a parameter value as a literal inside displayed condition text"""
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def _bind_value(value, literals: List[Token], params: Dict[str, Any]):
+    if isinstance(value, Param):
+        return literals[value.index].value
+    if isinstance(value, Var):
+        return _resolve_var(value, params)
+    if isinstance(value, Raw):
+        return _bind_raw(value, literals, params)
+    if isinstance(value, dict):
+        return {_bind_value(k, literals, params): _bind_value(v, literals, params)
+                for k, v in value.items()}
+    if isinstance(value, list):
+        return [_bind_value(item, literals, params) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_bind_value(item, literals, params) for item in value)
+    return value
+
+
+def _bind_raw(raw: Raw, literals: List[Token], params: Dict[str, Any]):
+    """Rebuild raw source text; a condition with $parameters becomes a Clause"""
+    text = []
+    segments = ['']
+    args = []
+    for part in raw.parts:
+        if isinstance(part, Var):
+            value = _resolve_var(part, params)
+            text.append(_render_sql(value))
+            segments.append('')
+            args.append(value if value is None or isinstance(value, (int, float)) else str(value))
+        else:
+            part = part if isinstance(part, str) else literals[part.index].text
+            text.append(part)
+            segments[-1] += part
+    text = ''.join(text)
+    if raw.strip_quotes:
+        return text.strip().strip('"\'')
+    if not args:
+        return text.strip()
+    segments[0] = segments[0].lstrip()
+    segments[-1] = segments[-1].rstrip()
+    return Clause(text.strip(), tuple(segments), tuple(args))
+
+
+def bind(template: Statement, literals: List[Token],
+         params: Dict[str, Any] = None) -> Statement:
+    """Fill a statement template with the literals and $parameters of a call"""
+    node_type = type(template)
+    names = _FIELD_NAMES.get(node_type)
+    if names is None:
+        names = _FIELD_NAMES[node_type] = [f.name for f in fields(node_type)]
+    return node_type(*[_bind_value(getattr(template, name), literals, params)
+                       for name in names])
+
+
+# ============================================================================
+# Parser
+# ============================================================================
+
+# What may follow a statement's keywords on the resolve() fast path
+_KEYWORD_END = frozenset(('', ' ', '\t', '\r', '\n', '{'))
+
+
+def _build_dispatch(statements) -> Dict[str, List]:
+    """
+    Index statement entries on their leading keyword, longest entries
+    first. Each entry holds the remaining keywords, the keywords as one
+    single-spaced prefix, and what resolve() returns for it.
+    """
+    table = {}
+    for keywords, node_type, method in statements:
+        table.setdefault(keywords[0], []).append(
+            (list(keywords[1:]), ' '.join(keywords), (node_type, len(keywords), method))
+        )
+    for entries in table.values():
+        entries.sort(key=lambda entry: len(entry[0]), reverse=True)
+    return table
+
+
+class Parser:
+    """Recursive-descent parser for a single .dnacdb statement"""
+
+    # Statement keywords -> node type and the method that parses the rest.
+    # Indexed once per class so resolving a verb only compares the few
+    # entries that share its leading keyword.
+    _STATEMENTS = (
+        # Graph operations (Neo4j)
+        (('CREATE', 'USER'), CreateUser, '_create_user'),
+        (('CREATE', 'USERS'), CreateUsers, '_bulk_rows'),
+        (('CREATE', 'MESSAGE', 'NODE'), CreateMessageNode, '_create_message_node'),
+        (('RELATE',), RelateSent, '_relate'),
+        (('RELATE', 'MANY'), RelateMany, '_bulk_rows'),
+        (('FIND', 'PATH'), FindPath, '_find_path'),
+        (('FIND', 'PATTERN'), FindPattern, '_find_pattern'),
+        (('DETECT', 'ANOMALY'), DetectAnomaly, '_detect_anomaly'),
+        (('TRACK', 'ACCESS'), TrackAccess, '_track_access'),
+        (('SHOW', 'GRAPH'), ShowGraph, '_show_graph'),
+        # DNACrypt-specific syntax
+        (('CREATE', 'TABLE'), CreateTableForRole, '_create_table_for_role'),
+        (('CREATE', 'COLLECTION'), CreateCollectionForRole, '_create_collection_for_role'),
+        (('SEND', 'MESSAGE'), SendMessage, '_send_message'),
+        (('SEND', 'MESSAGES'), SendMessages, '_send_messages'),
+        (('ADD', 'ALGORITHM'), AddAlgorithm, '_add_record'),
+        (('ADD', 'KEY'), AddKey, '_add_record'),
+        (('ADD', 'HASH'), AddHash, '_add_record'),
+        (('STORE', 'SEQUENCE'), StoreSequence, '_store_sequence'),
+        (('STORE', 'SEQUENCES'), StoreSequences, '_store_sequences'),
+        (('GET', 'MESSAGE'), GetMessage, '_get_message'),
+        (('GET', 'SEQUENCE'), GetSequence, '_get_sequence'),
+        (('LINK', 'DATA'), LinkData, '_link_data'),
+        (('JOIN',), Join, '_join'),
+        (('EXPLAIN', 'JOIN'), ExplainJoin, '_join'),
+        (('LIST', 'MESSAGES'), ListMessages, '_list_messages'),
+        # Legacy syntax
+        (('MAKE', 'TABLE'), MakeTable, '_make_table'),
+        (('MAKE', 'COLLECTION'), MakeCollection, '_make_collection'),
+        (('PUT', 'INTO'), PutData, '_put_data'),
+        (('FETCH', 'FROM'), FetchData, '_fetch_data'),
+        (('CHANGE', 'IN'), ChangeData, '_change_data'),
+        (('REMOVE', 'FROM'), RemoveData, '_remove_data'),
+        (('SHOW', 'TABLES'), ShowTables, '_show_tables'),
+        (('SHOW', 'COLLECTIONS'), ShowCollections, '_show_collections'),
+        (('DROP',), Drop, '_drop'),
+        # Transactions
+        (('BEGIN',), Begin, '_transaction'),
+        (('COMMIT',), Commit, '_transaction'),
+        (('ROLLBACK',), Rollback, '_transaction'),
+    )
+    _DISPATCH = _build_dispatch(_STATEMENTS)
+
+    def __init__(self, text: str, tokens: List[Token] = None):
+        self.text = text
+        self.tokens = tokens if tokens is not None else tokenize(text)
+        self.pos = 0
+
+    @classmethod
+    def resolve(cls, text: str):
+        """Return (node type, keyword count, parse method) for a statement, or None"""
+        # Fast path: keywords written with single spaces, compared as one prefix
+        head = text[:32].upper()
+        for keywords, prefix, entry in cls._DISPATCH.get(head.partition(' ')[0], ()):
+            if not keywords:
+                return entry
+            if head.startswith(prefix):
+                if head[len(prefix):len(prefix) + 1] in _KEYWORD_END:
+                    return entry
+                break
+
+        words = text[:64].upper().partition('{')[0].rstrip(';').split(None, 3)
+        if not words:
+            return None
+
+        for keywords, prefix, entry in cls._DISPATCH.get(words[0], ()):
+            if words[1:len(keywords) + 1] == keywords:
+                return entry
+
+        return None
+
+    def parse(self) -> Statement:
+        """Parse the whole statement into a node"""
+        entry = self.resolve(self.text)
+        if entry is None:
+            raise ParseError("Unknown command")
+
+        node_type, keyword_count, method = entry
+        self.pos = keyword_count
+        return getattr(self, method)(node_type)
+
+    # ------------------------------------------------------------------------
+    # Token helpers
+    # ------------------------------------------------------------------------
+
+    def _peek(self) -> Token:
+        return self.tokens[self.pos]
+
+    def _next(self) -> Token:
+        tok = self.tokens[self.pos]
+        if tok.kind != EOF:
+            self.pos += 1
+        return tok
+
+    def _at(self, *keywords: str) -> bool:
+        """Check whether the next tokens are the given keywords"""
+        for offset, keyword in enumerate(keywords):
+            tok = self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+            if tok.kind != WORD or tok.text.upper() != keyword:
+                return False
+        return True
+
+    def _accept(self, *keywords: str) -> bool:
+        """Consume the given keywords if they come next"""
+        if self._at(*keywords):
+            self.pos += len(keywords)
+            return True
+        return False
+
+    def _expect(self, *keywords: str, error: str = "Invalid syntax"):
+        if not self._accept(*keywords):
+            raise ParseError(error)
+
+    def _op(self, symbol: str, error: str = "Invalid syntax"):
+        tok = self._next()
+        if tok.kind != OP or tok.text != symbol:
+            raise ParseError(error)
+
+    def _identifier(self, error: str = "Invalid syntax") -> str:
+        tok = self._next()
+        if tok.kind == VAR:
+            return Var(tok.value, 'identifier')
+        if tok.kind != WORD:
+            raise ParseError(error)
+        return tok.value
+
+    def _string(self, error: str = "Invalid syntax") -> str:
+        tok = self._next()
+        if tok.kind == VAR:
+            return Var(tok.value, 'string')
+        if tok.kind != STRING:
+            raise ParseError(error)
+        return tok.value
+
+    def _integer(self, error: str = "Invalid syntax") -> int:
+        tok = self._next()
+        if tok.kind == VAR:
+            return Var(tok.value, 'integer')
+        if tok.kind != NUMBER or _is_float(tok.text):
+            raise ParseError(error)
+        return tok.value
+
+    def _end(self, error: str = "Invalid syntax"):
+        """Require the end of the statement (an optional trailing ';' is allowed)"""
+        tok = self._peek()
+        if tok.kind == OP and tok.text == ';':
+            self.pos += 1
+        if self._peek().kind != EOF:
+            raise ParseError(error)
+
+    def _source(self, start: int, end: int, strip_quotes: bool = False):
+        """
+        Raw source text of tokens[start:end]
+        
+        Returns a plain string, or a Raw template when the span holds
+        Param or $parameter slots so the text can be rebuilt per binding.
+        """
+        begin = self.tokens[start].pos
+        finish = self.tokens[end].pos
+        parts = []
+        for tok in self.tokens[start:end]:
+            if isinstance(tok.value, Param) or tok.kind == VAR:
+                parts.append(self.text[begin:tok.pos])
+                parts.append(tok.value if tok.kind != VAR else Var(tok.value))
+                begin = tok.pos + len(tok.text)
+        if not parts:
+            text = self.text[begin:finish].strip()
+            return text.strip('"\'') if strip_quotes else text
+        parts.append(self.text[begin:finish])
+        return Raw(tuple(parts), strip_quotes)
+
+    def _rest(self, strip_quotes: bool = False):
+        """Consume everything left as raw source text"""
+        start = self.pos
+        self.pos = len(self.tokens) - 1
+        return self._source(start, self.pos, strip_quotes)
+
+    def _raw_until(self, keyword: str):
+        """Consume raw source text up to (not including) a keyword"""
+        start = self.pos
+        while not self._at(keyword):
+            if self._next().kind == EOF:
+                raise ParseError("Invalid syntax")
+        return self._source(start, self.pos)
+
+    def _comparison_value(self):
+        """
+        Value on the right of 'field = value' - a quoted string, a
+        $parameter, or the raw remainder as text. Unquoted values stay
+        strings, so an id like 550e8400 is not read as a number.
+        """
+        tok = self._peek()
+        if tok.kind in (STRING, VAR) and self.tokens[self.pos + 1].kind == EOF:
+            self.pos += 1
+            return tok.value if tok.kind != VAR else Var(tok.value)
+        return self._rest(strip_quotes=True)
+
+    # ------------------------------------------------------------------------
+    # Literals (JSON, plus single quotes and Python True/False/None)
+    # ------------------------------------------------------------------------
+
+    def _literal(self):
+        tok = self._next()
+        if tok.kind in (STRING, NUMBER):
+            return tok.value
+        if tok.kind == VAR:
+            return Var(tok.value)
+        if tok.kind == OP and tok.text == '{':
+            return self._object_body()
+        if tok.kind == OP and tok.text == '[':
+            return self._array_body()
+        if tok.kind == WORD:
+            word = tok.text.lower()
+            if word == 'true':
+                return True
+            if word == 'false':
+                return False
+            if word in ('null', 'none'):
+                return None
+        raise ParseError(f"Invalid JSON: unexpected {tok.text or 'end of input'!r} at position {tok.pos}")
+
+    def _object(self) -> Dict[str, Any]:
+        """An object literal, a $parameter, or - when omitted - $payload"""
+        tok = self._next()
+        if tok.kind == VAR:
+            return Var(tok.value, 'object')
+        if tok.kind == EOF or (tok.text == ';' and self._peek().kind == EOF):
+            return Var('payload', 'object')
+        if tok.kind != OP or tok.text != '{':
+            raise ParseError("Invalid syntax")
+        return self._object_body()
+
+    def _array(self) -> List[Any]:
+        """An array literal, a $parameter, or - when omitted - $payload"""
+        tok = self._next()
+        if tok.kind == VAR:
+            return Var(tok.value, 'array')
+        if tok.kind == EOF or (tok.text == ';' and self._peek().kind == EOF):
+            return Var('payload', 'array')
+        if tok.kind != OP or tok.text != '[':
+            raise ParseError("Invalid syntax")
+        return self._array_body()
+
+    def _object_body(self) -> Dict[str, Any]:
+        data = {}
+        if self._peek().text == '}':
+            self.pos += 1
+            return data
+
+        while True:
+            key = self._next()
+            if key.kind != STRING:
+                raise ParseError(f"Invalid JSON: expected property name at position {key.pos}")
+            self._op(':', f"Invalid JSON: expected ':' at position {self._peek().pos}")
+            data[key.value] = self._literal()
+
+            tok = self._next()
+            if tok.text == '}':
+                return data
+            if tok.text != ',':
+                raise ParseError(f"Invalid JSON: expected ',' or '}}' at position {tok.pos}")
+
+    def _array_body(self) -> List[Any]:
+        items = []
+        if self._peek().text == ']':
+            self.pos += 1
+            return items
+
+        while True:
+            items.append(self._literal())
+            tok = self._next()
+            if tok.text == ']':
+                return items
+            if tok.text != ',':
+                raise ParseError(f"Invalid JSON: expected ',' or ']' at position {tok.pos}")
+
+    # ------------------------------------------------------------------------
+    # Graph operations (Neo4j)
+    # ------------------------------------------------------------------------
+
+    def _create_user(self, node_type):
+        props = self._object()
+        self._end()
+        return node_type(props)
+
+    def _bulk_rows(self, node_type):
+        rows = self._array()
+        self._end()
+        return node_type(rows)
+
+    def _create_message_node(self, node_type):
+        props = self._object()
+        self._end()
+        return node_type(props)
+
+    def _relate(self, node_type):
+        error = "Invalid RELATE syntax"
+        self._expect('USER', error=error)
+        email = self._string(error)
+
+        if self._accept('SENT', 'MESSAGE'):
+            message_id = self._string(error)
+            self._expect('AT', error=error)
+            timestamp = self._string(error)
+            self._end(error)
+            return RelateSent(email, message_id, timestamp)
+
+        if self._accept('TRUSTS', 'USER'):
+            other_email = self._string(error)
+            self._expect('LEVEL', error=error)
+            level = self._integer(error)
+            self._end(error)
+            return RelateTrust(email, other_email, level)
+
+        raise ParseError(error)
+
+    def _find_path(self, node_type):
+        self._expect('FROM')
+        start = self._string()
+        self._expect('TO')
+        end = self._string()
+        max_depth = self._integer() if self._accept('MAX') else 5
+        self._end()
+        return node_type(start, end, max_depth)
+
+    def _find_pattern(self, node_type):
+        while self._peek().kind != EOF:
+            if self._accept('ACCESSED', 'MORE', 'THAN'):
+                tok = self._peek()
+                if tok.kind == NUMBER:
+                    threshold = tok.value
+                elif tok.kind == VAR:
+                    threshold = Var(tok.value, 'integer')
+                else:
+                    threshold = 100
+                self._rest()
+                return node_type('excessive_access', threshold)
+            self._next()
+        return node_type(None)
+
+    def _detect_anomaly(self, node_type):
+        self._rest()
+        return node_type()
+
+    def _track_access(self, node_type):
+        self._expect('BY')
+        email = self._string()
+        self._expect('TO', 'MESSAGE')
+        message_id = self._string()
+        self._expect('ACTION')
+        action = self._string()
+        self._expect('SUCCESS')
+        tok = self._next()
+        if tok.kind == VAR:
+            success = Var(tok.value, 'bool')
+        elif tok.kind == WORD:
+            success = tok.value.lower() == 'true'
+        else:
+            raise ParseError("Invalid syntax")
+        self._end()
+        return node_type(email, message_id, action, success)
+
+    def _show_graph(self, node_type):
+        self._rest()
+        return node_type()
+
+    # ------------------------------------------------------------------------
+    # DNACrypt-specific syntax
+    # ------------------------------------------------------------------------
+
+    def _create_table_for_role(self, node_type):
+        table_type = self._identifier()
+        self._expect('FOR', 'ROLE', error="Unknown command")
+        role = self._identifier()
+        age_group = self._identifier() if self._accept('AGE') else None
+        self._end()
+        return node_type(table_type, role, age_group)
+
+    def _create_collection_for_role(self, node_type):
+        coll_type = self._identifier()
+        self._expect('FOR', 'ROLE', error="Unknown command")
+        role = self._identifier()
+        self._end()
+        return node_type(coll_type, role)
+
+    def _send_message(self, node_type):
+        self._expect('TO')
+        table = self._identifier()
+        data = self._object()
+        self._end()
+        return node_type(table, data)
+
+    def _send_messages(self, node_type):
+        self._expect('TO')
+        table = self._identifier()
+        rows = self._array()
+        self._end()
+        return node_type(table, rows)
+
+    def _add_record(self, node_type):
+        self._expect('TO')
+        table = self._identifier()
+        data = self._object()
+        self._end()
+        return node_type(table, data)
+
+    def _store_sequence(self, node_type):
+        self._expect('IN')
+        collection = self._identifier()
+        data = self._object()
+        self._end()
+        return node_type(collection, data)
+
+    def _store_sequences(self, node_type):
+        self._expect('IN')
+        collection = self._identifier()
+        rows = self._array()
+        self._end()
+        return node_type(collection, rows)
+
+    def _get_message(self, node_type):
+        self._expect('FROM')
+        table = self._identifier()
+        self._expect('WHERE')
+        field_name = self._identifier()
+        self._op('=')
+        return node_type(table, field_name, self._comparison_value())
+
+    def _get_sequence(self, node_type):
+        self._expect('FROM')
+        collection = self._identifier()
+        self._expect('WHERE', 'LINK_ID')
+        self._op('=')
+        return node_type(collection, self._comparison_value())
+
+    def _link_data(self, node_type):
+        self._expect('WHERE', 'LINK_ID')
+        self._op('=')
+        return node_type(self._comparison_value())
+
+    def _join(self, node_type):
+        error = "Invalid JOIN syntax"
+        table = self._identifier(error)
+        self._expect('WITH', error=error)
+        collection = self._identifier(error)
+        self._expect('ON', error=error)
+        join_field = self._identifier(error)
+        strategy = self._identifier(error) if self._accept('USING') else None
+        where = self._rest() if self._accept('WHERE') else None
+        self._end(error)
+        return node_type(table, collection, join_field, where, strategy)
+
+    def _list_messages(self, node_type):
+        self._expect('FROM')
+        table = self._identifier()
+        where = self._rest() if self._accept('WHERE') else None
+        self._end()
+        return node_type(table, where)
+
+    # ------------------------------------------------------------------------
+    # Legacy syntax
+    # ------------------------------------------------------------------------
+
+    def _make_table(self, node_type):
+        table = self._identifier()
+        self._expect('WITH')
+        self._op('(')
+
+        fields = []
+        while True:
+            name = self._next()
+            if name.text == ')' and not fields:
+                break
+            if self._peek().text == ':':
+                self.pos += 1
+                fields.append((name.text, self._identifier().lower()))
+
+            tok = self._next()
+            if tok.text == ')':
+                break
+            if tok.text != ',':
+                raise ParseError("Invalid syntax")
+
+        self._end()
+        return node_type(table, fields)
+
+    def _make_collection(self, node_type):
+        collection = self._identifier()
+        self._end()
+        return node_type(collection)
+
+    def _put_data(self, node_type):
+        target = self._identifier()
+        self._expect('DATA')
+        data = self._object()
+        self._end()
+        return node_type(target, data)
+
+    def _fetch_data(self, node_type):
+        source = self._identifier()
+        if self._accept('ALL'):
+            self._end()
+            return node_type(source)
+        self._expect('WHERE')
+        return node_type(source, self._rest())
+
+    def _change_data(self, node_type):
+        target = self._identifier()
+        self._expect('SET')
+        set_clause = self._raw_until('WHERE')
+        self._expect('WHERE')
+        return node_type(target, set_clause, self._rest())
+
+    def _remove_data(self, node_type):
+        target = self._identifier()
+        self._expect('WHERE')
+        return node_type(target, self._rest())
+
+    def _show_tables(self, node_type):
+        self._end()
+        return node_type()
+
+    def _show_collections(self, node_type):
+        self._end()
+        return node_type()
+
+    def _drop(self, node_type):
+        target = self._identifier()
+        self._end()
+        return node_type(target)
+
+    # ------------------------------------------------------------------------
+    # Transactions
+    # ------------------------------------------------------------------------
+
+    def _transaction(self, node_type):
+        self._accept('TRANSACTION')
+        self._end()
+        return node_type()
+
+
+def compile_template(text: str, tokens: List[Token]) -> Statement:
+    """Parse a statement into a template whose literals are Param slots"""
+    return Parser(text, _template_tokens(tokens)).parse()
+
+
+def parse(text: str, params: Dict[str, Any] = None) -> Statement:
+    """Parse one .dnacdb statement into a typed node"""
+    text = text.strip()
+    tokens = tokenize(text)
+    return bind(compile_template(text, tokens), normalize(tokens)[1], params)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+DNACryptDB Dispatch Micro-Benchmark
+Compares the legacy if/elif dispatcher with the keyword-indexed table
+
+Only statement routing is timed - no backend is contacted, so the
+databases in dnacdb.config.json do not need to be running.
+"""
+
+import sys
+sys.path.append('..')
+
+import timeit
+
+from dnacryptdb.core import DNACryptDB
+from dnacryptdb.parser import Parser
+
+SAMPLES = [
+    'CREATE USER {"email": "alice@dnacrypt.com", "role": "admin"}',
+    'RELATE USER "alice@dnacrypt.com" TRUSTS USER "bob@dnacrypt.com" LEVEL 85',
+    'TRACK ACCESS BY "bob@dnacrypt.com" TO MESSAGE "xyz" ACTION "decrypt" SUCCESS true',
+    'CREATE TABLE messages FOR ROLE admin AGE adult',
+    'SEND MESSAGE TO messages_admin_adult {"content": "hi", "sender": "a", "receiver": "b"}',
+    'STORE SEQUENCE IN sequences_admin {"link_id": "abc", "original": "ATCG"}',
+    'LINK DATA WHERE link_id = "abc"',
+    'JOIN messages_admin_adult WITH sequences_admin ON link_id',
+    'LIST MESSAGES FROM messages_admin_adult',
+    'FETCH FROM users ALL',
+    'SHOW COLLECTIONS',
+    'DROP users',
+]
+
+
+def legacy_resolve(query):
+    """The original execute() routing chain, returning the handler name"""
+    if query.upper().startswith('CREATE USER'):
+        return '_create_user_node'
+    elif query.upper().startswith('CREATE MESSAGE NODE'):
+        return '_create_message_node'
+    elif query.upper().startswith('RELATE'):
+        return '_create_relationship'
+    elif query.upper().startswith('FIND PATH'):
+        return '_find_path'
+    elif query.upper().startswith('FIND PATTERN'):
+        return '_find_pattern'
+    elif query.upper().startswith('DETECT ANOMALY'):
+        return '_detect_anomaly'
+    elif query.upper().startswith('TRACK ACCESS'):
+        return '_track_access'
+    elif query.upper().startswith('SHOW GRAPH'):
+        return '_show_graph'
+    elif query.upper().startswith('CREATE TABLE') and 'FOR ROLE' in query.upper():
+        return '_create_table_for_role'
+    elif query.upper().startswith('CREATE COLLECTION') and 'FOR ROLE' in query.upper():
+        return '_create_collection_for_role'
+    elif query.upper().startswith('SEND MESSAGE'):
+        return '_send_message'
+    elif query.upper().startswith('ADD ALGORITHM'):
+        return '_add_algorithm'
+    elif query.upper().startswith('ADD KEY'):
+        return '_add_key'
+    elif query.upper().startswith('ADD HASH'):
+        return '_add_hash'
+    elif query.upper().startswith('STORE SEQUENCE'):
+        return '_store_sequence'
+    elif query.upper().startswith('GET MESSAGE'):
+        return '_get_message'
+    elif query.upper().startswith('GET SEQUENCE'):
+        return '_get_sequence'
+    elif query.upper().startswith('LINK DATA'):
+        return '_link_data'
+    elif query.upper().startswith('JOIN'):
+        return '_polyglot_join'
+    elif query.upper().startswith('LIST MESSAGES'):
+        return '_list_messages'
+    elif query.upper().startswith('MAKE TABLE'):
+        return '_make_table'
+    elif query.upper().startswith('MAKE COLLECTION'):
+        return '_make_collection'
+    elif query.upper().startswith('PUT INTO'):
+        return '_put_data'
+    elif query.upper().startswith('FETCH FROM'):
+        return '_fetch_data'
+    elif query.upper().startswith('CHANGE IN'):
+        return '_change_data'
+    elif query.upper().startswith('REMOVE FROM'):
+        return '_remove_data'
+    elif query.upper().startswith('SHOW TABLES'):
+        return '_show_tables'
+    elif query.upper().startswith('SHOW COLLECTIONS'):
+        return '_show_collections'
+    elif query.upper().startswith('DROP'):
+        return '_drop'
+    return None
+
+
+def run_benchmark(number=20000):
+    """Time both dispatchers on every sample statement"""
+    print("╔══════════════════════════════════════════════════════════════════════╗")
+    print("║              DNACryptDB Dispatch Micro-Benchmark                     ║")
+    print("╚══════════════════════════════════════════════════════════════════════╝")
+    print(f"\n{'Verb':<28}{'legacy (ns)':>14}{'table (ns)':>14}{'speedup':>10}")
+    print("-" * 66)
+
+    for query in SAMPLES:
+        node_type = Parser.resolve(query)[0]
+        handler = DNACryptDB._HANDLERS[node_type]
+        assert handler == legacy_resolve(query), f"Dispatch mismatch for: {query}"
+
+        legacy = min(timeit.repeat(lambda: legacy_resolve(query), number=number, repeat=3))
+        table = min(timeit.repeat(lambda: Parser.resolve(query), number=number, repeat=3))
+
+        legacy_ns = legacy / number * 1e9
+        table_ns = table / number * 1e9
+        verb = ' '.join(query.split()[:2])
+        print(f"{verb:<28}{legacy_ns:>14.0f}{table_ns:>14.0f}{legacy_ns / table_ns:>9.1f}x")
+
+    print("-" * 66)
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+DNACryptDB asyncio Engine Test Suite
+AsyncDNACryptDB against small in-memory async stand-ins for aiomysql,
+AsyncMongoClient and the async Neo4j driver, so neither the databases
+nor their drivers are needed
+"""
+
+import sys
+import asyncio
+import json
+import os
+import tempfile
+sys.path.append('..')
+
+from dnacryptdb.core import CATALOG_TABLES_SQL
+from dnacryptdb.aio import AsyncDNACryptDB, BACKENDS
+
+class AsyncFakeCursor:
+    """Answers each query with the rows of the first matching fragment in the pool's answers"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.rows = []
+        self.rowcount = 0
+        self.lastrowid = 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def execute(self, query, args=None):
+        self.pool.log.append((query, args))
+        self.rows = [dict(row) for row in self.pool.answer(query)]
+        self.rowcount = len(self.rows) or 1
+
+    async def executemany(self, query, seq):
+        seq = list(seq)
+        self.pool.log.append((query, seq))
+        self.rows = []
+        self.rowcount = len(seq)
+
+    async def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    async def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    async def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+class AsyncFakeConnection:
+    """A pooled connection; commits and rollbacks are counted on the pool"""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def cursor(self, cursor_class=None):
+        return AsyncFakeCursor(self.pool)
+
+    def get_transaction_status(self):
+        return False
+
+    async def commit(self):
+        self.pool.commits += 1
+
+    async def rollback(self):
+        self.pool.rollbacks += 1
+
+class AsyncFakeAcquire:
+    """pool.acquire(): awaited by BEGIN, used with "async with" everywhere else"""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def __await__(self):
+        return self.pool.checkout().__await__()
+
+    async def __aenter__(self):
+        self.conn = await self.pool.checkout()
+        return self.conn
+
+    async def __aexit__(self, *exc_info):
+        self.pool.release(self.conn)
+
+class AsyncFakePool:
+    """aiomysql side: a pool whose cursors answer from a list of (fragment, rows)"""
+
+    def __init__(self, answers=()):
+        self.answers = list(answers)
+        self.log = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.checked_out = 0
+
+    def answer(self, query):
+        for fragment, rows in self.answers:
+            if fragment in query:
+                return rows
+        return []
+
+    async def checkout(self):
+        self.checked_out += 1
+        return AsyncFakeConnection(self)
+
+    def acquire(self):
+        return AsyncFakeAcquire(self)
+
+    def release(self, conn):
+        self.checked_out -= 1
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        pass
+
+class AsyncFakeAdmin:
+    async def command(self, name):
+        assert name == 'ping'
+        return {'ok': 1}
+
+class AsyncFakeMongoDatabase(dict):
+    """MongoDB side: collections by name; only what catalog loading and health() need"""
+
+    async def list_collection_names(self):
+        return list(self)
+
+class AsyncFakeMongoClient:
+    admin = AsyncFakeAdmin()
+
+    async def close(self):
+        pass
+
+def make_engine(config):
+    """An engine on a temp config holding config, with connect() already run"""
+    config_file = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+    json.dump(config, config_file)
+    config_file.close()
+    try:
+        db = AsyncDNACryptDB(config_file=config_file.name, verbose=False)
+        asyncio.run(db.connect())
+    finally:
+        os.unlink(config_file.name)
+    return db
+
+def test_lazy_connect():
+    """Backends connect on the first statement that uses them, not in connect()"""
+    print("\n" + "="*70)
+    print("TEST 1: Lazy Backend Connections")
+    print("="*70)
+
+    db = make_engine({'mysql': {'host': 'fake'}, 'mongodb': {'uri': 'fake'}})
+    assert db.mysql_pool is None and db.mongo_db is None and not db._attempted
+    print("  ✓ connect() opened nothing")
+
+    connected = []
+    pool = AsyncFakePool([(CATALOG_TABLES_SQL, [{'name': 'messages_admin_adult', 'info': None}])])
+
+    async def connect_mysql(config):
+        connected.append('mysql')
+        db.mysql_pool = pool
+
+    async def connect_mongodb(config):
+        connected.append('mongodb')
+        # The first attempt fails; health() retries it
+        if connected.count('mongodb') > 1:
+            db.mongo_client = AsyncFakeMongoClient()
+            db.mongo_db = AsyncFakeMongoDatabase()
+
+    db._connect_mysql = connect_mysql
+    db._connect_mongodb = connect_mongodb
+
+    async def scenario():
+        graph = await db.execute('SHOW GRAPH stats')
+        assert graph == {"error": "Neo4j not connected"}, graph
+        assert connected == [], connected
+        print("  ✓ a graph statement connected nothing else")
+
+        tables = await db.execute('SHOW TABLES')
+        assert tables['tables'] == ['messages_admin_adult'], tables
+        await db.execute('SHOW TABLES')
+        assert sorted(connected) == ['mongodb', 'mysql'], connected
+        print(f"  ✓ SHOW TABLES connected {sorted(connected)} once and loaded the registry")
+
+        health = await db.health()
+        assert health['healthy'], health
+        assert health['backends']['neo4j'] == {"status": "not configured"}, health
+        assert connected.count('mongodb') == 2 and connected.count('mysql') == 1, connected
+        print(f"  ✓ health() retried MongoDB: {health['backends']['mongodb']['status']}")
+
+        await db.close()
+
+    asyncio.run(scenario())
+    print(f"\n✅ Only the backends in use are connected")
+
+def test_statements():
+    """Reads, BEGIN ... COMMIT and execute_many on the async pool"""
+    print("\n" + "="*70)
+    print("TEST 2: Statements on the Async Pool")
+    print("="*70)
+
+    messages = [{'message_id': f'm{i}', 'link_id': f'l{i}', 'content': 'hi'} for i in range(5)]
+    pool = AsyncFakePool([
+        (CATALOG_TABLES_SQL, [{'name': 'messages_admin_adult', 'info': None},
+                              {'name': 'keys_admin', 'info': None}]),
+        ('FROM messages_admin_adult', messages),
+    ])
+    db = make_engine({})
+    db.mysql_pool = pool
+    db._attempted = set(BACKENDS)
+
+    async def scenario():
+        result = await db.execute('LIST MESSAGES FROM messages_admin_adult')
+        assert result['count'] == 5, result
+        pages = [page async for page in db.stream('LIST MESSAGES FROM messages_admin_adult', page_size=2)]
+        assert [len(page) for page in pages] == [2, 2, 1], pages
+        assert pool.checked_out == 0, pool.checked_out
+        print("  ✓ LIST MESSAGES and stream() returned their connections")
+
+        key = 'ADD KEY TO keys_admin {"message_id": "%s", "public_key": "k", "type": "RSA"}'
+        assert (await db.execute('BEGIN'))['status'] == 'success'
+        assert (await db.execute(key % 'm1'))['status'] == 'success'
+        assert (await db.execute(key % 'm2'))['status'] == 'success'
+        assert pool.commits == 0 and pool.checked_out == 1, (pool.commits, pool.checked_out)
+        try:
+            await db.execute_many(['SHOW TABLES'])
+            raise AssertionError("execute_many ran inside a transaction")
+        except ValueError:
+            pass
+        assert (await db.execute('COMMIT'))['status'] == 'success'
+        assert pool.commits == 1 and pool.checked_out == 0, (pool.commits, pool.checked_out)
+        print("  ✓ BEGIN ... COMMIT wrote two keys in one commit; execute_many refused inside it")
+
+        await db.execute('BEGIN')
+        await db.execute(key % 'm3')
+        assert (await db.execute('ROLLBACK'))['status'] == 'success'
+        assert pool.rollbacks == 1 and pool.commits == 1 and pool.checked_out == 0
+        assert (await db.execute('COMMIT')) == {"error": "No transaction open"}
+        print("  ✓ ROLLBACK released the connection without committing")
+
+        results = await db.execute_many(
+            ['SHOW TABLES', ('LIST MESSAGES FROM messages_admin_adult', None), 'SHOW GRAPH stats'], workers=2)
+        assert results[0]['tables'] == ['messages_admin_adult', 'keys_admin'], results[0]
+        assert results[1]['count'] == 5, results[1]
+        assert results[2] == {"error": "Neo4j not connected"}, results[2]
+        assert pool.checked_out == 0, pool.checked_out
+        print("  ✓ execute_many results in input order")
+
+        await db.close()
+
+    asyncio.run(scenario())
+    print(f"\n✅ Async statements share the pool like the sync engine")
+
+def run_all_tests():
+    """Run all asyncio engine tests"""
+    print("\n" + "="*70)
+    print("DNACryptDB asyncio Engine Test Suite")
+    print("="*70)
+
+    tests = [
+        test_lazy_connect,
+        test_statements,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"\n❌ {test.__name__} failed: {e}")
+            failed += 1
+
+    print("\n" + "="*70)
+    if failed:
+        print(f"❌ {failed} test(s) failed")
+        return False
+    print("🎉 All asyncio engine tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
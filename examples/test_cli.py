@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+DNACryptDB Command Line Test Suite
+`dnacryptdb run` in a fresh interpreter on temp scripts and an empty
+config, so statements fail with "not connected" instead of needing a
+database
+"""
+
+import sys
+import os
+import subprocess
+import tempfile
+sys.path.append('..')
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SCRIPTS = {
+    'comments.dnacdb': '# setup\n-- nothing to run\n',
+    'graph.dnacdb': 'SHOW GRAPH stats;\n# Neo4j is not configured\n',
+    'mixed.dnacdb': 'SHOW TABLES;\nLIST MESSAGES FROM messages_admin_adult;\n',
+}
+
+def run_cli(*args, scripts=SCRIPTS):
+    """Run `dnacryptdb run args` in a directory holding scripts; return the process"""
+    with tempfile.TemporaryDirectory() as workdir:
+        with open(os.path.join(workdir, 'config.json'), 'w') as f:
+            f.write('{}')
+        for name, text in scripts.items():
+            with open(os.path.join(workdir, name), 'w') as f:
+                f.write(text)
+        return subprocess.run(
+            [sys.executable, '-c', 'import sys; from dnacryptdb.cli import main; sys.exit(main())',
+             'run', '-c', 'config.json', *args],
+            cwd=workdir, capture_output=True, text=True, timeout=60,
+            env=dict(os.environ, PYTHONPATH=ROOT)
+        )
+
+def test_jobs_progress():
+    """--jobs runs scripts in worker processes; --progress reports their counts on stderr"""
+    print("\n" + "="*70)
+    print("TEST 1: run --jobs --progress")
+    print("="*70)
+
+    proc = run_cli('--jobs', '2', '--progress', '*.dnacdb')
+    assert proc.returncode == 1, proc
+    assert "Running 3 scripts (2 at a time)" in proc.stdout, proc.stdout
+    assert "Scripts: 3 (0 could not run)" in proc.stdout, proc.stdout
+    assert "Total queries: 3" in proc.stdout and "✗ Errors: 2" in proc.stdout, proc.stdout
+    print("  ✓ three scripts, two workers, summed summary")
+
+    # Not a terminal: scripts with errors get a line, then one final status line
+    assert "✗ graph.dnacdb: 1 queries, 1 errors" in proc.stderr, proc.stderr
+    assert "✗ mixed.dnacdb: 2 queries, 1 errors" in proc.stderr, proc.stderr
+    assert "comments.dnacdb" not in proc.stderr, proc.stderr
+    status = proc.stderr.strip().splitlines()[-1]
+    assert "3/3 scripts  3 statements" in status and status.endswith("2 errors"), status
+    print(f"  ✓ progress on stderr: {status}")
+
+    print(f"\n✅ Parallel runs report per script and in total")
+
+def test_serial_quiet():
+    """Without --jobs scripts run one after another; --quiet leaves only the summary"""
+    print("\n" + "="*70)
+    print("TEST 2: run --quiet")
+    print("="*70)
+
+    proc = run_cli('--quiet', 'comments.dnacdb', 'graph.dnacdb')
+    assert proc.returncode == 1, proc
+    assert "Running 2 scripts (1 at a time)" in proc.stdout, proc.stdout
+    assert "graph.dnacdb:" not in proc.stdout, proc.stdout
+    assert "Total queries: 1" in proc.stdout, proc.stdout
+    print("  ✓ summary only")
+
+    proc = run_cli('--jobs', '4', 'comments.dnacdb')
+    assert proc.returncode == 0, proc
+    assert "Running: comments.dnacdb" in proc.stdout, proc.stdout
+    print("  ✓ a single script runs in-process and succeeds")
+
+    print(f"\n✅ Serial runs unchanged")
+
+def test_missing_pattern():
+    """A glob matching nothing is an error before anything runs"""
+    print("\n" + "="*70)
+    print("TEST 3: Unmatched Pattern")
+    print("="*70)
+
+    proc = run_cli('--jobs', '2', 'shards/*.dnacdb')
+    assert proc.returncode == 1, proc
+    assert "No files match: shards/*.dnacdb" in proc.stdout, proc.stdout
+    assert "Execution Summary" not in proc.stdout, proc.stdout
+    print("  ✓ reported and nothing run")
+
+    print(f"\n✅ Unmatched patterns are caught")
+
+def run_all_tests():
+    """Run all command line tests"""
+    print("\n" + "="*70)
+    print("DNACryptDB Command Line Test Suite")
+    print("="*70)
+
+    tests = [
+        test_jobs_progress,
+        test_serial_quiet,
+        test_missing_pattern,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"\n❌ {test.__name__} failed: {e}")
+            failed += 1
+
+    print("\n" + "="*70)
+    if failed:
+        print(f"❌ {failed} test(s) failed")
+        return False
+    print("🎉 All command line tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,825 @@
+#!/usr/bin/env python3
+"""
+DNACryptDB Engine Test Suite
+Statement handlers run against small in-memory stand-ins for the MySQL
+pool, MongoDB and Neo4j, so no database is needed
+"""
+
+import sys
+import json
+import os
+import tempfile
+import threading
+import time
+sys.path.append('..')
+
+from dnacryptdb import core
+from dnacryptdb.core import (
+    DNACryptDB, _link_timeouts, CATALOG_TABLES_SQL, CATALOG_PUT_SQL, CATALOG_DELETE_SQL, ROUTE_LOOKUP_SQL, ROUTE_SQL, SEND_MESSAGES_CYPHER,
+    CREATE_USERS_CYPHER, RELATE_MANY_CYPHER
+)
+
+class FakeCursor:
+    """Answers each query with the rows of the first matching fragment in the pool's answers"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.rows = []
+        self.rowcount = 0
+        self.lastrowid = 1
+
+    def execute(self, query, args=None):
+        self.pool.log.append((query, args))
+        self.rows = [dict(row) for row in self.pool.answer(query)]
+        self.rowcount = len(self.rows) or 1
+
+    def executemany(self, query, seq):
+        seq = list(seq)
+        self.pool.log.append((query, seq))
+        self.rows = []
+        self.rowcount = len(seq)
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        self.pool.fetched += len(rows)
+        return rows
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    """A pooled connection; commits and rollbacks are counted on the pool"""
+    unread_result = False
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def cursor(self, dictionary=False, buffered=True):
+        self.pool.buffered.append(buffered)
+        return FakeCursor(self.pool)
+
+    def commit(self):
+        self.pool.commits += 1
+
+    def rollback(self):
+        self.pool.rollbacks += 1
+
+    def consume_results(self):
+        pass
+
+    def close(self):
+        with self.pool.lock:
+            self.pool.checked_out -= 1
+
+class FakePool:
+    """
+    MySQL side: a connection pool whose cursors answer from a list of
+    (fragment, rows); an exception in place of rows is raised instead,
+    and a function is called for the rows
+    """
+
+    def __init__(self, answers=()):
+        self.answers = list(answers)
+        self.log = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.checked_out = 0
+        self.peak = 0
+        # Whether each cursor was buffered, and rows handed out by fetchmany
+        self.buffered = []
+        self.fetched = 0
+        self.lock = threading.Lock()
+
+    def answer(self, query):
+        for fragment, rows in self.answers:
+            if fragment in query:
+                if isinstance(rows, Exception):
+                    raise rows
+                return rows() if callable(rows) else rows
+        return []
+
+    def get_connection(self):
+        with self.lock:
+            self.checked_out += 1
+            self.peak = max(self.peak, self.checked_out)
+        return FakeConnection(self)
+
+    def _remove_connections(self):
+        pass
+
+class FakeInsertResult:
+    def __init__(self, inserted_ids):
+        self.inserted_ids = inserted_ids
+
+class FakeCollection:
+    """MongoDB side: documents in a list, with a unique index on link_id"""
+
+    def __init__(self, name):
+        self.name = name
+        self.docs = []
+        # Seconds each find_one takes, to stand in for a slow server
+        self.delay = 0
+        self.reads = 0
+
+    def insert_many(self, docs, ordered=True):
+        write_errors = []
+        for index, doc in enumerate(docs):
+            if any(stored['link_id'] == doc['link_id'] for stored in self.docs):
+                write_errors.append({'index': index, 'code': 11000, 'errmsg': 'E11000 duplicate key'})
+            else:
+                self.docs.append(dict(doc, _id=len(self.docs)))
+        if write_errors:
+            # What pymongo raises, here the placeholder core uses before MongoDB connects
+            error = core.BulkWriteError("batch op errors occurred")
+            error.details = {'writeErrors': write_errors, 'nInserted': len(docs) - len(write_errors)}
+            raise error
+        return FakeInsertResult(list(range(len(docs))))
+
+    def find_one(self, query):
+        time.sleep(self.delay)
+        self.reads += 1
+        return next((dict(doc) for doc in self.docs
+                     if all(doc.get(field) == value for field, value in query.items())), None)
+
+    def find(self, query=None):
+        return [dict(doc) for doc in self.docs
+                if all(doc.get(field) == value for field, value in (query or {}).items())]
+
+    def replace_one(self, query, doc, upsert=False):
+        self.delete_one(query)
+        self.docs.append(dict(doc))
+
+    def delete_one(self, query):
+        self.docs = [doc for doc in self.docs
+                     if not all(doc.get(field) == value for field, value in query.items())]
+
+class FakeMongoDatabase(dict):
+    """Collections by name, created on first access"""
+
+    def __missing__(self, name):
+        self[name] = FakeCollection(name)
+        return self[name]
+
+    def list_collection_names(self):
+        return list(self)
+
+    def create_collection(self, name):
+        return self[name]
+
+class FakeAdmin:
+    def command(self, name):
+        assert name == 'ping'
+        return {'ok': 1}
+
+class FakeMongoClient:
+    admin = FakeAdmin()
+
+    def close(self):
+        pass
+
+class FakeCounters:
+    def __init__(self, rows):
+        self.nodes_created = len(rows)
+        self.relationships_created = len(rows)
+
+class FakeResult:
+    """A Cypher result: the driver's records, and counters sized by the rows sent"""
+
+    def __init__(self, records, rows):
+        self.records = list(records)
+        self.counters = FakeCounters(rows)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def single(self):
+        return self.records[0] if self.records else None
+
+    def consume(self):
+        return self
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def run(self, query, parameters=None, **params):
+        params = dict(parameters or {}, **params)
+        self.driver.log.append((query, params))
+        return FakeResult(self.driver.records, params.get('rows') or [])
+
+    def execute_write(self, work, *args, **kwargs):
+        return work(self, *args, **kwargs)
+
+    execute_read = execute_write
+
+class FakeDriver:
+    """Neo4j side: every statement is logged and answered with the same records"""
+
+    def __init__(self, records=()):
+        self.records = list(records)
+        self.log = []
+        # Set to an exception to stand in for an unreachable server
+        self.unreachable = None
+
+    def session(self, **config):
+        return FakeSession(self)
+
+    def verify_connectivity(self):
+        if self.unreachable:
+            raise self.unreachable
+
+    def close(self):
+        pass
+
+def make_engine(pool=None, pool_size=5, mongo_db=None, neo4j_driver=None):
+    """An engine on the given stand-ins; a backend left as None is not connected"""
+    config = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+    json.dump({}, config)
+    config.close()
+    try:
+        db = DNACryptDB(config_file=config.name, verbose=False)
+    finally:
+        os.unlink(config.name)
+    db._attempted = {'mysql', 'mongodb', 'neo4j'}
+    db._mysql_pool = pool
+    db._mysql_slots = threading.BoundedSemaphore(pool_size)
+    db._mongo_db = mongo_db
+    db._neo4j_driver = neo4j_driver
+    return db
+
+def run_with_deadline(function, seconds=5):
+    """Run function on a daemon thread; fail rather than hang if it blocks"""
+    outcome = {}
+    worker = threading.Thread(target=lambda: outcome.update(result=function()), daemon=True)
+    worker.start()
+    worker.join(seconds)
+    assert not worker.is_alive(), f"still blocked after {seconds}s"
+    return outcome['result']
+
+def write_script(text):
+    """A temp .dnacdb file holding text; the caller removes it"""
+    script = tempfile.NamedTemporaryFile('w', suffix='.dnacdb', delete=False)
+    script.write(text)
+    script.close()
+    return script.name
+
+def add_key(message_id, table='keys_admin'):
+    return f'ADD KEY TO {table} {{"message_id": "{message_id}", "public_key": "k", "type": "RSA"}};\n'
+
+def test_link_data_single_connection():
+    """LINK DATA as the first statement loads the registry without a second pool slot"""
+    print("\n" + "="*70)
+    print("TEST 1: LINK DATA on a One-Connection Pool")
+    print("="*70)
+
+    pool = FakePool([
+        (CATALOG_TABLES_SQL, [{'name': 'messages_admin_adult', 'info': None}]),
+        (ROUTE_LOOKUP_SQL, []),
+        ('FROM messages_admin_adult', [{'message_id': 'm1', 'link_id': 'l1', 'content': 'hi'}]),
+    ])
+    db = make_engine(pool, pool_size=1)
+    db.link_timeouts = dict.fromkeys(db.link_timeouts, 5.0)
+
+    result = run_with_deadline(lambda: db.execute('LINK DATA WHERE link_id = "l1"'))
+    assert result['status'] == 'success', result
+    assert result['mysql_data']['table'] == 'messages_admin_adult', result
+    assert result['timed_out'] == [], result
+    assert pool.peak == 1 and pool.checked_out == 0, (pool.peak, pool.checked_out)
+    print(f"  ✓ found in {result['mysql_data']['table']} with one connection")
+
+    # SHOW TABLES afterwards still gets the connection back
+    result = run_with_deadline(lambda: db.execute('SHOW TABLES'))
+    assert 'error' not in result, result
+    print(f"  ✓ SHOW TABLES: {result.get('status')}")
+
+    db.close()
+    print(f"\n✅ A fresh engine never holds two connections for one lookup")
+
+def test_transaction_blocks():
+    """Block results arrive after COMMIT; only failed MySQL work rolls a block back"""
+    print("\n" + "="*70)
+    print("TEST 2: BEGIN ... COMMIT Blocks")
+    print("="*70)
+
+    pool = FakePool([('INSERT INTO bad_keys', core.Error("Table 'bad_keys' doesn't exist"))])
+    db = make_engine(pool)
+    path = write_script(
+        'BEGIN;\n' + add_key('m1') + 'SHOW GRAPH stats;\n' + add_key('m2') + 'COMMIT;\n'
+        'BEGIN;\n' + add_key('m3') + add_key('m4', 'bad_keys') + add_key('m5') + 'COMMIT;\n'
+        'BEGIN;\n' + add_key('m6') + 'ROLLBACK;\n'
+        'BEGIN;\n' + add_key('m7')
+    )
+    try:
+        seen = [(result, pool.commits) for result in db.iter_file(path)]
+    finally:
+        os.unlink(path)
+    results = [result for result, commits in seen]
+
+    # Successes inside the first block are only reported once it committed
+    assert [commits for result, commits in seen[1:4]] == [1, 1, 1], seen
+    assert results[1]['status'] == 'success' and results[3]['status'] == 'success', results
+    assert results[2] == {"error": "Neo4j not connected"}, results[2]
+    print("  ✓ block 1: a Neo4j failure did not roll back; results released at COMMIT")
+
+    assert results[6] == {"error": "Rolled back: statement 8 failed"}, results[6]
+    assert results[7]['rolled_back'] == 1 and 'bad_keys' in results[7]['error'], results[7]
+    assert results[8] == {"error": "Skipped: transaction was rolled back"}, results[8]
+    assert results[9] == {"error": "Transaction was rolled back"}, results[9]
+    print(f"  ✓ block 2: {results[6]['error']}")
+
+    assert results[11] == {"error": "Rolled back: ROLLBACK at statement 13"}, results[11]
+    assert results[12] == {"status": "success"}, results[12]
+    assert results[14] == {"error": "Rolled back: the script ended before COMMIT"}, results[14]
+    assert results[15] == {"error": "Transaction was not committed", "rolled_back": 1}, results[15]
+    assert len(results) == 16, results
+    print("  ✓ blocks 3-4: ROLLBACK and an unclosed BEGIN undo their writes")
+
+    assert pool.commits == 1 and pool.rollbacks == 3 and pool.checked_out == 0, vars(pool)
+    print(f"\n✅ {pool.commits} commit, {pool.rollbacks} rollbacks, no connection left out")
+
+def test_commit_every():
+    """commit_every batches results until their commit; a MySQL failure undoes only its batch"""
+    print("\n" + "="*70)
+    print("TEST 3: commit_every Batches")
+    print("="*70)
+
+    pool = FakePool([('INSERT INTO bad_keys', core.Error("Table 'bad_keys' doesn't exist"))])
+    db = make_engine(pool)
+    path = write_script(
+        add_key('m1') + add_key('m2') + 'NOT A STATEMENT;\n' +
+        add_key('m3') + add_key('m4', 'bad_keys') + add_key('m5')
+    )
+    try:
+        seen = [(result, pool.commits) for result in db.iter_file(path, commit_every=3)]
+        summary = db.execute_file(path, summary_only=True, commit_every=3)
+    finally:
+        os.unlink(path)
+    results = [result for result, commits in seen]
+
+    assert [commits for result, commits in seen[:3]] == [1, 1, 1], seen
+    assert [bool(result.get('error')) for result in results[:3]] == [False, False, True], results
+    print("  ✓ batch 1 committed despite a parse error, then reported")
+
+    assert results[3] == {"error": "Rolled back: statement 5 failed"}, results[3]
+    assert results[4]['rolled_back'] == 1, results[4]
+    assert results[5]['status'] == 'success' and seen[5][1] == 2, seen[5]
+    print(f"  ✓ batch 2: {results[3]['error']}; statement 6 committed on its own")
+
+    assert summary == {"total": 6, "success": 3, "errors": 3, "comments": 0}, summary
+    print(f"\n✅ {summary}")
+
+def test_send_messages():
+    """SEND MESSAGES inserts chunk by chunk in one commit, then one UNWIND per chunk"""
+    print("\n" + "="*70)
+    print("TEST 4: Bulk SEND MESSAGES")
+    print("="*70)
+
+    pool = FakePool()
+    driver = FakeDriver()
+    db = make_engine(pool, neo4j_driver=driver)
+    db.chunk_size = 2
+
+    rows = [{"content": f"hi {n}", "sender": "alice@dnacrypt.com", "receiver": "bob@dnacrypt.com"}
+            for n in range(3)]
+    result = db.execute(f'SEND MESSAGES TO messages_admin_adult {json.dumps(rows)}')
+    assert result['status'] == 'success' and result['count'] == 3, result
+    assert result['graph_created'] is True, result
+    assert len({row['link_id'] for row in result['results']}) == 3, result
+
+    inserts = [args for query, args in pool.log if query.startswith('INSERT INTO messages_admin_adult')]
+    routes = [args for query, args in pool.log if query == ROUTE_SQL['message_table']]
+    assert [len(chunk) for chunk in inserts] == [2, 1], inserts
+    assert [len(chunk) for chunk in routes] == [2, 1], routes
+    assert pool.commits == 1, pool.commits
+    assert [len(params['rows']) for query, params in driver.log
+            if query == SEND_MESSAGES_CYPHER] == [2, 1], driver.log
+    print(f"  ✓ 3 rows: {len(inserts)} executemany chunks, {pool.commits} commit, "
+          f"{len(driver.log)} graph statements")
+
+    # A bad row fails the statement before anything is written
+    pool.log.clear()
+    result = db.execute('SEND MESSAGES TO messages_admin_adult [{"content": "x", "sender": "a"}]')
+    assert result == {"error": "Missing required field: 'receiver'"}, result
+    assert pool.log == [] and pool.commits == 1, pool.log
+    print(f"  ✓ missing field: {result['error']}")
+
+    print(f"\n✅ Bulk sends cost one commit and one graph statement per chunk")
+
+def test_store_sequences_errors():
+    """STORE SEQUENCES reports each bad document by input index and stores the rest"""
+    print("\n" + "="*70)
+    print("TEST 5: STORE SEQUENCES Partial Errors")
+    print("="*70)
+
+    pool = FakePool()
+    mongo_db = FakeMongoDatabase()
+    db = make_engine(pool, mongo_db=mongo_db)
+    db.chunk_size = 2
+
+    sequences = [
+        {"link_id": "l1", "original": "ATCG"},
+        {"link_id": "l2", "original": "GGCC"},
+        {"link_id": "l1", "original": "TTAA"},
+        {"original": "CCGG"},
+        "ATCG",
+        {"link_id": "l3", "original": "AATT"},
+    ]
+    result = db.execute(f'STORE SEQUENCES IN sequences_admin {json.dumps(sequences)}')
+    assert result['status'] == 'success', result
+    assert result['inserted'] == 3 and result['failed'] == 3, result
+    assert result['errors'] == [
+        {"index": 2, "link_id": "l1", "error": "Duplicate link_id: l1"},
+        {"index": 3, "error": "Missing required field: 'link_id'"},
+        {"index": 4, "error": "Sequence must be an object"},
+    ], result['errors']
+    for error in result['errors']:
+        print(f"  ✓ [{error['index']}] {error['error']}")
+
+    stored = [doc['link_id'] for doc in mongo_db['sequences_admin'].docs]
+    routed = [[link_id for link_id, coll in args] for query, args in pool.log
+              if query == ROUTE_SQL['sequence_collection']]
+    assert stored == ['l1', 'l2', 'l3'], stored
+    assert routed == [['l1', 'l2'], ['l3']], routed
+    print(f"  ✓ stored and routed {stored}")
+
+    print(f"\n✅ One bad document never aborts its batch")
+
+def test_bulk_graph_writes():
+    """CREATE USERS and RELATE MANY send one UNWIND per chunk and type; bad rows are listed"""
+    print("\n" + "="*70)
+    print("TEST 6: CREATE USERS / RELATE MANY")
+    print("="*70)
+
+    driver = FakeDriver()
+    db = make_engine(neo4j_driver=driver)
+
+    users = [{"email": f"user{n}@dnacrypt.com", "role": "user"} for n in range(3)]
+    users.insert(1, {"role": "admin"})
+    users.append("carol@dnacrypt.com")
+    result = db.execute(f'CREATE USERS {json.dumps(users)}')
+    assert result['count'] == 3 and result['created'] == 3, result
+    assert result['errors'] == [
+        {"index": 1, "error": "Missing required field: 'email'"},
+        {"index": 4, "error": "User must be an object"},
+    ], result['errors']
+    result = db.create_users(iter(users), chunk_size=2)
+    sizes = [len(params['rows']) for query, params in driver.log if query == CREATE_USERS_CYPHER]
+    assert sizes == [3, 2, 1], sizes
+    print(f"  ✓ CREATE USERS: rows per statement {sizes}, {result['failed']} rejected")
+
+    driver.log.clear()
+    relationships = [
+        {"from": "a@dnacrypt.com", "type": "trusts", "to": "b@dnacrypt.com", "level": 85},
+        {"from": "a@dnacrypt.com", "type": "SENT", "to": "m1"},
+        {"from": "b@dnacrypt.com", "type": "TRUSTS", "to": "c@dnacrypt.com", "level": 40},
+        {"from": "a@dnacrypt.com", "type": "LIKES", "to": "b@dnacrypt.com"},
+        {"from": "c@dnacrypt.com", "type": "TRUSTS", "to": "a@dnacrypt.com"},
+        {"from": "b@dnacrypt.com", "type": "TRUSTS", "to": "a@dnacrypt.com", "level": 10},
+    ]
+    result = db.relate_many(relationships, chunk_size=2)
+    assert result['count'] == 4 and result['failed'] == 2, result
+    assert [error['index'] for error in result['errors']] == [3, 4], result['errors']
+    sent = [(query, len(params['rows'])) for query, params in driver.log]
+    assert sent == [(RELATE_MANY_CYPHER['TRUSTS'], 2), (RELATE_MANY_CYPHER['SENT'], 1),
+                    (RELATE_MANY_CYPHER['TRUSTS'], 1)], sent
+    print(f"  ✓ RELATE MANY: {len(sent)} statements for 4 relationships, "
+          f"rejected {[error['error'] for error in result['errors']]}")
+
+    print(f"\n✅ Bulk graph writes batch by chunk and relationship type")
+
+def test_stream():
+    """stream() reads chunk by chunk through an unbuffered cursor, holding it until closed"""
+    print("\n" + "="*70)
+    print("TEST 7: Streaming LIST MESSAGES")
+    print("="*70)
+
+    messages = [{'message_id': f"m{n}", 'link_id': f"l{n}", 'content': 'hi'} for n in range(5)]
+    pool = FakePool([('FROM messages_admin_adult', messages)])
+    db = make_engine(pool)
+    db.chunk_size = 2
+
+    rows = db.stream('LIST MESSAGES FROM messages_admin_adult')
+    first = next(rows)
+    assert first['message_id'] == 'm0', first
+    assert pool.fetched == 2 and pool.checked_out == 1 and pool.buffered == [False], vars(pool)
+    print(f"  ✓ first row after fetching {pool.fetched} of {len(messages)}, unbuffered")
+    rows.close()
+    assert pool.checked_out == 0, pool.checked_out
+    print("  ✓ closing the generator returned the connection")
+
+    pages = list(db.stream('LIST MESSAGES FROM messages_admin_adult', page_size=2))
+    assert [len(page) for page in pages] == [2, 2, 1], pages
+    print(f"  ✓ pages of {[len(page) for page in pages]}")
+
+    try:
+        next(db.stream('SHOW TABLES'))
+        assert False, "stream() accepted SHOW TABLES"
+    except ValueError as e:
+        print(f"  ✓ SHOW TABLES rejected: {e}")
+
+    print(f"\n✅ Streams keep one chunk in memory")
+
+def test_pool_exhaustion():
+    """More threads than pooled connections wait for one instead of failing"""
+    print("\n" + "="*70)
+    print("TEST 8: Pool Exhaustion")
+    print("="*70)
+
+    def slow_message():
+        time.sleep(0.05)
+        return [{'message_id': 'm1', 'content': 'hi'}]
+
+    pool = FakePool([('FROM messages_admin_adult', slow_message)])
+    db = make_engine(pool, pool_size=2)
+
+    results = [None] * 6
+    def get(n):
+        results[n] = db.execute('GET MESSAGE FROM messages_admin_adult WHERE message_id = "m1"')
+    threads = [threading.Thread(target=get, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert all(result and result.get('status') == 'success' for result in results), results
+    assert pool.peak == 2 and pool.checked_out == 0, (pool.peak, pool.checked_out)
+    print(f"  ✓ 6 threads, at most {pool.peak} connections out, all succeeded")
+
+    print(f"\n✅ Callers queue for pool_size connections")
+
+def test_execute_many():
+    """execute_many runs statements on worker threads and returns results in input order"""
+    print("\n" + "="*70)
+    print("TEST 9: execute_many")
+    print("="*70)
+
+    def message(delay):
+        def rows():
+            time.sleep(delay)
+            return [{'message_id': f"m{delay}", 'content': 'hi'}]
+        return rows
+
+    pool = FakePool([(f'FROM messages_{n}', message(0.01 * (4 - n))) for n in range(4)])
+    db = make_engine(pool, pool_size=4)
+
+    threads = set()
+    execute = db.execute
+    db.execute = lambda query, params=None: threads.add(threading.get_ident()) or execute(query, params)
+    queries = [f'GET MESSAGE FROM messages_{n} WHERE message_id = "m"' for n in range(4)]
+    queries.append(('GET MESSAGE FROM messages_0 WHERE message_id = $id', {"id": "m"}))
+    results = db.execute_many(queries, workers=4)
+
+    ids = [result['message']['message_id'] for result in results]
+    assert ids == ['m0.04', 'm0.03', 'm0.02', 'm0.01', 'm0.04'], ids
+    assert len(threads) > 1, threads
+    print(f"  ✓ results in input order {ids} from {len(threads)} threads")
+
+    stats = db.cache_stats()['plan_cache']
+    assert stats['hits'] + stats['misses'] == 5 == stats['size'], stats
+    print(f"  ✓ plan cache counted every statement: {stats}")
+
+    print(f"\n✅ Independent statements run concurrently")
+
+def test_link_data_timeouts():
+    """A backend slower than its link_timeout entry is left out instead of delaying LINK DATA"""
+    print("\n" + "="*70)
+    print("TEST 10: LINK DATA Timeouts")
+    print("="*70)
+
+    pool = FakePool([
+        (CATALOG_TABLES_SQL, [{'name': 'messages_admin_adult', 'info': None}]),
+        ('FROM messages_admin_adult', [{'message_id': 'm1', 'link_id': 'l1', 'content': 'hi'}]),
+    ])
+    mongo_db = FakeMongoDatabase()
+    mongo_db['sequences_admin'].docs.append({'_id': 1, 'link_id': 'l1', 'original_sequence': 'ATCG'})
+    db = make_engine(pool, mongo_db=mongo_db, neo4j_driver=FakeDriver())
+    db.link_timeouts = _link_timeouts({'mongodb': 0.2})
+    assert db.link_timeouts == {'mysql': 2.0, 'mongodb': 0.2, 'neo4j': 2.0}, db.link_timeouts
+
+    result = db.execute('LINK DATA WHERE link_id = "l1"')
+    assert result['timed_out'] == [], result
+    assert result['mongodb_data']['collection'] == 'sequences_admin', result
+    print("  ✓ every backend answered in time")
+
+    mongo_db['sequences_admin'].delay = 1.0
+    started = time.monotonic()
+    result = db.execute('LINK DATA WHERE link_id = "l1"')
+    elapsed = time.monotonic() - started
+    assert result['timed_out'] == ['mongodb'] and result['mongodb_data'] == {}, result
+    assert result['mysql_data']['table'] == 'messages_admin_adult', result
+    assert elapsed < 0.8, elapsed
+    print(f"  ✓ slow MongoDB left out after {elapsed:.2f}s; MySQL part kept")
+
+    db.close()
+    print(f"\n✅ Each backend gets its own deadline")
+
+def test_link_routing():
+    """A routed link_id reads one table and one collection; an unrouted one scans the registry"""
+    print("\n" + "="*70)
+    print("TEST 11: link_id Routing")
+    print("="*70)
+
+    route = []
+    pool = FakePool([
+        (CATALOG_TABLES_SQL, [{'name': 'messages_admin_adult', 'info': None},
+                              {'name': 'messages_admin_child', 'info': None}]),
+        (ROUTE_LOOKUP_SQL, lambda: route),
+        ('FROM messages_admin_child', [{'message_id': 'm1', 'link_id': 'l1', 'content': 'hi'}]),
+    ])
+    mongo_db = FakeMongoDatabase()
+    mongo_db['sequences_admin']
+    mongo_db['sequences_child'].docs.append({'_id': 1, 'link_id': 'l1', 'original_sequence': 'ATCG'})
+    db = make_engine(pool, mongo_db=mongo_db)
+
+    def tables_read():
+        return sorted(table for table in ('messages_admin_adult', 'messages_admin_child')
+                      if any(f'FROM {table}' in query for query, args in pool.log))
+
+    # Written before _dnacdb_links existed: every candidate may be read
+    result = db.execute('LINK DATA WHERE link_id = "l1"')
+    assert result['mysql_data']['table'] == 'messages_admin_child', result
+    assert result['mongodb_data']['collection'] == 'sequences_child', result
+    assert tables_read() == ['messages_admin_adult', 'messages_admin_child'], pool.log
+    print("  ✓ unrouted link_id found by scanning the registry")
+
+    route.append({'message_table': 'messages_admin_child', 'sequence_collection': 'sequences_child'})
+    pool.log.clear()
+    for collection in mongo_db.values():
+        collection.reads = 0
+    result = db.execute('LINK DATA WHERE link_id = "l1"')
+    assert result['mysql_data']['table'] == 'messages_admin_child', result
+    assert result['mongodb_data']['collection'] == 'sequences_child', result
+    assert tables_read() == ['messages_admin_child'], pool.log
+    assert mongo_db['sequences_admin'].reads == 0 and mongo_db['sequences_child'].reads == 1
+    print("  ✓ routed link_id read only messages_admin_child and sequences_child")
+
+    db.close()
+    print(f"\n✅ Routes replace the registry scan")
+
+def test_catalog():
+    """The registry loads from both catalogs, and schema changes are written back to them"""
+    print("\n" + "="*70)
+    print("TEST 12: Persisted Schema Catalog")
+    print("="*70)
+
+    # MySQL's catalog rows follow the CATALOG_PUT_SQL / CATALOG_DELETE_SQL writes
+    tables = {'messages_admin_adult': None, 'legacy': None}
+
+    def catalog_rows():
+        return [{'name': name, 'info': info} for name, info in tables.items()]
+
+    def apply_writes():
+        for query, args in pool.log:
+            if query == CATALOG_PUT_SQL:
+                tables[args[0]] = args[1]
+            elif query == CATALOG_DELETE_SQL:
+                tables.pop(args[0], None)
+        pool.log.clear()
+
+    pool = FakePool([(CATALOG_TABLES_SQL, catalog_rows)])
+    mongo_db = FakeMongoDatabase()
+    mongo_db['sequences_admin']
+    mongo_db['system.views']
+    mongo_db['_dnacdb_catalog'].docs.append({'_id': 'sequences_admin', 'backend': 'mongodb', 'role': 'admin'})
+    db = make_engine(pool, mongo_db=mongo_db)
+
+    registry = db.schema_registry
+    assert registry['messages_admin_adult'] == {
+        'backend': 'mysql', 'type': 'messages', 'role': 'admin', 'age_group': 'adult'}, registry
+    assert registry['legacy'] == {'backend': 'mysql'}, registry
+    assert registry['sequences_admin'] == {'backend': 'mongodb', 'role': 'admin'}, registry
+    assert 'system.views' not in registry and '_dnacdb_catalog' not in registry, registry
+    print(f"  ✓ loaded {sorted(registry)}; uncataloged tables read off their names")
+
+    result = db.execute('MAKE TABLE users WITH (name:text, age:int)')
+    assert result['status'] == 'success', result
+    puts = [args for query, args in pool.log if query == CATALOG_PUT_SQL]
+    assert len(puts) == 1 and puts[0][0] == 'users', puts
+    assert db.schema_registry['users'] == {'backend': 'mysql', 'fields': {'name': 'text', 'age': 'int'}}
+    result = db.execute('MAKE COLLECTION logs')
+    assert result['status'] == 'success', result
+    assert mongo_db['_dnacdb_catalog'].find({'_id': 'logs'}) == [{'_id': 'logs', 'backend': 'mongodb'}]
+    print("  ✓ MAKE TABLE / MAKE COLLECTION written to _dnacdb_catalog")
+
+    result = db.execute('DROP legacy')
+    assert result['status'] == 'success', result
+    assert (CATALOG_DELETE_SQL, ('legacy',)) in pool.log, pool.log
+    assert 'legacy' not in db.schema_registry
+    apply_writes()
+    db.close()
+
+    # A new engine sees the same schema without re-deriving it
+    db = make_engine(pool, mongo_db=mongo_db)
+    assert db.schema_registry['users']['fields'] == {'name': 'text', 'age': 'int'}, db.schema_registry
+    assert db.schema_registry['logs'] == {'backend': 'mongodb'}, db.schema_registry
+    assert 'legacy' not in db.schema_registry
+    print("  ✓ a second engine reloaded users, logs and the DROP")
+
+    db.close()
+    print(f"\n✅ Schema changes outlive the engine")
+
+def test_health():
+    """health() reports each configured backend and retries the ones that failed to connect"""
+    print("\n" + "="*70)
+    print("TEST 13: health()")
+    print("="*70)
+
+    pool = FakePool([('SELECT 1', [{'1': 1}])])
+    driver = FakeDriver()
+    db = make_engine(pool, neo4j_driver=driver)
+    db._config = {'mysql': {}, 'mongodb': {}, 'neo4j': {}}
+    db._attempted.discard('mongodb')
+
+    attempts = []
+
+    def connect_mongodb(mongo_config):
+        attempts.append(mongo_config)
+        # The first attempt fails the way _connect_mongodb does: nothing is set
+        if len(attempts) > 1:
+            db._mongo_client = FakeMongoClient()
+            db._mongo_db = FakeMongoDatabase()
+
+    db._connect_mongodb = connect_mongodb
+
+    assert db.mongo_db is None and len(attempts) == 1
+    assert db.mongo_db is None and len(attempts) == 1
+    print("  ✓ a failed MongoDB connection is not retried by every statement")
+
+    health = db.health()
+    assert health['healthy'], health
+    assert {info['status'] for info in health['backends'].values()} == {'ok'}, health
+    assert len(attempts) == 2 and db.mongo_db is not None
+    assert ('SELECT 1', None) in pool.log and pool.checked_out == 0
+    print(f"  ✓ health() retried MongoDB: {health['backends']['mongodb']}")
+
+    pool.answers = [('SELECT 1', core.Error("Lost connection to MySQL server"))]
+    driver.unreachable = ConnectionError("Unable to retrieve routing information")
+    health = db.health()
+    assert not health['healthy'], health
+    assert health['backends']['mysql'] == {
+        "status": "error", "error": "Lost connection to MySQL server"}, health
+    assert health['backends']['neo4j']['status'] == 'error', health
+    assert health['backends']['mongodb']['status'] == 'ok' and len(attempts) == 2, health
+    print("  ✓ MySQL and Neo4j errors reported; a connected backend is not reconnected")
+
+    del db._config['neo4j']
+    health = db.health()
+    assert health['backends']['neo4j'] == {"status": "not configured"}, health
+    print("  ✓ unconfigured backends do not count against health")
+
+    db.close()
+    print(f"\n✅ health() checks and heals backends")
+
+def run_all_tests():
+    """Run all engine tests"""
+    print("\n" + "="*70)
+    print("DNACryptDB Engine Test Suite")
+    print("="*70)
+
+    tests = [
+        test_link_data_single_connection,
+        test_transaction_blocks,
+        test_commit_every,
+        test_send_messages,
+        test_store_sequences_errors,
+        test_bulk_graph_writes,
+        test_stream,
+        test_pool_exhaustion,
+        test_execute_many,
+        test_link_data_timeouts,
+        test_link_routing,
+        test_catalog,
+        test_health,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"\n❌ {test.__name__} failed: {e}")
+            failed += 1
+
+    print("\n" + "="*70)
+    if failed:
+        print(f"❌ {failed} test(s) failed")
+        return False
+    print("🎉 All engine tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
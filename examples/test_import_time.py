@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+DNACryptDB Import-Time Regression Test
+Measures package imports with `python -X importtime` and checks that no
+database driver is loaded before a backend is used
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Cumulative import budget per statement, in milliseconds
+BUDGETS_MS = {
+    "import dnacryptdb": 20,
+    "from dnacryptdb import DNACryptDB": 150,
+    "import dnacryptdb.parser": 150,
+    "import dnacryptdb.encryption": 400,
+    "from dnacryptdb.aio import AsyncDNACryptDB": 250,
+    "from dnacryptdb import *": 250,
+}
+
+# Top-level packages of the MySQL, MongoDB and Neo4j drivers
+DRIVER_PACKAGES = ("mysql", "pymongo", "bson", "gridfs", "neo4j", "aiomysql", "pymysql")
+
+
+def measure(statement):
+    """Run statement in a fresh interpreter; return (ms, driver modules, error)"""
+    probe = (
+        f"{statement}\n"
+        "import sys\n"
+        f"print(','.join(sorted(m for m in sys.modules if m.split('.')[0] in {DRIVER_PACKAGES!r})))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        return None, [], proc.stderr.strip().splitlines()[-1]
+
+    # "import time: self [us] | cumulative | imported package"; top-level
+    # imports are the ones whose package name is not indented
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, package = line.split("|")
+        if package.startswith(" dnacryptdb"):
+            total_us += int(cumulative)
+
+    drivers = [m for m in proc.stdout.strip().split(",") if m]
+    return total_us / 1000, drivers, None
+
+
+def check(statement, budget):
+    """Print one statement's result line; return its problems, or None if skipped"""
+    elapsed, drivers, error = measure(statement)
+
+    if error and "No module named 'cryptography'" in error:
+        print(f"{statement:<45}{'-':>8}{budget:>10}  skipped (cryptography not installed)")
+        return None
+    if error:
+        print(f"{statement:<45}{'-':>8}{budget:>10}  ❌ {error}")
+        return [error]
+
+    problems = []
+    if elapsed > budget:
+        problems.append("over budget")
+    if drivers:
+        problems.append(f"loaded {', '.join(drivers)}")
+    print(f"{statement:<45}{elapsed:>8.1f}{budget:>10}  {'❌ ' + '; '.join(problems) if problems else '✅'}")
+    return problems
+
+
+def test_import_time():
+    """Every statement imports within budget and loads no database driver"""
+    for statement, budget in BUDGETS_MS.items():
+        problems = check(statement, budget)
+        assert not problems, f"{statement}: {'; '.join(problems)}"
+
+
+def run_all_tests():
+    print("=" * 70)
+    print("DNACryptDB Import-Time Regression Test")
+    print("=" * 70)
+    print(f"\n{'Statement':<45}{'ms':>8}{'budget':>10}  result")
+    print("-" * 70)
+
+    failures = 0
+    for statement, budget in BUDGETS_MS.items():
+        failures += bool(check(statement, budget))
+
+    print("-" * 70)
+    if failures:
+        print(f"\n❌ {failures} import check(s) failed")
+        return False
+    print("\n🎉 Imports within budget, no database drivers loaded")
+    return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
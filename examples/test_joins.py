@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+DNACryptDB Join Test Suite
+Join planning and the merge strategy's key order; no database is needed,
+each side is a small in-memory stand-in sorting the way its backend does
+"""
+
+import sys
+sys.path.append('..')
+
+from dnacryptdb.parser import parse
+from dnacryptdb.core import DNACryptDB, TABLE_ROWS_SQL, KEY_TYPE_SQL, _join_plan, _join_select
+
+class BinaryOrderCursor:
+    """MySQL side: rows come back in byte order, as ORDER BY CAST(... AS BINARY) gives"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.pending = []
+
+    def execute(self, query, args=None):
+        assert "ORDER BY CAST(link_id AS BINARY)" in query, query
+        self.pending = sorted(self.rows, key=lambda row: row['link_id'].encode('utf-8'))
+
+    def fetchmany(self, size):
+        chunk, self.pending = self.pending[:size], self.pending[size:]
+        return chunk
+
+class MongoOrderCollection:
+    """MongoDB side: numbers sort before strings, strings by their UTF-8 bytes"""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def estimated_document_count(self):
+        return len(self.docs)
+
+    def find(self, query=None, batch_size=None, sort=None):
+        def bson_order(value):
+            if isinstance(value, str):
+                return (1, value.encode('utf-8'))
+            return (0, value)
+        keys = query['link_id'].get('$in') if query else None
+        docs = [dict(doc) for doc in self.docs if doc.get('link_id') is not None
+                and (keys is None or doc['link_id'] in keys)]
+        return iter(sorted(docs, key=lambda doc: bson_order(doc['link_id'])))
+
+    def find_one(self, query):
+        # Only the non-string key probe made by the planner
+        assert query == {'link_id': {"$ne": None, "$not": {"$type": "string"}}}, query
+        return next((dict(doc) for doc in self.docs
+                     if doc.get('link_id') is not None and not isinstance(doc['link_id'], str)), None)
+
+class TypedTableCursor:
+    """MySQL side with a declared link_id column type, answering the planner's estimates"""
+
+    def __init__(self, rows, data_type):
+        self.rows = rows
+        self.data_type = data_type
+        self.pending = []
+
+    def execute(self, query, args=None):
+        if query == TABLE_ROWS_SQL:
+            self.pending = [{'TABLE_ROWS': len(self.rows)}]
+        elif query == KEY_TYPE_SQL:
+            self.pending = [{'DATA_TYPE': self.data_type}]
+        else:
+            assert 'ORDER BY' not in query, query
+            self.pending = list(self.rows)
+
+    def fetchone(self):
+        return self.pending.pop(0) if self.pending else None
+
+    def fetchmany(self, size):
+        chunk, self.pending = self.pending[:size], self.pending[size:]
+        return chunk
+
+def test_merge_plan():
+    """USING merge reads MySQL in byte order and needs ON link_id"""
+    print("\n" + "="*70)
+    print("TEST 1: Merge Join Plan")
+    print("="*70)
+
+    node = parse('JOIN messages_admin_adult WITH sequences_admin ON link_id USING merge')
+    plan = _join_plan(node, 10, 10, 1000, string_keys=True)
+    assert plan['strategy'] == 'merge'
+    assert plan['mysql_query'].endswith("ORDER BY CAST(link_id AS BINARY)"), plan['mysql_query']
+    print(f"  ✓ {plan['mysql_query']}")
+
+    try:
+        _join_plan(node, 10, 10, 1000)
+        assert False, "USING merge without string keys was accepted"
+    except ValueError as e:
+        print(f"  ✓ non-string keys rejected: {e}")
+
+    node = parse('JOIN messages_admin_adult WITH sequences_admin ON message_id USING merge')
+    try:
+        _join_plan(node, 10, 10, 1000, string_keys=True)
+        assert False, "USING merge ON message_id was accepted"
+    except ValueError as e:
+        print(f"  ✓ ON message_id rejected: {e}")
+
+    # Other strategies keep MySQL's own order
+    sql, args = _join_select(node, 'batch')
+    assert 'ORDER BY' not in sql and args is None
+
+    print(f"\n✅ Merge plans are restricted to link_id")
+
+def test_mixed_case_merge():
+    """Keys differing only in case and non-ASCII keys all merge correctly"""
+    print("\n" + "="*70)
+    print("TEST 2: Mixed-Case Merge Join")
+    print("="*70)
+
+    link_ids = ['b2', 'B2', 'a1', 'A1', 'é9', 'Z0', 'z0', 'm5']
+    rows = [{'link_id': link_id, 'content': f"msg {link_id}"} for link_id in link_ids]
+    docs = [{'_id': index, 'link_id': link_id, 'original': 'ATCG'}
+            for index, link_id in enumerate(link_ids) if link_id != 'm5']
+    docs.append({'_id': 100, 'link_id': None, 'original': 'TTAA'})
+
+    db = DNACryptDB.__new__(DNACryptDB)
+    db.chunk_size = 2
+    db._attempted = {'mongodb'}
+    db._mongo_db = {'sequences_admin': MongoOrderCollection(docs)}
+
+    node = parse('JOIN messages_admin_adult WITH sequences_admin ON link_id USING merge')
+    plan = _join_plan(node, len(rows), len(docs), db.chunk_size, string_keys=True)
+    joined = list(db._join_rows(node, plan, BinaryOrderCursor(rows)))
+
+    matched = sorted(row['join_value'] for row in joined)
+    expected = sorted(link_id for link_id in link_ids if link_id != 'm5')
+    assert matched == expected, f"{matched} != {expected}"
+    for row in joined:
+        assert row['mongodb_data']['link_id'] == row['mysql_data']['link_id'] == row['join_value']
+    print(f"  ✓ {len(joined)} of {len(rows)} rows joined: {matched}")
+
+    print(f"\n✅ Merge join matches every case-distinct key")
+
+def test_integer_keys():
+    """Numeric link_id columns never merge, since MySQL's byte order differs from MongoDB's"""
+    print("\n" + "="*70)
+    print("TEST 3: Integer Join Keys")
+    print("="*70)
+
+    link_ids = [2, 10, 33, 100, 7]
+    rows = [{'link_id': link_id, 'content': f"msg {link_id}"} for link_id in link_ids]
+    docs = [{'_id': index, 'link_id': link_id, 'original': 'ATCG'}
+            for index, link_id in enumerate(link_ids)]
+
+    db = DNACryptDB.__new__(DNACryptDB)
+    db.chunk_size = 2
+    db._attempted = {'mongodb'}
+    db._mongo_db = {'sequences_admin': MongoOrderCollection(docs)}
+
+    node = parse('JOIN messages_admin_adult WITH sequences_admin ON link_id')
+    plan = db._plan_join(node, TypedTableCursor(rows, 'int'))
+    assert plan['strategy'] == 'hash', plan
+    print(f"  ✓ INT column: {plan['strategy']} ({plan['reason']})")
+
+    joined = list(db._join_rows(node, plan, TypedTableCursor(rows, 'int')))
+    matched = sorted(row['join_value'] for row in joined)
+    assert matched == sorted(link_ids), matched
+    print(f"  ✓ {len(joined)} of {len(rows)} rows joined: {matched}")
+
+    # A text column still falls back once any document holds a number
+    docs[0]['link_id'] = str(docs[0]['link_id'])
+    plan = db._plan_join(node, TypedTableCursor(rows, 'varchar'))
+    assert plan['strategy'] == 'hash', plan
+    docs[:] = [dict(doc, link_id=str(doc['link_id'])) for doc in docs]
+    plan = db._plan_join(node, TypedTableCursor(rows, 'varchar'))
+    assert plan['strategy'] == 'merge', plan
+    print(f"  ✓ VARCHAR column: merge only once every document key is a string")
+
+    print(f"\n✅ Integer keys join through the hash table")
+
+def run_all_tests():
+    """Run all join tests"""
+    print("\n" + "="*70)
+    print("DNACryptDB Join Test Suite")
+    print("="*70)
+
+    tests = [
+        test_merge_plan,
+        test_mixed_case_merge,
+        test_integer_keys,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"\n❌ {test.__name__} failed: {e}")
+            failed += 1
+
+    print("\n" + "="*70)
+    if failed:
+        print(f"❌ {failed} test(s) failed")
+        return False
+    print("🎉 All join tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+DNACryptDB Parser Test Suite
+Statement parsing and $parameter binding; no database is needed
+"""
+
+import sys
+sys.path.append('..')
+
+from dnacryptdb.parser import (
+    parse, ParseError, Clause, GetMessage, GetSequence, LinkData, TrackAccess, FindPattern,
+    FetchData, ChangeData
+)
+from dnacryptdb.core import _sql_args
+
+def test_unquoted_comparison_values():
+    """Unquoted WHERE values are kept as the text written"""
+    print("\n" + "="*70)
+    print("TEST 1: Unquoted Comparison Values")
+    print("="*70)
+    
+    cases = [
+        ('LINK DATA WHERE link_id = 550e8400', LinkData, 'link_id', '550e8400'),
+        ('LINK DATA WHERE link_id = 550e8400-e29b-41d4', LinkData, 'link_id', '550e8400-e29b-41d4'),
+        ('GET SEQUENCE FROM sequences_admin WHERE link_id = 123', GetSequence, 'link_id', '123'),
+        ('GET MESSAGE FROM messages_admin_adult WHERE message_id = 42', GetMessage, 'value', '42'),
+        ('GET MESSAGE FROM messages_admin_adult WHERE message_id = "42"', GetMessage, 'value', '42'),
+    ]
+    
+    for query, node_type, field, expected in cases:
+        node = parse(query)
+        assert isinstance(node, node_type), f"Wrong node for: {query}"
+        value = getattr(node, field)
+        assert value == expected and isinstance(value, str), f"{query} -> {value!r}"
+        print(f"  ✓ {query} -> {value!r}")
+    
+    print(f"\n✅ Unquoted comparison values stay strings")
+
+def test_typed_parameters():
+    """$parameters in boolean and integer positions are bound and checked"""
+    print("\n" + "="*70)
+    print("TEST 2: Boolean and Integer Parameters")
+    print("="*70)
+    
+    track = 'TRACK ACCESS BY "bob@dnacrypt.com" TO MESSAGE "xyz" ACTION "decrypt" SUCCESS $ok'
+    for ok in (True, False):
+        node = parse(track, {"ok": ok})
+        assert isinstance(node, TrackAccess) and node.success is ok, f"SUCCESS $ok -> {node.success!r}"
+        print(f"  ✓ SUCCESS $ok with {ok} -> {node.success!r}")
+    assert parse(track.replace('$ok', 'true')).success is True
+    
+    pattern = 'FIND PATTERN users WHO accessed MORE THAN $n messages'
+    node = parse(pattern, {"n": 7})
+    assert isinstance(node, FindPattern) and node.threshold == 7, f"MORE THAN $n -> {node.threshold!r}"
+    print(f"  ✓ MORE THAN $n with 7 -> {node.threshold!r}")
+    assert parse(pattern.replace('$n', '3')).threshold == 3
+    
+    # Wrong types and missing values are parse errors, not crashes or defaults
+    for query, params in [(track, {"ok": "yes"}), (track, {}),
+                          (pattern, {"n": "7"}), (pattern, {"n": True}), (pattern, {})]:
+        try:
+            parse(query, params)
+        except ParseError as e:
+            print(f"  ✓ {params} rejected: {e}")
+        else:
+            raise AssertionError(f"{params} was accepted for: {query}")
+    
+    print(f"\n✅ Typed parameters bound and checked")
+
+def test_where_parameters():
+    """$parameters in WHERE/SET text reach the driver as args, not SQL"""
+    print("\n" + "="*70)
+    print("TEST 3: WHERE Parameters as Driver Args")
+    print("="*70)
+    
+    hostile = "x\" OR 1=1 -- "
+    node = parse('FETCH FROM users WHERE name = $name AND note LIKE "50%"', {"name": hostile})
+    assert isinstance(node, FetchData) and isinstance(node.condition, Clause)
+    assert node.condition.args == (hostile,)
+    
+    sql, args = _sql_args(node.condition)
+    assert sql == 'name = %s AND note LIKE "50%"' and args == (hostile,), sql
+    print(f"  ✓ mysql-connector: {sql!r} {args!r}")
+    
+    sql, args = _sql_args(node.condition, escape=True)
+    assert sql == 'name = %s AND note LIKE "50%%"' and args == (hostile,), sql
+    print(f"  ✓ PyMySQL: {sql!r} {args!r}")
+    
+    # The text itself still reads as the condition, for MongoDB filters
+    assert node.condition.startswith('name = ')
+    
+    node = parse('CHANGE IN users SET age = $age WHERE id = $id', {"age": 31, "id": 7})
+    assert isinstance(node, ChangeData)
+    assert _sql_args(node.set_clause) == ('age = %s', (31,))
+    assert _sql_args(node.condition) == ('id = %s', (7,))
+    print(f"  ✓ SET and WHERE args: {node.set_clause.args + node.condition.args}")
+    
+    # Without $parameters nothing changes, and PyMySQL still gets its % escaped
+    node = parse('FETCH FROM users WHERE note LIKE "50%"')
+    assert not isinstance(node.condition, Clause)
+    assert _sql_args(node.condition) == ('note LIKE "50%"', None)
+    assert _sql_args(node.condition, escape=True) == ('note LIKE "50%%"', ())
+    print(f"  ✓ Plain conditions unchanged")
+    
+    print(f"\n✅ WHERE parameters bound by the driver")
+
+def run_all_tests():
+    """Run all parser tests"""
+    print("\n" + "="*70)
+    print("DNACryptDB Parser Test Suite")
+    print("="*70)
+    
+    tests = [
+        test_unquoted_comparison_values,
+        test_typed_parameters,
+        test_where_parameters,
+    ]
+    
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"\n❌ {test.__name__} failed: {e}")
+            failed += 1
+    
+    print("\n" + "="*70)
+    if failed:
+        print(f"❌ {failed} test(s) failed")
+        return False
+    print("🎉 All parser tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+DNACryptDB Script Test Suite
+Statement splitting, ${var} references, the parallel script DAG and the
+plan cache; the engine is built from an empty config, so no backend
+connects and no database is needed
+"""
+
+import sys
+import json
+import os
+import tempfile
+sys.path.append('..')
+
+from dnacryptdb import core
+from dnacryptdb.core import DNACryptDB, _script_statements, _substitute, _summarize
+
+def make_engine():
+    """An engine with no backends configured"""
+    config = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+    json.dump({}, config)
+    config.close()
+    try:
+        return DNACryptDB(config_file=config.name, verbose=False)
+    finally:
+        os.unlink(config.name)
+
+def test_statement_splitting():
+    """';' ends a statement only outside strings; comments and blank lines are skipped"""
+    print("\n" + "="*70)
+    print("TEST 1: Statement Splitting")
+    print("="*70)
+
+    script = [
+        '# setup\n',
+        'SHOW TABLES; SHOW COLLECTIONS;  -- two on one line\n',
+        '\n',
+        'PUT INTO notes DATA {"text": "a;b",\n',
+        '"more": "line one\n',
+        'line two"};\n',
+        'SHOW GRAPH stats\n',
+    ]
+    statements = list(_script_statements(script))
+    assert statements == [
+        'SHOW TABLES',
+        'SHOW COLLECTIONS',
+        'PUT INTO notes DATA {"text": "a;b", "more": "line one\nline two"}',
+        'SHOW GRAPH stats',
+    ], statements
+    for statement in statements:
+        print(f"  ✓ {statement!r}")
+
+    print(f"\n✅ Scripts split into {len(statements)} statements")
+
+def test_variable_references():
+    """${var.path} follows nested keys and list indexes; unknown references stay"""
+    print("\n" + "="*70)
+    print("TEST 2: Variable References")
+    print("="*70)
+
+    variables = {
+        'msg': {'status': 'success', 'link_id': 'abc-123'},
+        'batch': {'results': [{'link_id': 'first'}, {'link_id': 'second'}]},
+    }
+    cases = [
+        ('LINK DATA WHERE link_id = "${msg.link_id}"', 'LINK DATA WHERE link_id = "abc-123"'),
+        ('LINK DATA WHERE link_id = "${batch.results.1.link_id}"', 'LINK DATA WHERE link_id = "second"'),
+        ('LINK DATA WHERE link_id = "${nope.link_id}"', 'LINK DATA WHERE link_id = "${nope.link_id}"'),
+        ('SHOW TABLES', 'SHOW TABLES'),
+    ]
+    for query, expected in cases:
+        assert _substitute(query, variables) == expected, _substitute(query, variables)
+        print(f"  ✓ {query} -> {expected}")
+
+    print(f"\n✅ References resolve against earlier results")
+
+def test_dag_appends_commute():
+    """Inserts into the same table run in parallel; a later read waits for both"""
+    print("\n" + "="*70)
+    print("TEST 3: DAG - Appends Commute")
+    print("="*70)
+
+    db = make_engine()
+    deps, refs = db._script_dag([
+        'ADD KEY TO keys_admin {"message_id": "m1", "public_key": "k1", "type": "RSA"}',
+        'ADD KEY TO keys_admin {"message_id": "m2", "public_key": "k2", "type": "RSA"}',
+        'STORE SEQUENCE IN sequences_admin {"link_id": "l1", "original": "ATCG"}',
+        'FETCH FROM keys_admin ALL',
+    ])
+    assert deps == [set(), set(), set(), {0, 1}], deps
+    print(f"  ✓ dependencies: {deps}")
+
+    print(f"\n✅ Appends commute with each other, not with reads")
+
+def test_dag_write_after_read():
+    """A write waits for earlier readers of the same resource; reads share it"""
+    print("\n" + "="*70)
+    print("TEST 4: DAG - Write After Read")
+    print("="*70)
+
+    db = make_engine()
+    deps, refs = db._script_dag([
+        'GET MESSAGE FROM messages_admin_adult WHERE message_id = "m1"',
+        'LIST MESSAGES FROM messages_admin_adult',
+        'CHANGE IN messages_admin_adult SET urgency = "low" WHERE message_id = "m1"',
+        'LIST MESSAGES FROM messages_admin_adult',
+        'FETCH FROM keys_admin ALL',
+    ])
+    assert deps == [set(), set(), {0, 1}, {2}, set()], deps
+    print(f"  ✓ dependencies: {deps}")
+
+    print(f"\n✅ Writes are ordered after reads, unrelated tables are not")
+
+def test_dag_link_data_barrier():
+    """LINK DATA may read anything, so it waits for earlier writes and blocks later ones"""
+    print("\n" + "="*70)
+    print("TEST 5: DAG - LINK DATA Barrier")
+    print("="*70)
+
+    db = make_engine()
+    deps, refs = db._script_dag([
+        'ADD KEY TO keys_admin {"message_id": "m1", "public_key": "k1", "type": "RSA"}',
+        'STORE SEQUENCE IN sequences_admin {"link_id": "l1", "original": "ATCG"}',
+        'LINK DATA WHERE link_id = "l1"',
+        'GET SEQUENCE FROM sequences_admin WHERE link_id = "l1"',
+        'REMOVE FROM keys_admin WHERE message_id = "m1"',
+        'MAKE TABLE tmp WITH (name:text)',
+    ])
+    assert deps[2] == {0, 1}, deps
+    assert deps[3] == {1}, deps
+    assert deps[4] == {0, 2}, deps
+    assert 2 in deps[5], deps
+    print(f"  ✓ dependencies: {deps}")
+
+    # A statement that does not parse is a barrier for everything around it
+    deps, refs = db._script_dag(['SHOW TABLES', 'NOT A STATEMENT', 'SHOW TABLES'])
+    assert deps == [set(), {0}, {1}], deps
+    print(f"  ✓ unparsed statement: {deps}")
+
+    print(f"\n✅ Barriers order everything around them")
+
+def test_dag_variables():
+    """References wait for their assignment; reassignment waits for earlier readers"""
+    print("\n" + "="*70)
+    print("TEST 6: DAG - Variables")
+    print("="*70)
+
+    db = make_engine()
+    deps, refs = db._script_dag([
+        '$msg = SEND MESSAGE TO messages_admin_adult {"content": "a", "sender": "s", "receiver": "r"}',
+        'STORE SEQUENCE IN sequences_admin {"link_id": "${msg.link_id}", "original": "ATCG"}',
+        '$msg = GET SEQUENCE FROM sequences_other WHERE link_id = "l9"',
+        'GET SEQUENCE FROM sequences_other WHERE link_id = "${msg.sequence.link_id}"',
+    ])
+    assert refs == [set(), {'msg'}, set(), {'msg'}], refs
+    assert deps[1] == {0}, deps
+    assert deps[2] == {0, 1}, deps
+    assert deps[3] == {2}, deps
+    print(f"  ✓ dependencies: {deps}, references: {refs}")
+
+    try:
+        db._script_dag(['BEGIN', 'SHOW TABLES', 'COMMIT'])
+        assert False, "BEGIN was accepted with jobs > 1"
+    except ValueError as e:
+        print(f"  ✓ BEGIN rejected: {e}")
+
+    print(f"\n✅ Variables are ordered like any other resource")
+
+def test_script_results():
+    """Parallel and sequential runs return the same results in file order"""
+    print("\n" + "="*70)
+    print("TEST 7: Script Results")
+    print("="*70)
+
+    db = make_engine()
+    script = tempfile.NamedTemporaryFile('w', suffix='.dnacdb', delete=False)
+    script.write('-- tables\nSHOW TABLES;\nNOT A STATEMENT;\nSHOW GRAPH stats;\nSHOW COLLECTIONS;\n')
+    script.close()
+    try:
+        sequential = db.execute_file(script.name)
+        parallel = db.execute_file(script.name, jobs=4)
+        summary = db.execute_file(script.name, summary_only=True)
+    finally:
+        os.unlink(script.name)
+
+    assert parallel == sequential, (parallel, sequential)
+    assert [bool(result.get('error')) for result in sequential] == [False, True, True, False]
+    assert summary == _summarize(sequential) == {"total": 4, "success": 2, "errors": 2, "comments": 0}
+    print(f"  ✓ {summary}")
+
+    print(f"\n✅ Results keep file order")
+
+def test_plan_cache():
+    """Statements differing only in literals share one cached plan"""
+    print("\n" + "="*70)
+    print("TEST 8: Plan Cache")
+    print("="*70)
+
+    db = make_engine()
+    for message_id in ('m1', 'm2', 'm3'):
+        db.execute(f'GET MESSAGE FROM messages_admin_adult WHERE message_id = "{message_id}"')
+    stats = db.cache_stats()['plan_cache']
+    assert stats['misses'] == 1 and stats['hits'] == 2 and stats['size'] == 1, stats
+    print(f"  ✓ {stats}")
+
+    print(f"\n✅ One plan per statement shape")
+
+def test_script_windows():
+    """jobs > 1 schedules a window of statements at a time; variables cross windows"""
+    print("\n" + "="*70)
+    print("TEST 9: Script Windows")
+    print("="*70)
+
+    db = make_engine()
+    executed = []
+    execute = db.execute
+    db.execute = lambda query, params=None: executed.append(query) or execute(query, params)
+    windows = []
+    run_window = db._execute_script_dag
+    db._execute_script_dag = lambda queries, *args: windows.append(len(queries)) or run_window(queries, *args)
+
+    script = tempfile.NamedTemporaryFile('w', suffix='.dnacdb', delete=False)
+    script.write('$t = SHOW TABLES;\nSHOW COLLECTIONS;\nSHOW GRAPH stats;\n'
+                 'SHOW TABLES;\nGET SEQUENCE FROM seq_${t.count} WHERE link_id = "a";\n')
+    script.close()
+    window = core.SCRIPT_DAG_WINDOW
+    core.SCRIPT_DAG_WINDOW = 2
+    try:
+        sequential = db.execute_file(script.name)
+        sequential_queries, executed[:] = list(executed), []
+        parallel = db.execute_file(script.name, jobs=4)
+    finally:
+        core.SCRIPT_DAG_WINDOW = window
+        os.unlink(script.name)
+
+    assert windows == [2, 2, 1], windows
+    assert parallel == sequential, (parallel, sequential)
+    assert executed == sequential_queries, executed
+    assert 'GET SEQUENCE FROM seq_0 WHERE link_id = "a"' in executed, executed
+    print(f"  ✓ windows of {windows}, ${{t.count}} resolved two windows later")
+
+    # BEGIN anywhere is refused before any statement runs
+    script = tempfile.NamedTemporaryFile('w', suffix='.dnacdb', delete=False)
+    script.write('SHOW TABLES;\nSHOW TABLES;\nSHOW TABLES;\nBEGIN;\nCOMMIT;\n')
+    script.close()
+    executed[:] = []
+    core.SCRIPT_DAG_WINDOW = 2
+    try:
+        db.execute_file(script.name, jobs=4)
+        assert False, "BEGIN was accepted with jobs > 1"
+    except ValueError as e:
+        print(f"  ✓ BEGIN rejected: {e}")
+    finally:
+        core.SCRIPT_DAG_WINDOW = window
+        os.unlink(script.name)
+    assert executed == [], executed
+
+    print(f"\n✅ Parallel scripts stream in windows")
+
+def run_all_tests():
+    """Run all script tests"""
+    print("\n" + "="*70)
+    print("DNACryptDB Script Test Suite")
+    print("="*70)
+
+    tests = [
+        test_statement_splitting,
+        test_variable_references,
+        test_dag_appends_commute,
+        test_dag_write_after_read,
+        test_dag_link_data_barrier,
+        test_dag_variables,
+        test_script_results,
+        test_plan_cache,
+        test_script_windows,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"\n❌ {test.__name__} failed: {e}")
+            failed += 1
+
+    print("\n" + "="*70)
+    if failed:
+        print(f"❌ {failed} test(s) failed")
+        return False
+    print("🎉 All script tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
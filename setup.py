@@ -37,6 +37,12 @@ setup(
         "neo4j>=5.0.0",
         "cryptography>=41.0.0",
     ],
+    extras_require={
+        "async": [
+            "aiomysql>=0.2.0",
+            "pymongo>=4.13.0",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "dnacryptdb=dnacryptdb.cli:main",